@@ -1,7 +1,9 @@
 """数据库连接和用户操作 - Vercel serverless 版本"""
+import asyncio
 import os
 import json
 from datetime import datetime
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import text
 from sqlalchemy.pool import NullPool
@@ -15,6 +17,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # 全局变量，延迟初始化
 _engine = None
 _session_factory = None
+_engine_loop = None  # 创建引擎时的事件循环（池中连接绑定在该循环上）
+_loop = None  # 热启动调用之间复用的事件循环
 
 def create_supabase_user(email: str, password: str, user_metadata: dict) -> dict:
     """使用 Supabase Admin API 创建用户"""
@@ -83,32 +87,78 @@ def supabase_sign_in(email: str, password: str) -> dict:
         error_msg = error_data.get('error_description', error_data.get('msg', '登录失败'))
         raise Exception(error_msg)
 
+def run(coro):
+    """
+    在复用的事件循环上运行协程
+
+    同一实例的热启动调用共享事件循环，连接池中的连接得以复用，
+    无需每次重新建立 TCP/TLS 连接。只有循环已关闭时才新建循环。
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
 async def reset_engine():
-    """重置引擎和会话工厂 - 用于清理旧的事件循环"""
-    global _engine, _session_factory
+    """重置引擎和会话工厂 - 仅在需要彻底关闭连接时使用（热启动请勿调用）"""
+    global _engine, _session_factory, _engine_loop
     if _engine is not None:
         await _engine.dispose()
         _engine = None
         _session_factory = None
+        _engine_loop = None
+
+def _prepared_statement_name():
+    """生成全局唯一的预编译语句名称，经 PgBouncer 复用服务端连接时不会重名"""
+    return f"__asyncpg_{uuid4().hex}__"
+
+def _pool_options():
+    """连接池配置：默认保持少量持久连接，DB_POOL_SIZE=0 时退回 NullPool"""
+    pool_size = int(os.environ.get("DB_POOL_SIZE", "2"))
+    if pool_size <= 0:
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "2")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "300")),
+    }
 
 def get_session_factory():
     """获取或创建会话工厂"""
-    global _engine, _session_factory
+    global _engine, _session_factory, _engine_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _session_factory is not None and _engine_loop is not loop:
+        # 引擎创建时的循环已关闭或已被替换：池中连接无法在当前循环上使用。
+        # 直接丢弃旧连接池（不在当前循环上关闭旧连接），随后重新创建
+        _engine.sync_engine.dispose(close=False)
+        _engine = None
+        _session_factory = None
 
     if _session_factory is None:
         # 数据库配置
         database_url = os.environ.get("DATABASE_URL", "")
 
         # 创建异步引擎
-        # 使用 NullPool + statement_cache_size=0 解决 pgbouncer 问题
+        # PgBouncer 事务模式（需 1.21+ 且 max_prepared_statements > 0）：
+        # - 预编译语句使用全局唯一名称，SQLAlchemy 的语句缓存得以保留，无需每次重新解析
+        # - 关闭 asyncpg 自带的语句缓存（其按连接递增的名称在 PgBouncer 后会冲突）
+        # - 保持少量持久连接，热启动调用无需重新建立 TCP/TLS 连接
         _engine = create_async_engine(
             database_url,
             echo=False,
-            poolclass=NullPool,
             connect_args={
-                "statement_cache_size": 0  # 禁用asyncpg的prepared statement缓存
-            }
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": _prepared_statement_name,
+            },
+            **_pool_options(),
         )
+        _engine_loop = loop
 
         # 创建会话工厂
         _session_factory = async_sessionmaker(
@@ -1,8 +1,7 @@
 """Vercel serverless entry point - 完整数据库支持版本"""
 from http.server import BaseHTTPRequestHandler
 import json
-import asyncio
-from db import create_user, authenticate_user
+from db import create_user, authenticate_user, run
 
 class handler(BaseHTTPRequestHandler):
 
@@ -72,17 +71,14 @@ class handler(BaseHTTPRequestHandler):
                     self.wfile.write(json.dumps({"detail": "密码长度至少为 8 个字符"}).encode())
                     return
 
-                # 创建用户（使用异步函数）
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                user = loop.run_until_complete(
+                # 创建用户（在复用的事件循环上运行异步函数）
+                user = run(
                     create_user(
                         name=data['name'],
                         email=data['email'],
                         password=data['password']
                     )
                 )
-                loop.close()
 
                 # 返回成功响应
                 self.send_response(201)
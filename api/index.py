@@ -4,6 +4,12 @@ Vercel Serverless Function - FastAPI Application Entry Point
 将完整的 FastAPI 后端应用部署到 Vercel Serverless Functions。
 使用 Mangum ASGI 适配器将 FastAPI 转换为 Vercel 兼容的处理器。
 """
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
 import sys
 import os
 
@@ -17,13 +23,75 @@ if project_root not in sys.path:
 if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
+# 冷启动只导入被请求到的路由模块（见 src/api/lazy_routing.py）
+os.environ.setdefault("LAZY_ROUTERS", "true")
+
 # 导入 FastAPI 应用
 try:
     from backend.src.api.main import app
     from mangum import Mangum
 
-    # 创建 Vercel 兼容的 handler
-    handler = Mangum(app, lifespan="off")
+    # 应用内部以 src.* 导入模块，这里必须取同一个引擎实例
+    from src.core.database import engine
+
+    logger = logging.getLogger(__name__)
+
+    # Mangum 在 asyncio.get_event_loop() 上运行请求；实例存活期间（热启动）
+    # 复用同一个事件循环和引擎，连接池中的连接不必重新握手
+    _mangum = Mangum(app, lifespan="off")
+    _import_seconds = time.perf_counter() - _import_started
+    _loop = None
+    _cold = True
+
+    def _get_loop():
+        """返回复用的事件循环；仅在循环已关闭时新建"""
+        global _loop
+        if _loop is not None and not _loop.is_closed():
+            return _loop
+
+        if _loop is not None:
+            # 连接池中的连接绑定在已关闭的循环上，无法再使用：
+            # 丢弃连接池但不关闭旧连接（关闭需要旧循环），引擎本身保留
+            logger.warning("Event loop was closed; discarding pooled connections")
+            engine.sync_engine.dispose(close=False)
+
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+        return _loop
+
+    async def _warm_up():
+        """建立第一条池连接，返回耗时（秒）"""
+        started = time.perf_counter()
+        async with engine.connect():
+            pass
+        return time.perf_counter() - started
+
+    def handler(event, context):
+        """Vercel 入口：冷启动时预热连接并报告耗时，热启动直接转发"""
+        global _cold
+        loop = _get_loop()
+        if not _cold:
+            return _mangum(event, context)
+
+        _cold = False
+        started = time.perf_counter()
+        # 预热与首个请求并发执行：请求本身不访问数据库时也能提前完成握手
+        warm_up = loop.create_task(_warm_up())
+        response = _mangum(event, context)
+        try:
+            warm_up_seconds = loop.run_until_complete(warm_up)
+        except Exception as exc:  # 预热失败不影响响应，后续请求按需重连
+            logger.warning("Connection warm-up failed: %s", exc)
+            warm_up_seconds = None
+        first_request_seconds = time.perf_counter() - started
+
+        timings = [f"import;dur={_import_seconds * 1000:.1f}"]
+        if warm_up_seconds is not None:
+            timings.append(f"warmup;dur={warm_up_seconds * 1000:.1f}")
+        timings.append(f"first-request;dur={first_request_seconds * 1000:.1f}")
+        response.setdefault("headers", {})["server-timing"] = ", ".join(timings)
+        logger.info("Cold start: %s", ", ".join(timings))
+        return response
 
 except ImportError as e:
     # 如果导入失败，创建一个简单的错误处理器
@@ -0,0 +1,48 @@
+"""add trigram search indexes
+
+Revision ID: 20251023_005
+Revises: 0afdeea0b71c
+Create Date: 2025-10-23
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20251023_005'
+down_revision: Union[str, None] = '0afdeea0b71c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) - GIN trigram indexes used by /api/v1/search
+TRIGRAM_INDEXES = [
+    ('ix_projects_name_trgm', 'projects', 'name'),
+    ('ix_projects_description_trgm', 'projects', 'description'),
+    ('ix_tasks_name_trgm', 'tasks', 'name'),
+    ('ix_tasks_description_trgm', 'tasks', 'description'),
+    ('ix_document_links_title_trgm', 'document_links', 'title'),
+    ('ix_document_links_description_trgm', 'document_links', 'description'),
+]
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and add GIN trigram indexes for substring search."""
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    # CONCURRENTLY cannot run inside a transaction; build indexes without
+    # locking writes on large tables.
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column in TRIGRAM_INDEXES:
+            op.execute(sa.text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON {table_name} USING gin ({column} gin_trgm_ops)"
+            ))
+
+
+def downgrade() -> None:
+    """Drop trigram indexes (the pg_trgm extension is left installed)."""
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in reversed(TRIGRAM_INDEXES):
+            op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
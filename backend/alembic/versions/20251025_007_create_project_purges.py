@@ -0,0 +1,45 @@
+"""create project purges table
+
+Revision ID: 20251025_007
+Revises: 20251024_006
+Create Date: 2025-10-25
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20251025_007'
+down_revision: Union[str, None] = '20251024_006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Progress of background project purges, shared by all workers."""
+    op.create_table(
+        'project_purges',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('project_name', sa.String(200), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='projectpurgestatus'),
+            nullable=False,
+        ),
+        sa.Column('total', sa.JSON(), nullable=False),
+        sa.Column('deleted', sa.JSON(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('project_id'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the project purges table."""
+    op.drop_table('project_purges')
+    sa.Enum(name='projectpurgestatus').drop(op.get_bind())
@@ -0,0 +1,106 @@
+"""
+Benchmark loading a page's API calls separately vs through POST /api/v1/batch.
+
+A "page" is the PAGE calls the frontend makes on the dashboard. Each page is
+loaded PAGES times through the full ASGI app in-process (all middleware):
+
+- sequential: one request per call, one after another
+- concurrent: one request per call, all in flight at once
+- batch: one POST /api/v1/batch carrying all calls
+
+For each mode it reports the median page latency and the SQL statements per
+page (the batch authenticates once, so it saves one user lookup per call).
+The benchmark user and projects are committed and deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.batch_requests
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from benchmarks.read_session_round_trips import cleanup, seed
+from src.api.main import app
+from src.core.database import engine
+from src.core.rate_limit import rate_limiter
+from src.core.security import create_access_token
+
+PAGES = 100
+PAGE = [
+    "/api/v1/dashboard/",
+    "/api/v1/projects/?limit=20",
+    "/api/v1/projects/overdue",
+    "/api/v1/tasks/my-tasks",
+    "/api/v1/tasks/?limit=20",
+    "/api/v1/users/",
+]
+
+
+async def sequential(client: AsyncClient, headers: dict) -> None:
+    for path in PAGE:
+        (await client.get(path, headers=headers)).raise_for_status()
+
+
+async def concurrent(client: AsyncClient, headers: dict) -> None:
+    responses = await asyncio.gather(*(client.get(path, headers=headers) for path in PAGE))
+    for response in responses:
+        response.raise_for_status()
+
+
+async def batch(client: AsyncClient, headers: dict) -> None:
+    response = await client.post(
+        "/api/v1/batch", headers=headers, json={"requests": [{"path": path} for path in PAGE]}
+    )
+    response.raise_for_status()
+    assert all(result["status"] == 200 for result in response.json()), response.json()
+
+
+MODES = [("sequential", sequential), ("concurrent", concurrent), ("batch", batch)]
+
+
+async def main():
+    """Run the benchmark."""
+    logging.disable(logging.INFO)
+    rate_limiter.enabled = False  # PAGES x PAGE calls exceed the per-user limit
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+    user = await seed()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    try:
+        async with AsyncClient(app=app, base_url="http://benchmark") as client:
+            for name, load in MODES:
+                await load(client, headers)  # warm-up
+                statements = 0
+                latencies = []
+                for _ in range(PAGES):
+                    started = time.perf_counter()
+                    await load(client, headers)
+                    latencies.append(time.perf_counter() - started)
+                p50_ms = statistics.median(latencies) * 1000
+                print(
+                    f"{name:<10} {len(PAGE)} calls/page  p50={p50_ms:>6.2f}ms"
+                    f"  statements/page={statements / PAGES:>5.1f}"
+                )
+    finally:
+        await cleanup(user)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+"""
+Compare response compression: Starlette's GZipMiddleware vs CompressionMiddleware.
+
+1. Encoders on their own for three payloads (a 500-task list, a 50-project
+   list and the OpenAPI document): bytes on the wire and CPU per body for
+   GZipMiddleware's gzip level 9 and the new gzip / br / zstd levels.
+2. Through the middleware, REQUESTS requests of the 500-task list per setup:
+   CPU time per request (process time, all threads) and bytes sent, for
+   GZipMiddleware and for CompressionMiddleware with each encoding. The
+   payload is identical across requests, as for a dashboard or list that
+   many clients poll, so the new middleware recompresses it only once.
+
+zstd and br rows need the optional ``zstandard`` / ``brotli`` packages.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.compression
+"""
+import asyncio
+import gzip
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Response
+from starlette.middleware.gzip import GZipMiddleware
+
+from benchmarks.response_serialization import project_rows, task_rows
+from src.api.main import app as api_app
+from src.api.responses import list_response
+from src.core.compression import CompressionMiddleware, available_encoders
+from src.schemas.project import ProjectResponse
+from src.schemas.task import TaskResponse
+
+REQUESTS = 200
+ROUNDS = 20
+
+
+def payloads() -> dict:
+    return {
+        "500 tasks": list_response(TaskResponse, task_rows()).body,
+        "50 projects": list_response(ProjectResponse, project_rows()[:50]).body,
+        "openapi.json": json.dumps(api_app.openapi()).encode(),
+    }
+
+
+def encoder_table(bodies: dict) -> None:
+    """Bytes and CPU per body for each encoder."""
+    encoders = {"gzip-9 (GZipMiddleware)": lambda body: gzip.compress(body, 9, mtime=0)}
+    encoders.update({name: encode for name, encode in available_encoders().items()})
+
+    for payload, body in bodies.items():
+        print(f"\n{payload}: {len(body) / 1024:.1f} KiB")
+        for name, encode in encoders.items():
+            started = time.process_time()
+            for _ in range(ROUNDS):
+                data = encode(body)
+            cpu_ms = (time.process_time() - started) / ROUNDS * 1000
+            print(
+                f"  {name:<24} {len(data) / 1024:>7.1f} KiB ({len(data) / len(body):>5.1%})"
+                f"  {cpu_ms:>6.2f}ms CPU"
+            )
+
+
+def build_app(body: bytes, compression: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tasks")
+    async def tasks():
+        return Response(content=body, media_type="application/json")
+
+    if compression:
+        app.add_middleware(CompressionMiddleware)
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=1000)
+    return app
+
+
+async def run(app: FastAPI, accept_encoding: str) -> tuple:
+    """CPU ms per request and bytes per response for REQUESTS requests."""
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/tasks",
+        "raw_path": b"/tasks",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("benchmark", 80),
+    }
+
+    started = time.process_time()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    cpu_ms = (time.process_time() - started) / REQUESTS * 1000
+    return cpu_ms, sent / REQUESTS
+
+
+async def middleware_table(body: bytes) -> None:
+    """CPU per request and bytes on the wire through each middleware."""
+    print(f"\n{REQUESTS} requests of the 500-task list through the middleware")
+    setups = [("GZipMiddleware (gzip-9)", False, "gzip")]
+    setups += [(f"CompressionMiddleware ({e})", True, e) for e in available_encoders()]
+    setups.append(("no compression", True, "identity"))
+
+    for name, compression, accept_encoding in setups:
+        cpu_ms, size = await run(build_app(body, compression), accept_encoding)
+        print(f"  {name:<32} {cpu_ms:>6.2f}ms CPU/request  {size / 1024:>7.1f} KiB/response")
+
+
+def main():
+    """Run the benchmark."""
+    logging.disable(logging.INFO)
+    bodies = payloads()
+    encoder_table(bodies)
+    asyncio.run(middleware_table(bodies["500 tasks"]))
+
+
+if __name__ == "__main__":
+    main()
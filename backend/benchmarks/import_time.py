@@ -0,0 +1,141 @@
+"""
+Benchmark cold-start import time of ``src.api.main`` and fail on regressions.
+
+Runs ``python -X importtime -c "import src.api.main"`` in fresh interpreters,
+once with eager routers and once with ``LAZY_ROUTERS=true`` (the serverless
+mode), and keeps the fastest of several runs for every module. It prints the
+total and the slowest modules, then compares them with the committed baseline
+in ``import_time_baseline.json``:
+
+- the total import time may not exceed the baseline by more than TOLERANCE
+- a module may not exceed its baseline by more than TOLERANCE and SLACK_MS
+- a module missing from the baseline may not take more than SLACK_MS
+  (catches a heavy dependency that starts being imported eagerly)
+
+The exit status is 1 if anything regressed. Run with ``--update`` after an
+intended change to rewrite the baseline.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... SECRET_KEY=... python -m benchmarks.import_time
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).parent.parent
+BASELINE_FILE = Path(__file__).parent / "import_time_baseline.json"
+
+RUNS = 5
+TOLERANCE = float(os.environ.get("IMPORT_TIME_TOLERANCE", "0.25"))
+SLACK_MS = 20.0
+TOP = 15
+
+# Modules recorded in the baseline: everything at or above this cumulative time
+BASELINE_MIN_MS = 10.0
+
+MODES = {"eager": "false", "lazy": "true"}
+
+
+def measure(lazy: str) -> Dict[str, float]:
+    """Import the app in a fresh interpreter and return cumulative ms per module."""
+    env = dict(os.environ, LAZY_ROUTERS=lazy, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.api.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = int(cumulative) / 1000
+    return timings
+
+
+def fastest(lazy: str) -> Dict[str, float]:
+    """Per-module minimum over RUNS runs (the least noisy estimate)."""
+    best: Dict[str, float] = {}
+    for _ in range(RUNS):
+        for name, ms in measure(lazy).items():
+            best[name] = min(ms, best.get(name, ms))
+    return best
+
+
+def report(mode: str, timings: Dict[str, float]) -> None:
+    """Print the total and the slowest modules."""
+    print(f"\n[{mode}] src.api.main: {timings['src.api.main']:.1f}ms")
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+    for name, ms in slowest[1 : TOP + 1]:
+        print(f"  {ms:>8.1f}ms  {name}")
+
+
+def regressions(mode: str, timings: Dict[str, float], baseline: Dict[str, float]) -> List[str]:
+    """Compare one mode with its baseline."""
+    problems = []
+    total, expected = timings["src.api.main"], baseline["src.api.main"]
+    if total > expected * (1 + TOLERANCE):
+        problems.append(f"[{mode}] total {total:.1f}ms > baseline {expected:.1f}ms")
+
+    for name, ms in timings.items():
+        if name == "src.api.main":
+            continue
+        expected = baseline.get(name)
+        if expected is None:
+            if ms > SLACK_MS:
+                problems.append(f"[{mode}] new import {name} takes {ms:.1f}ms")
+        elif ms > expected * (1 + TOLERANCE) + SLACK_MS:
+            problems.append(f"[{mode}] {name} {ms:.1f}ms > baseline {expected:.1f}ms")
+    return problems
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline file")
+    args = parser.parse_args()
+
+    results = {mode: fastest(lazy) for mode, lazy in MODES.items()}
+    for mode, timings in results.items():
+        report(mode, timings)
+
+    if args.update:
+        baseline = {
+            mode: {
+                name: round(ms, 1)
+                for name, ms in sorted(timings.items())
+                if ms >= BASELINE_MIN_MS
+            }
+            for mode, timings in results.items()
+        }
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+        print(f"\nBaseline written to {BASELINE_FILE.name}")
+        return 0
+
+    if not BASELINE_FILE.exists():
+        print(f"\nNo baseline; run with --update to create {BASELINE_FILE.name}")
+        return 1
+
+    baseline = json.loads(BASELINE_FILE.read_text())
+    problems = []
+    for mode, timings in results.items():
+        problems.extend(regressions(mode, timings, baseline[mode]))
+
+    print()
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    if not problems:
+        print(f"OK (tolerance {TOLERANCE:.0%}, slack {SLACK_MS:.0f}ms)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
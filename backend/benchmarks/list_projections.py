@@ -0,0 +1,185 @@
+"""
+Benchmark ORM list reads against column projections.
+
+Compares ``TaskService.list_tasks`` / ``ProjectService.list_projects`` (full ORM
+graphs with ``selectinload``) with ``list_task_rows`` / ``list_project_rows``
+(single joined statement, rows built into dicts) over 500-row pages.
+
+For each path it reports the number of SQL statements, peak Python allocations
+while loading the page, and the time to validate + serialize the page through
+the response schema. Seed data is written inside a transaction that is rolled
+back at the end, so the target database is left untouched.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.list_projections
+"""
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import engine
+from src.models.project import Project
+from src.models.task import Task, TaskPriority, TaskStatus
+from src.models.user import User, UserRole
+from src.schemas.project import ProjectResponse
+from src.schemas.task import TaskResponse
+from src.services.project_service import ProjectService
+from src.services.task_service import TaskService
+
+PAGE_SIZE = 500
+ROUNDS = 7
+
+
+class QueryCounter:
+    """Count statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def seed(db: AsyncSession) -> None:
+    """Create users, projects and tasks for the benchmark."""
+    users = [
+        User(
+            name=f"基准用户{i}",
+            email=f"bench{i}@example.com",
+            hashed_password="x" * 60,
+            role=UserRole.MEMBER,
+        )
+        for i in range(20)
+    ]
+    db.add_all(users)
+    await db.flush()
+
+    projects = [
+        Project(
+            name=f"基准项目{i}",
+            budget=Decimal("100000.00"),
+            owner_id=users[i % len(users)].id,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    db.add_all(projects)
+    await db.flush()
+
+    today = date.today()
+    tasks = [
+        Task(
+            name=f"基准任务{i}",
+            description="benchmark task " * 4,
+            status=list(TaskStatus)[i % len(TaskStatus)],
+            priority=list(TaskPriority)[i % len(TaskPriority)],
+            project_id=projects[i % 10].id,
+            assignee_id=users[i % len(users)].id if i % 5 else None,
+            created_by_id=users[0].id,
+            due_date=today + timedelta(days=(i % 30) - 15),
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    db.add_all(tasks)
+    await db.flush()
+
+
+async def measure(db: AsyncSession, counter: QueryCounter, load, adapter: TypeAdapter) -> dict:
+    """Run one load + serialize cycle and collect metrics."""
+    db.expunge_all()
+    counter.count = 0
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = await load(db)
+    load_time = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    payload = adapter.dump_json(adapter.validate_python(items))
+    serialize_time = time.perf_counter() - started
+
+    return {
+        "queries": counter.count,
+        "peak_kib": peak / 1024,
+        "load_ms": load_time * 1000,
+        "serialize_ms": serialize_time * 1000,
+        "rows": len(items),
+        "bytes": len(payload),
+    }
+
+
+def report(name: str, samples: List[dict]) -> None:
+    """Print the median of each metric."""
+    median = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    print(
+        f"{name:<28} rows={median['rows']:>4.0f} queries={median['queries']:>2.0f} "
+        f"peak={median['peak_kib']:>8.1f}KiB load={median['load_ms']:>7.2f}ms "
+        f"serialize={median['serialize_ms']:>7.2f}ms bytes={median['bytes']:>8.0f}"
+    )
+
+
+async def main():
+    """Run the benchmark."""
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    task_adapter = TypeAdapter(List[TaskResponse])
+    project_adapter = TypeAdapter(List[ProjectResponse])
+
+    cases = [
+        (
+            "tasks: ORM + selectinload",
+            lambda db: TaskService.list_tasks(db, limit=PAGE_SIZE),
+            task_adapter,
+        ),
+        (
+            "tasks: projection",
+            lambda db: TaskService.list_task_rows(db, limit=PAGE_SIZE),
+            task_adapter,
+        ),
+        (
+            "projects: ORM + selectinload",
+            lambda db: ProjectService.list_projects(db, limit=PAGE_SIZE),
+            project_adapter,
+        ),
+        (
+            "projects: projection",
+            lambda db: ProjectService.list_project_rows(db, limit=PAGE_SIZE),
+            project_adapter,
+        ),
+    ]
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            db = AsyncSession(bind=conn, expire_on_commit=False, autoflush=False)
+            await seed(db)
+
+            for name, load, adapter in cases:
+                await measure(db, counter, load, adapter)  # warm-up
+                samples = [await measure(db, counter, load, adapter) for _ in range(ROUNDS)]
+                report(name, samples)
+        finally:
+            await transaction.rollback()
+
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
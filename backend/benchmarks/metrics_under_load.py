@@ -0,0 +1,144 @@
+"""
+Verify the /metrics collectors under concurrent load and measure their cost.
+
+1. ``RequestMetrics.observe`` cost per call, for an existing series.
+2. CONCURRENCY clients send REQUESTS in-process requests (a mix of matched,
+   unauthorized and unmatched routes, none of which needs the database) while
+   a scraper reads ``/metrics`` every SCRAPE_INTERVAL seconds. Afterwards the
+   histogram counts must add up to the requests sent and every scrape must
+   have seen itself in flight. Reports requests per second, the slowest
+   scrape under load and the time to render the exposition.
+3. Concurrent bcrypt verifications, sampling the password hash queue gauges.
+
+Exits with status 1 if a check fails.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.metrics_under_load
+"""
+import asyncio
+import logging
+import re
+import sys
+import time
+import timeit
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.core.metrics import RequestMetrics
+from src.core.prometheus import render
+from src.core.security import get_password_hash, password_hash_executor, verify_password_async
+
+REQUESTS = 5000
+CONCURRENCY = 50
+SCRAPE_INTERVAL = 0.05
+PATHS = ["/health", "/", "/api/v1/projects/", "/does-not-exist"]
+BCRYPT_CALLS = 8
+
+_COUNT = re.compile(r'^http_request_duration_seconds_count\{route="([^"]*)".*\} (\d+)$', re.M)
+_IN_FLIGHT = re.compile(r"^http_requests_in_flight (-?\d+)$", re.M)
+
+
+def observe_cost() -> float:
+    """Nanoseconds per ``observe`` call on an existing series."""
+    metrics = RequestMetrics()
+    endpoint = object()
+    metrics.observe(endpoint, "GET", 200, 0.01)
+    calls = 1_000_000
+    seconds = timeit.timeit(lambda: metrics.observe(endpoint, "GET", 200, 0.01), number=calls)
+    return seconds / calls * 1e9
+
+
+async def load(client: AsyncClient) -> bool:
+    """Send REQUESTS requests while scraping; check the scraped counters."""
+    before = {route: int(n) for route, n in _COUNT.findall((await client.get("/metrics")).text)}
+    sent = 0
+    scrapes = []
+    done = asyncio.Event()
+
+    async def worker(index: int) -> None:
+        nonlocal sent
+        for i in range(index, REQUESTS, CONCURRENCY):
+            await client.get(PATHS[i % len(PATHS)])
+            sent += 1
+
+    async def scraper() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            text = (await client.get("/metrics")).text
+            scrapes.append((time.perf_counter() - started, int(_IN_FLIGHT.search(text).group(1))))
+            await asyncio.sleep(SCRAPE_INTERVAL)
+
+    scraping = asyncio.create_task(scraper())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await scraping
+
+    after = {route: int(n) for route, n in _COUNT.findall((await client.get("/metrics")).text)}
+    counted = sum(after.values()) - sum(before.values())
+    scraped = len(scrapes) + 1  # The scrapes themselves are requests too
+
+    print(f"requests: {sent} in {elapsed:.2f}s ({sent / elapsed:.0f} req/s)")
+    print(f"scrapes: {len(scrapes)}")
+    print(f"slowest scrape under load: {max(s for s, _ in scrapes) * 1000:.2f}ms")
+    render_ms = timeit.timeit(lambda: render(app), number=100) * 10
+    print(f"render(): {render_ms:.2f}ms for {len(after)} request series")
+    print(f"max in-flight seen: {max(n for _, n in scrapes)}")
+
+    ok = True
+    if counted != sent + scraped:
+        print(f"FAIL: histogram counts grew by {counted}, expected {sent + scraped}")
+        ok = False
+    if min(n for _, n in scrapes) < 1:  # The scrape itself is always in flight
+        print("FAIL: in-flight gauge dropped below 1 during a scrape")
+        ok = False
+    return ok
+
+
+async def bcrypt_queue() -> bool:
+    """Run concurrent verifications and sample the queue gauge."""
+    hashed = get_password_hash("benchmark")
+    samples = []
+
+    async def sample() -> None:
+        while True:
+            samples.append((password_hash_executor.pending, password_hash_executor.queued))
+            await asyncio.sleep(0.01)
+
+    sampling = asyncio.create_task(sample())
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(verify_password_async("benchmark", hashed) for _ in range(BCRYPT_CALLS))
+    )
+    elapsed = time.perf_counter() - started
+    sampling.cancel()
+
+    print(
+        f"bcrypt: {BCRYPT_CALLS} verifications on {password_hash_executor.workers} threads "
+        f"in {elapsed:.2f}s; max pending {max(p for p, _ in samples)}, "
+        f"max queued {max(q for _, q in samples)}"
+    )
+    ok = all(results) and password_hash_executor.pending == 0
+    if not ok:
+        print("FAIL: verification failed or executor still has pending calls")
+    return ok
+
+
+async def main() -> int:
+    """Run the benchmark."""
+    print(f"observe(): {observe_cost():.0f}ns per call")
+    async with AsyncClient(app=app, base_url="http://benchmark") as client:
+        ok = await load(client)
+    ok = await bcrypt_queue() and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)  # Request logs would dominate the timing
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,173 @@
+"""
+Benchmark requests/sec of a trivial endpoint through the middleware stack.
+
+Compares the previous ``BaseHTTPMiddleware`` implementations of the security
+headers and request logging (reproduced below) with the pure ASGI
+``SecurityHeadersMiddleware`` and ``RequestTimingMiddleware``. Each app has
+only those two middlewares and one ``GET /ping`` route; requests are driven
+by calling the ASGI app directly (no HTTP client or server in the way) from
+CONCURRENCY tasks, so the numbers isolate the middleware overhead.
+
+Also checks that a streaming response reaches the client in chunks through
+the new stack.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.middleware_throughput
+"""
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.core.middleware import RequestTimingMiddleware, SecurityHeadersMiddleware
+from src.core.query_stats import track_queries
+
+REQUESTS = 20000
+CONCURRENCY = 20
+ROUNDS = 3
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The previous security headers middleware."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+        return response
+
+
+async def legacy_log_requests(request: Request, call_next):
+    """The previous ``@app.middleware("http")`` request logger."""
+    start_time = time.time()
+    logging.getLogger("benchmark").info(f"Request: {request.method} {request.url.path}")
+    with track_queries() as queries:
+        response = await call_next(request)
+    process_time = time.time() - start_time
+    logging.getLogger("benchmark").info(
+        f"Response: {request.method} {request.url.path} "
+        f"- Status: {response.status_code} - Time: {process_time:.3f}s"
+    )
+    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-DB-Queries"] = str(queries.count)
+    response.headers["X-DB-Time"] = str(queries.seconds)
+    return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    """App with one trivial route and the old or new middleware pair."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk {i}\n".encode()
+                await asyncio.sleep(0.05)
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    if legacy:
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(BaseHTTPMiddleware, dispatch=legacy_log_requests)
+    else:
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RequestTimingMiddleware)
+    return app
+
+
+def http_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("benchmark", 80),
+    }
+
+
+async def call(app: FastAPI, path: str, on_body=None) -> None:
+    """Send one request through the ASGI app."""
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Like a server: block until the client disconnects (never, here)
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if on_body is not None and message["type"] == "http.response.body":
+            on_body(message)
+
+    await app(http_scope(path), receive, send)
+
+
+async def throughput(app: FastAPI) -> float:
+    """Requests per second for REQUESTS calls from CONCURRENCY tasks."""
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await call(app, "/ping")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY)))
+    return REQUESTS / (time.perf_counter() - started)
+
+
+async def streaming_chunks(app: FastAPI) -> list:
+    """Arrival times (ms) of the body chunks of /stream."""
+    started = time.perf_counter()
+    arrivals = []
+    await call(
+        app,
+        "/stream",
+        lambda message: message.get("body") and arrivals.append(
+            round((time.perf_counter() - started) * 1000)
+        ),
+    )
+    return arrivals
+
+
+async def main():
+    """Run the benchmark."""
+    logging.disable(logging.INFO)  # Measure the middleware, not the log handlers
+
+    apps = {"BaseHTTPMiddleware": build_app(legacy=True), "pure ASGI": build_app(legacy=False)}
+    for app in apps.values():
+        await call(app, "/ping")  # warm-up
+
+    for name, app in apps.items():
+        best = max([await throughput(app) for _ in range(ROUNDS)])
+        print(f"{name:<20} {best:>8.0f} req/s")
+
+    print(f"stream chunk arrivals (ms), pure ASGI: {await streaming_chunks(apps['pure ASGI'])}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""
+Benchmark PgBouncer connection modes: NullPool vs. a small persistent pool.
+
+Compares the previous serverless setup (``NullPool`` with
+``statement_cache_size=0``: a new connection, and a fresh parse/plan, per
+request) with the PgBouncer mode (a small persistent pool and uniquely named
+prepared statements that SQLAlchemy caches per connection).
+
+Each "request" opens a session, runs a user lookup by email and a project
+list query, and commits, like a typical API call. Reports p50/p99 latency
+and requests per second for each mode.
+
+Point ``PGBOUNCER_URL`` at a local PgBouncer in transaction mode
+(``pool_mode = transaction``, ``max_prepared_statements = 100``); without it
+the benchmark connects to ``DATABASE_URL`` directly.
+
+Usage:
+    PGBOUNCER_URL=postgresql+asyncpg://user@127.0.0.1:6432/db \\
+        python -m benchmarks.pgbouncer_pool
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.api.main import app  # noqa: F401 (configures all mappers)
+from src.core.config import settings
+from src.core.db_pool import pgbouncer_connect_args
+from src.models.project import Project
+from src.models.user import User
+
+REQUESTS = 500
+CONCURRENCY = 4
+POOL_SIZE = 2
+
+
+async def request(engine: AsyncEngine) -> float:
+    """Run one request-shaped unit of work and return its latency."""
+    started = time.perf_counter()
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        await db.execute(select(User.id, User.name).where(User.email == "bench@example.com"))
+        await db.execute(select(Project.id, Project.name).order_by(Project.created_at).limit(20))
+        await db.commit()
+    return time.perf_counter() - started
+
+
+async def run(engine: AsyncEngine) -> List[float]:
+    """Send REQUESTS requests with CONCURRENCY workers."""
+    await request(engine)  # warm-up
+    latencies: List[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            latencies.append(await request(engine))
+
+    await asyncio.gather(*(worker(REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY)))
+    return latencies
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> None:
+    """Print p50/p99 latency and throughput."""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<34} p50={statistics.median(ordered) * 1000:>7.2f}ms "
+        f"p99={p99 * 1000:>7.2f}ms req/s={len(ordered) / elapsed:>8.1f}"
+    )
+
+
+async def main():
+    """Run the benchmark."""
+    url = os.environ.get("PGBOUNCER_URL") or settings.database_url_async
+    print(f"target: {'PGBOUNCER_URL' if os.environ.get('PGBOUNCER_URL') else 'DATABASE_URL'}")
+
+    modes = [
+        (
+            "NullPool, statement_cache_size=0",
+            create_async_engine(
+                url, poolclass=NullPool, connect_args={"statement_cache_size": 0}
+            ),
+        ),
+        (
+            f"pool_size={POOL_SIZE}, unique prepared names",
+            create_async_engine(
+                url,
+                pool_size=POOL_SIZE,
+                max_overflow=CONCURRENCY - POOL_SIZE,
+                connect_args=pgbouncer_connect_args(),
+            ),
+        ),
+    ]
+
+    for name, engine in modes:
+        started = time.perf_counter()
+        latencies = await run(engine)
+        report(name, latencies, time.perf_counter() - started)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
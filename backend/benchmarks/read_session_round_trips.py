@@ -0,0 +1,139 @@
+"""
+Benchmark database round trips of GET requests: read-only session vs ``get_db``.
+
+Sends authenticated GET requests through the ASGI app in-process, once with
+the read-only ``get_read_db`` session and once with ``get_read_db`` overridden
+by ``get_db`` (the previous behaviour: BEGIN ... COMMIT around every request).
+
+For each mode it reports, per request, the SQL statements executed, the
+simple-protocol round trips (BEGIN / COMMIT / ROLLBACK and the pool pre-ping,
+counted with an asyncpg query logger) and the median latency. The benchmark
+user and projects are committed so that every request's session can see
+them, and are deleted at the end.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.read_session_round_trips
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from decimal import Decimal
+
+from httpx import AsyncClient
+from sqlalchemy import delete, event
+
+from src.api.main import app
+from src.core.database import AsyncSessionLocal, engine, get_db, get_read_db
+from src.core.security import create_access_token
+from src.models.project import Project
+from src.models.user import User, UserRole
+
+REQUESTS = 200
+PATHS = ["/api/v1/projects/", "/api/v1/tasks/my-tasks/summary", "/api/v1/dashboard/"]
+
+
+class RoundTripCounter:
+    """Count statements and transaction-control commands sent to the server."""
+
+    def __init__(self):
+        self.statements = 0
+        self.transaction_control = 0
+
+    def on_statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+
+    def on_connect(self, dbapi_connection, connection_record):
+        # Simple-protocol queries (BEGIN/COMMIT/ROLLBACK, pre-ping) bypass cursor events
+        dbapi_connection._connection.add_query_logger(self.on_query)
+
+    def on_query(self, record):
+        self.transaction_control += 1
+
+
+async def seed() -> User:
+    """Create a user with a few projects."""
+    async with AsyncSessionLocal() as db:
+        user = User(
+            name="基准用户",
+            email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password="x" * 60,
+            role=UserRole.ADMIN,
+        )
+        db.add(user)
+        await db.flush()
+        db.add_all(
+            Project(name=f"基准项目{i}", budget=Decimal("1000.00"), owner_id=user.id)
+            for i in range(20)
+        )
+        await db.commit()
+        return user
+
+
+async def cleanup(user: User) -> None:
+    """Delete the benchmark data."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Project).where(Project.owner_id == user.id))
+        await db.execute(delete(User).where(User.id == user.id))
+        await db.commit()
+
+
+async def run(client: AsyncClient, headers: dict, counter: RoundTripCounter, path: str) -> dict:
+    """Send REQUESTS requests to ``path`` and collect per-request metrics."""
+    await client.get(path, headers=headers)  # warm-up
+    counter.statements = counter.transaction_control = 0
+
+    latencies = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    return {
+        "statements": counter.statements / REQUESTS,
+        "transaction_control": counter.transaction_control / REQUESTS,
+        "p50_ms": statistics.median(latencies) * 1000,
+    }
+
+
+def report(name: str, path: str, result: dict) -> None:
+    """Print one result line."""
+    print(
+        f"{name:<10} {path:<32} statements={result['statements']:>4.1f} "
+        f"txn+ping={result['transaction_control']:>4.1f} "
+        f"round_trips={result['statements'] + result['transaction_control']:>4.1f} "
+        f"p50={result['p50_ms']:>6.2f}ms"
+    )
+
+
+async def main():
+    """Run the benchmark."""
+    counter = RoundTripCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter.on_statement)
+    event.listen(engine.sync_engine, "connect", counter.on_connect)
+
+    user = await seed()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    try:
+        async with AsyncClient(app=app, base_url="http://benchmark") as client:
+            for path in PATHS:
+                app.dependency_overrides[get_read_db] = get_db
+                report("get_db", path, await run(client, headers, counter, path))
+                app.dependency_overrides.clear()
+                report("read-only", path, await run(client, headers, counter, path))
+    finally:
+        app.dependency_overrides.clear()
+        await cleanup(user)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""
+Benchmark JSON serialization of the largest list payloads.
+
+Serializes ITEMS rows (the dicts the list services return) as
+``List[TaskResponse]`` (with embedded assignee ``UserResponse``) and
+``List[ProjectResponse]`` (Decimal budgets) three ways:
+
+1. FastAPI's response_model path: validate, convert to JSON-compatible Python
+   objects, then ``json.dumps`` in ``JSONResponse`` (the previous default).
+2. The same path rendered by ``ORJSONResponse`` (the new default class).
+3. ``list_response``: models constructed without re-validation, then one
+   ``TypeAdapter.dump_json`` call.
+
+All three must produce the same JSON document.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.response_serialization
+"""
+import asyncio
+import json
+import sys
+import timeit
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import src.api.main  # noqa: F401 (configures mappers)
+from src.api.responses import ORJSONResponse, list_response
+from src.models.project import ProjectStatus
+from src.models.task import TaskPriority, TaskStatus
+from src.models.user import UserRole
+from src.schemas.project import ProjectResponse
+from src.schemas.task import TaskResponse
+
+ITEMS = 500
+NUMBER = 50
+
+
+def user(i: int) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "name": f"成员 {i}",
+        "email": f"member{i}@example.com",
+        "role": UserRole.MEMBER,
+        "is_active": True,
+        "created_at": datetime(2025, 1, 1) + timedelta(minutes=i),
+    }
+
+
+def task_rows() -> List[dict]:
+    now = datetime(2025, 6, 1, 12, 0, 0)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"任务 {i}",
+            "description": "用户访谈纪要整理与问题归类" * 3,
+            "status": TaskStatus.IN_PROGRESS,
+            "priority": TaskPriority.HIGH,
+            "due_date": date(2025, 7, 1),
+            "project_id": uuid.uuid4(),
+            "assignee_id": uuid.uuid4(),
+            "assignee": user(i),
+            "created_by_id": uuid.uuid4(),
+            "is_overdue": False,
+            "completed_at": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(ITEMS)
+    ]
+
+
+def project_rows() -> List[dict]:
+    now = datetime(2025, 6, 1, 12, 0, 0)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"项目 {i}",
+            "description": "体验问题专项治理",
+            "status": ProjectStatus.IN_PROGRESS,
+            "start_date": date(2025, 1, 1),
+            "end_date": date(2025, 12, 31),
+            "budget": Decimal("125000.50"),
+            "spent": Decimal("3200.75"),
+            "owner_id": uuid.uuid4(),
+            "owner": user(i),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(ITEMS)
+    ]
+
+
+async def response_model_path(field, rows, response_class) -> bytes:
+    """What FastAPI does for ``return rows`` with ``response_model=List[...]``."""
+    content = await serialize_response(field=field, response_content=rows)
+    return response_class(content).body
+
+
+def bench(name: str, schema, rows) -> None:
+    field = create_response_field(name=f"{name}_list", type_=List[schema])
+    loop = asyncio.new_event_loop()
+    ways = {
+        "response_model + json": lambda: loop.run_until_complete(
+            response_model_path(field, rows, JSONResponse)
+        ),
+        "response_model + orjson": lambda: loop.run_until_complete(
+            response_model_path(field, rows, ORJSONResponse)
+        ),
+        "list_response": lambda: list_response(schema, rows).body,
+    }
+
+    documents = [json.loads(serialize()) for serialize in ways.values()]
+    if any(document != documents[0] for document in documents[1:]):
+        raise SystemExit(f"FAIL: {name} serializations differ")
+
+    print(f"\n{ITEMS} x {schema.__name__} ({len(ways['list_response']()) / 1024:.0f} KiB)")
+    baseline = None
+    for way, serialize in ways.items():
+        ms = timeit.timeit(serialize, number=NUMBER) / NUMBER * 1000
+        baseline = baseline or ms
+        print(f"  {way:<26} {ms:>7.2f}ms  ({baseline / ms:.1f}x)")
+    loop.close()
+
+
+def main():
+    """Run the benchmark."""
+    bench("task", TaskResponse, task_rows())
+    bench("project", ProjectResponse, project_rows())
+
+
+if __name__ == "__main__":
+    main()
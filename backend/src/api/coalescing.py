@@ -0,0 +1,69 @@
+"""
+Coalescing of identical concurrent GET requests (see ``src.core.single_flight``).
+
+Requests are identical when they have the same path and query parameters and,
+for user-specific results, the same principal. Clients that wrote within the
+read-your-writes window are never coalesced, so they cannot receive a result
+computed before their write.
+"""
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.database import wrote_recently
+from src.core.single_flight import single_flight
+
+T = TypeVar("T")
+
+
+def request_key(request: Request, principal: Optional[Hashable] = None) -> Hashable:
+    """Normalized route + query parameters (+ principal) of a request."""
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())), principal)
+
+
+def _copy(response: Response) -> Response:
+    """
+    Give each waiter its own Response.
+
+    Middleware (CORS, security headers) mutates the headers of the response it
+    sends, so one instance must not be sent twice.
+    """
+    copy = Response(content=response.body, status_code=response.status_code)
+    copy.raw_headers = list(response.raw_headers)
+    return copy
+
+
+async def coalesced(
+    request: Request,
+    name: str,
+    compute: Callable[[], Awaitable[T]],
+    db: Optional[AsyncSession] = None,
+    principal: Optional[Hashable] = None,
+) -> T:
+    """
+    Run ``compute`` once for identical concurrent requests.
+
+    Args:
+        request: Incoming request, source of the key
+        name: Metrics label, e.g. ``"dashboard"``
+        compute: Produces the route's result
+        db: Request session; closed while waiting so its connection returns to the pool
+        principal: User id for results that depend on the caller
+
+    Returns:
+        The route's result
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED or wrote_recently(request):
+        return await compute()
+
+    result = await single_flight.run(
+        name,
+        request_key(request, principal),
+        compute,
+        on_wait=db.close if db is not None else None,
+    )
+    if isinstance(result, Response):
+        return _copy(result)
+    return result
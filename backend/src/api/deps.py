@@ -1,12 +1,12 @@
 """Dependency injection utilities for FastAPI."""
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.database import SAFE_METHODS, get_db, get_read_db
 from src.core.security import decode_access_token
 from src.models.user import User
 from src.schemas.user import TokenData
@@ -14,12 +14,49 @@ from src.schemas.user import TokenData
 # HTTP Bearer token security
 security = HTTPBearer()
 
+# Scope key under which POST /api/v1/batch passes its user to sub-requests
+AUTHENTICATED_USER = "auth.user"
+
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
 ) -> User:
-    """Get current authenticated user from JWT token."""
+    """
+    Get current authenticated user from JWT token.
+
+    GET routes look the user up on the read-only session they share; mutating
+    routes on their own ``get_db`` session, so writes are authorized against
+    the primary and hold a single pool connection (neither session checks
+    out a connection it does not use). Batch sub-requests reuse the user the
+    batch request authenticated.
+    """
+    return await _authenticate(
+        request, credentials, read_db if request.method in SAFE_METHODS else db
+    )
+
+
+async def get_current_reader(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db),
+) -> User:
+    """
+    Get current authenticated user on the read-only session, for a POST route
+    that does not write itself (POST /api/v1/batch).
+    """
+    return await _authenticate(request, credentials, db)
+
+
+async def _authenticate(
+    request: Request, credentials: HTTPAuthorizationCredentials, db: AsyncSession
+) -> User:
+    user = request.scope.get(AUTHENTICATED_USER)
+    if user is not None:
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -0,0 +1,46 @@
+"""Sparse fieldset (``fields=`` / ``expand=``) support for API routes."""
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Query, Response, status
+
+from src.services.projections import FieldSelection, ResourceFields
+
+
+def field_selection(resource: ResourceFields) -> Callable[..., Optional[FieldSelection]]:
+    """
+    Create a dependency parsing ``fields`` / ``expand`` query parameters.
+
+    The dependency returns None when neither parameter is given, so routes can
+    keep their regular response path, and rejects unknown names with 400.
+    """
+    expand_help = ", ".join(resource.expand_names) or "none"
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated {resource.name} fields to return "
+            f"({', '.join(resource.field_names)})",
+        ),
+        expand: Optional[str] = Query(
+            None, description=f"Comma-separated relations to embed ({expand_help})"
+        ),
+    ) -> Optional[FieldSelection]:
+        if fields is None and expand is None:
+            return None
+        try:
+            return resource.parse(fields, expand)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return dependency
+
+
+def sparse_response(
+    resource: ResourceFields, selection: FieldSelection, data: Any, many: bool = True
+) -> Response:
+    """Serialize rows with the trimmed schema for a selection."""
+    adapter = resource.adapter(selection, many=many)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(data)),
+        media_type="application/json",
+    )
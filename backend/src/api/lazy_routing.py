@@ -0,0 +1,107 @@
+"""
+Lazy router mounting for faster cold starts.
+
+A ``LazyRouter`` is a placeholder route that owns a URL prefix (or, for a
+router sharing its prefix with others, only the paths it serves under it).
+The first request under those paths imports the route module, splices its routes into
+the application at the placeholder's position (so route precedence is the
+same as with eager ``include_router``) and dispatches the request again.
+Modules for endpoints that are never called in a serverless instance are never
+imported, along with their services and schemas.
+
+FastAPI already builds the OpenAPI schema on demand; ``install_lazy_openapi``
+makes that build load every pending router first so the docs stay complete.
+"""
+import importlib
+import logging
+import re
+import time
+from typing import List, Optional, Pattern, Tuple
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+def _path_pattern(template: str) -> Pattern:
+    """Regex for ``template`` and every path below it; ``{name}`` matches one segment."""
+    parts = re.split(r"\{[^}]+\}", template.rstrip("/"))
+    return re.compile("[^/]+".join(map(re.escape, parts)) + "(/.*)?")
+
+
+class LazyRouter(BaseRoute):
+    """
+    Placeholder for ``app.include_router(module.router, prefix=..., tags=...)``.
+
+    ``paths`` (templates under the prefix, such as ``"/items/{item_id}"``)
+    narrows the placeholder to those paths and the paths below them; by default
+    it claims everything under the prefix.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        module: str,
+        prefix: str,
+        tags: Optional[List[str]] = None,
+        paths: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.module = module
+        self.prefix = prefix.rstrip("/")
+        self.tags = tags or []
+        self.patterns = [_path_pattern(self.prefix + path) for path in paths or [""]]
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        if any(pattern.fullmatch(scope["path"]) for pattern in self.patterns):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        # Routes are only resolvable by name once the module is loaded
+        raise NoMatchFound(name, path_params)
+
+    def load(self) -> None:
+        """Import the route module and replace this placeholder with its routes."""
+        routes = self.app.router.routes
+        if self not in routes:
+            return  # Loaded by an earlier request
+
+        started = time.perf_counter()
+        module = importlib.import_module(self.module)
+        mounted = APIRouter()
+        mounted.include_router(module.router, prefix=self.prefix, tags=self.tags)
+
+        index = routes.index(self)
+        routes[index : index + 1] = mounted.routes
+        self.app.openapi_schema = None
+        logger.info(
+            "Loaded router %s in %.1fms", self.module, (time.perf_counter() - started) * 1000
+        )
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def load_lazy_routers(app: FastAPI) -> None:
+    """Load every router that is still a placeholder."""
+    for route in list(app.router.routes):
+        if isinstance(route, LazyRouter):
+            route.load()
+
+
+def install_lazy_openapi(app: FastAPI) -> None:
+    """Load all pending routers before the OpenAPI schema is first generated."""
+    generate = app.openapi
+
+    def openapi():
+        if app.openapi_schema is None:
+            load_lazy_routers(app)
+        return generate()
+
+    app.openapi = openapi
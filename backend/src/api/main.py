@@ -1,27 +1,33 @@
 """FastAPI main application entry point."""
+import asyncio
+import importlib
 import logging
-import time
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.exc import SQLAlchemyError
-from slowapi.errors import RateLimitExceeded
 
-from src.api.routes import audit_logs, auth, dashboard, expenses, projects, tasks, users
+from src.api.lazy_routing import LazyRouter, install_lazy_openapi
+from src.api.responses import ORJSONResponse
+import src.models  # noqa: F401 (registers all mappers before routers are loaded)
+from src.core.access_log import queue_logging
+from src.core.admission import admission
+from src.core.compression import CompressionMiddleware
 from src.core.config import settings
+from src.core.idempotency import IdempotencyMiddleware, idempotency_store
 from src.core.middleware import (
-    limiter,
-    rate_limit_error_handler,
+    AdmissionControlMiddleware,
+    PrimaryStickinessMiddleware,
+    RateLimitMiddleware,
+    RequestTimingMiddleware,
     SecurityHeadersMiddleware,
 )
+from src.core.rate_limit import rate_limiter
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configure logging (written by a background thread so a slow sink never blocks requests)
+queue_logging.install(settings.LOG_QUEUE_SIZE)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI application
@@ -45,8 +51,15 @@ app = FastAPI(
     2. 在请求头中添加: `Authorization: Bearer <token>`
 
     ### 速率限制
-    - 默认限制: 100 次/分钟
-    - 登录接口: 5 次/分钟
+    - 默认限制: 100 次/分钟（已登录按用户计，否则按 IP 计；所有 worker 共享额度）
+    - 登录/注册接口: 5 次/分钟（按 IP）
+    - 搜索、仪表盘等开销大的接口按多次计
+    - 超限返回 429，`Retry-After` 头给出需等待的秒数
+
+    ### 幂等请求
+    POST/PUT/PATCH/DELETE 可携带 `Idempotency-Key: <唯一值>` 请求头（24 小时内有效）。
+    使用相同的 key 重试时直接返回首次请求的响应（带 `Idempotent-Replayed: true`），
+    不会重复创建；首次请求仍在处理时，重试会等待其完成。
     """,
     version="0.1.0",
     contact={
@@ -56,13 +69,26 @@ app = FastAPI(
     license_info={
         "name": "MIT",
     },
+    default_response_class=ORJSONResponse,
+)
+
+# Admission control: per-route-class concurrency, 503 when the database is overloaded
+app.add_middleware(AdmissionControlMiddleware, controller=admission)
+
+# Idempotency-Key: retried writes get the first response back instead of running again
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
 )
 
-# Configure rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, rate_limit_error_handler)
+# Read-your-writes token (cookie and X-Primary-Until) after a committed write
+app.add_middleware(PrimaryStickinessMiddleware)
+
+# Rate limiting (inside CORS, so 429 and 503 responses still get CORS and security headers)
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
 
-# Configure CORS - MUST be added FIRST before other middlewares
+# Configure CORS - MUST be added before the other middlewares (preflights never reach the limiter)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -72,46 +98,26 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Add GZip compression middleware (responses > 1KB)
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Response compression (zstd/br/gzip, responses > 1KB) with ETags and a compressed cache
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    cache_bytes=settings.COMPRESSION_CACHE_MB * 1024 * 1024,
+    workers=settings.COMPRESSION_WORKERS,
+)
 
 # Add security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming requests and their processing time."""
-    start_time = time.time()
-
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
-
-    try:
-        response = await call_next(request)
-
-        # Calculate processing time
-        process_time = time.time() - start_time
-
-        # Log response
-        logger.info(
-            f"Response: {request.method} {request.url.path} "
-            f"- Status: {response.status_code} - Time: {process_time:.3f}s"
-        )
-
-        # Add processing time header
-        response.headers["X-Process-Time"] = str(process_time)
-
-        return response
-    except Exception as e:
-        # Log exception
-        process_time = time.time() - start_time
-        logger.error(
-            f"Error: {request.method} {request.url.path} "
-            f"- Exception: {str(e)} - Time: {process_time:.3f}s"
-        )
-        raise
+# Request timing, access log and metrics (outermost, so it times the whole stack)
+app.add_middleware(
+    RequestTimingMiddleware,
+    n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_request_ms=settings.SLOW_REQUEST_MS,
+)
 
 
 # Exception handlers
@@ -199,14 +205,74 @@ async def detailed_health_check():
     return health_status
 
 
-# Include routers
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
-app.include_router(projects.router, prefix="/api/v1/projects", tags=["Projects"])
-app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["Tasks"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
-app.include_router(expenses.router, prefix="/api/v1", tags=["Expenses"])
-app.include_router(audit_logs.router, prefix="/api/v1/audit-logs", tags=["Audit Logs"])
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus metrics (bearer METRICS_TOKEN required when configured)."""
+    from src.core.prometheus import CONTENT_TYPE, render
+
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != (
+        f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": "未授权"})
+
+    return PlainTextResponse(render(app), media_type=CONTENT_TYPE)
+
+
+# Routers: (module under src.api.routes, prefix, tags)
+ROUTERS = [
+    ("auth", "/api/v1/auth", ["Authentication"]),
+    ("dashboard", "/api/v1/dashboard", ["Dashboard"]),
+    ("projects", "/api/v1/projects", ["Projects"]),
+    ("tasks", "/api/v1/tasks", ["Tasks"]),
+    ("users", "/api/v1/users", ["Users"]),
+    ("expenses", "/api/v1", ["Expenses"]),
+    ("audit_logs", "/api/v1/audit-logs", ["Audit Logs"]),
+    ("search", "/api/v1/search", ["Search"]),
+    ("autocomplete", "/api/v1/autocomplete", ["Autocomplete"]),
+    ("metrics", "/api/v1/metrics", ["Metrics"]),
+    ("batch", "/api/v1/batch", ["Batch"]),
+    ("events", "/api/v1/events", ["Events"]),
+]
+
+# Lazy mode: paths claimed by routers that share their prefix with others (all by default),
+# so requests for the routers after them do not import them
+LAZY_PATHS = {
+    "expenses": ["/projects/{project_id}/expenses", "/projects/{project_id}/budget", "/expenses"],
+}
+
+# Include routers; in lazy mode each module is imported on the first request under its prefix
+for name, prefix, tags in ROUTERS:
+    module = f"src.api.routes.{name}"
+    if settings.LAZY_ROUTERS:
+        app.router.routes.append(LazyRouter(app, module, prefix, tags, LAZY_PATHS.get(name)))
+    else:
+        app.include_router(importlib.import_module(module).router, prefix=prefix, tags=tags)
+
+if settings.LAZY_ROUTERS:
+    install_lazy_openapi(app)
+
+
+@app.on_event("startup")
+async def build_autocomplete_index():
+    """Build the autocomplete index in the background; queries use the DB until it is ready."""
+    if not settings.AUTOCOMPLETE_ENABLED:
+        return
+
+    from src.core.database import AsyncSessionLocal
+    from src.services.autocomplete_service import AutocompleteService
+
+    AutocompleteService.configure(settings.AUTOCOMPLETE_MEMORY_BUDGET_MB)
+    app.state.autocomplete_build = asyncio.create_task(
+        AutocompleteService.rebuild(AsyncSessionLocal)
+    )
+
+
+@app.on_event("shutdown")
+async def stop_change_feed_listener():
+    """Close the LISTEN connection of the change feed, if one was opened."""
+    from src.core.change_feed import pg_bridge
+
+    await pg_bridge.stop()
 
 
 @app.get("/", tags=["Root"])
@@ -0,0 +1,111 @@
+"""Fast JSON serialization for API responses (orjson and Pydantic's Rust serializer)."""
+import inspect
+import typing
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+def _default(value: Any) -> Any:
+    """Serialize types orjson does not handle natively (UUID and datetime it does)."""
+    if isinstance(value, Decimal):
+        return str(value)  # Same as Pydantic's JSON mode, without float rounding
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: renders with orjson instead of the stdlib ``json``."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """Cached ``TypeAdapter`` for a list of ``schema``."""
+    return TypeAdapter(List[schema])
+
+
+def _model_in(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Return (model class, is a list) for ``Model``, ``Optional[Model]`` or ``List[Model]``."""
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return annotation, False
+    origin = typing.get_origin(annotation)
+    for arg in typing.get_args(annotation):
+        model, _ = _model_in(arg)
+        if model is not None:
+            return model, origin in (list, List)
+    return None, False
+
+
+def _is_date(annotation: Any) -> bool:
+    """True for ``date`` and ``Optional[date]`` (but not ``datetime``)."""
+    if annotation is date:
+        return True
+    return typing.get_origin(annotation) is Union and date in typing.get_args(annotation)
+
+
+@lru_cache(maxsize=None)
+def _field_plan(
+    schema: Type[BaseModel],
+) -> Tuple[Dict[str, Tuple[Type[BaseModel], bool]], Tuple[str, ...]]:
+    """Fields of ``schema`` holding nested models, and fields typed as dates."""
+    nested = {}
+    dates = []
+    for name, info in schema.model_fields.items():
+        model, many = _model_in(info.annotation)
+        if model is not None:
+            nested[name] = (model, many)
+        elif _is_date(info.annotation):
+            dates.append(name)
+    return nested, tuple(dates)
+
+
+def construct(schema: Type[BaseModel], data: Any) -> BaseModel:
+    """
+    Build ``schema`` from a row dict or ORM object without validating it.
+
+    Nested models are constructed recursively, and ``datetime`` values of
+    ``date`` fields are narrowed as validation would. Only for data the
+    application produced itself: values were validated when they were written,
+    and re-validating them per response (e-mail syntax checks in particular)
+    dominates the cost of large lists.
+    """
+    if isinstance(data, dict):
+        values = dict(data)
+    else:
+        values = {name: getattr(data, name) for name in schema.model_fields if hasattr(data, name)}
+
+    nested, dates = _field_plan(schema)
+    for name, (model, many) in nested.items():
+        value = values.get(name)
+        if value is None or isinstance(value, BaseModel):
+            continue
+        values[name] = [construct(model, v) for v in value] if many else construct(model, value)
+    for name in dates:
+        value = values.get(name)
+        if isinstance(value, datetime):
+            values[name] = value.date()
+
+    return schema.model_construct(**values)
+
+
+def list_response(schema: Type[BaseModel], items: Iterable[Any]) -> Response:
+    """
+    Serialize a list of rows or ORM objects as ``List[schema]``.
+
+    Replaces FastAPI's response_model path (validate, convert to Python
+    primitives, then encode) with ``construct`` and one ``dump_json`` call.
+    Routes keep their ``response_model`` for the OpenAPI schema.
+    """
+    adapter = list_adapter(schema)
+    return Response(
+        content=adapter.dump_json([construct(schema, item) for item in items]),
+        media_type="application/json",
+    )
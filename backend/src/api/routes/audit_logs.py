@@ -6,7 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_current_admin_user, get_db
+from src.api.deps import get_current_admin_user, get_read_db
 from src.models.user import User
 from src.schemas.audit_log import AuditLogListResponse, AuditLogResponse
 from src.services.audit_service import AuditService
@@ -29,7 +29,7 @@ async def list_audit_logs(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List audit logs with optional filtering (admin only).
@@ -0,0 +1,35 @@
+"""Autocomplete API routes."""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import get_current_user, get_read_db
+from src.models.user import User
+from src.schemas.autocomplete import AutocompleteResponse, AutocompleteType
+from src.services.autocomplete_service import AutocompleteService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=AutocompleteResponse)
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed by the user"),
+    types: Optional[List[AutocompleteType]] = Query(
+        None, alias="type", description="Restrict to resource types (repeatable)"
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Suggest user, project and task names starting with a prefix.
+
+    - **q**: Name prefix; Chinese names also match full pinyin (`zhangsan`) and initials (`zs`)
+    - **type**: `user`, `project` or `task`; repeat to suggest several types
+    - **limit**: Maximum number of suggestions
+
+    Served from the in-memory index once it is built; falls back to the database otherwise.
+    """
+    items, source = await AutocompleteService.suggest(db=db, query=q, kinds=types, limit=limit)
+    return AutocompleteResponse(items=items, source=source)
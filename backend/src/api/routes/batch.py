@@ -0,0 +1,269 @@
+"""
+Batch API route: several API calls in one HTTP round trip.
+
+Sub-requests are dispatched in-process to the application's router, so they
+skip CORS, compression, security headers and the access log, and the batch
+is authenticated once: every sub-request reuses the batch's user instead of
+decoding the token and loading the user again.
+
+- Consecutive GETs run concurrently (at most BATCH_CONCURRENCY at a time),
+  each on its own read session, since a session cannot run two statements at
+  once.
+- Writes run one at a time, in order, each in its own transaction; later
+  reads see them (read-your-writes).
+- A sub-request that runs on its own reuses the batch's read session, except
+  reads after a write, which open a fresh one so they can be routed to the
+  primary.
+- Every sub-request is charged to the user's rate limit like a separate call
+  (the batch itself costs nothing) and gets its own 429 when over it.
+- Every sub-request is admitted in its own route class like a separate call
+  (the batch itself is not limited, see ``src.core.admission``) and gets its
+  own 503 when shed, so a batch cannot run heavy calls past their limits.
+- An ``Idempotency-Key`` applies to the batch as a whole: a retried batch
+  gets the stored batch response back. Sub-requests cannot have keys of
+  their own (the header is not passed on to them).
+- Streaming responses (the change feed) cannot be batched: such a
+  sub-request gets a 400. A sub-request still running after
+  BATCH_TIMEOUT_SECONDS sees a client disconnect and gets a 504.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette._exception_handler import wrap_app_handling_exceptions
+from starlette.datastructures import Headers
+from starlette.types import Message, Scope
+
+from src.api.deps import AUTHENTICATED_USER, get_current_reader, get_read_db
+from src.api.responses import ORJSONResponse
+from src.core.admission import RETRY_AFTER_SECONDS, ClassLimiter, admission
+from src.core.config import settings
+from src.core.database import SHARED_READ_SESSION
+from src.core.middleware import OVERLOADED_DETAIL, RATE_LIMITED_DETAIL
+from src.core.query_stats import track_queries
+from src.core.rate_limit import rate_limiter, user_key
+from src.models.user import User
+from src.schemas.batch import BatchRequest, BatchRequestItem, BatchResponseItem
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+BATCH_PATH = "/api/v1/batch"
+
+# Routes whose responses never end on their own
+STREAMING_PREFIXES = ("/api/v1/events",)
+
+# Seconds a sub-request may take to stop after it was told the client disconnected
+_DISCONNECT_GRACE_SECONDS = 1.0
+
+# Request headers not passed on to sub-requests (they describe the batch itself)
+_BATCH_ONLY_HEADERS = {
+    b"content-length",
+    b"content-type",
+    b"accept-encoding",
+    b"if-none-match",
+    b"x-request-id",
+    b"idempotency-key",
+}
+
+
+def _result(status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    return {"status": status, "headers": headers or {}, "body": body}
+
+
+def _streaming_result(item: BatchRequestItem) -> Dict[str, Any]:
+    return _result(400, {"detail": f"Streaming responses are not supported in batch: {item.path}"})
+
+
+async def _rate_limited(user: User, method: str, path: str) -> Optional[Dict[str, Any]]:
+    """Charge a sub-request to the user's rate limit; a 429 result when over it."""
+    decision = await rate_limiter.hit(user_key(user.email), rate_limiter.cost(method, path))
+    if decision.allowed:
+        return None
+    return _result(
+        429, {"detail": RATE_LIMITED_DETAIL}, {"retry-after": decision.retry_after_header}
+    )
+
+
+async def _admit(method: str, path: str) -> Tuple[Optional[ClassLimiter], bool]:
+    """Take an admission slot for a sub-request: (limiter to release or None, admitted)."""
+    route_class = admission.classify(method, path) if admission.enabled else None
+    if route_class is None:
+        return None, True
+    limiter = admission.limiters[route_class]
+    return limiter, await limiter.acquire()
+
+
+def _sub_scope(request: Request, user: User, item: BatchRequestItem, body: bytes) -> Scope:
+    """ASGI scope for a sub-request, carrying the batch's user and headers."""
+    path, _, query = item.path.partition("?")
+    headers = [(k, v) for k, v in request.scope["headers"] if k.lower() not in _BATCH_ONLY_HEADERS]
+    if body:
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+    scope = {
+        key: value
+        for key, value in request.scope.items()
+        if key in ("asgi", "http_version", "scheme", "server", "client", "root_path", "app")
+    }
+    scope.update(
+        {
+            "type": "http",
+            "method": item.method,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+            # Shared with the batch, so a write's read-your-writes token (see get_db) is
+            # seen by later sub-requests and returned with the batch response
+            "state": request.scope.setdefault("state", {}),
+            "starlette.exception_handlers": request.scope["starlette.exception_handlers"],
+            AUTHENTICATED_USER: user,
+        }
+    )
+    return scope
+
+
+async def _dispatch(
+    request: Request, user: User, item: BatchRequestItem, shared_db: Optional[AsyncSession]
+) -> Dict[str, Any]:
+    """Run one sub-request against the router and capture its response."""
+    path = item.path.partition("?")[0]
+    if not path.startswith("/api/v1/") or path.rstrip("/") == BATCH_PATH:
+        return _result(400, {"detail": f"Unsupported path in batch: {item.path}"})
+
+    if path.startswith(STREAMING_PREFIXES):
+        return _streaming_result(item)
+
+    limited = await _rate_limited(user, item.method, path)
+    if limited is not None:
+        return limited
+
+    limiter, admitted = await _admit(item.method, path)
+    if not admitted:
+        return _result(
+            503, {"detail": OVERLOADED_DETAIL}, {"retry-after": str(RETRY_AFTER_SECONDS)}
+        )
+
+    body = orjson.dumps(item.body) if item.body is not None else b""
+    scope = _sub_scope(request, user, item, body)
+    if shared_db is not None:
+        scope[SHARED_READ_SESSION] = shared_db
+
+    sent = False
+    disconnected = asyncio.Event()
+
+    async def receive() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    start: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+    streaming = False
+
+    async def send(message: Message) -> None:
+        nonlocal streaming
+        if streaming:
+            return
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message.get("headers", [])).get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                streaming = True
+                disconnected.set()  # Ends the stream; nothing of it is kept
+                return
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    app = request.app.router
+    timeout = settings.BATCH_TIMEOUT_SECONDS
+    timer = asyncio.get_running_loop().call_later(timeout, disconnected.set)
+    with track_queries() as queries:
+        try:
+            await asyncio.wait_for(
+                wrap_app_handling_exceptions(app, Request(scope, receive))(scope, receive, send),
+                timeout + _DISCONNECT_GRACE_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            pass  # Ignored the disconnect: reported as timed out below
+        except Exception:
+            logger.error(
+                f"Unhandled exception in batch on {item.method} {item.path}", exc_info=True
+            )
+            return _result(500, {"detail": "服务器内部错误，请联系管理员"})
+        finally:
+            timer.cancel()
+            if limiter is not None:
+                limiter.release()
+                admission.observe(queries)
+
+    if streaming:
+        return _streaming_result(item)
+    if disconnected.is_set():
+        logger.warning(f"Batch sub-request {item.method} {item.path} timed out after {timeout}s")
+        return _result(504, {"detail": f"Request in batch timed out: {item.path}"})
+
+    headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in start.get("headers", [])}
+    content = b"".join(chunks)
+    if not content:
+        payload = None
+    elif headers.get("content-type", "").startswith("application/json"):
+        payload = orjson.loads(content)
+    else:
+        payload = content.decode("utf-8", errors="replace")
+    return _result(start.get("status", 500), payload, headers)
+
+
+def _groups(items: List[BatchRequestItem]) -> List[Tuple[bool, List[int]]]:
+    """Split sub-request indexes into runs of consecutive GETs and single writes."""
+    groups: List[Tuple[bool, List[int]]] = []
+    for index, item in enumerate(items):
+        is_read = item.method == "GET"
+        if is_read and groups and groups[-1][0]:
+            groups[-1][1].append(index)
+        else:
+            groups.append((is_read, [index]))
+    return groups
+
+
+@router.post("", response_model=List[BatchResponseItem])
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Run several API calls in one request.
+
+    Each entry has a `method`, a `path` under `/api/v1/` (with query string) and
+    an optional JSON `body`. The response lists `status`, `headers` and `body`
+    for each call, in request order; one failing call does not affect the others.
+    """
+    items = batch_request.requests
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    wrote = False
+
+    async def run(index: int, shared_db: Optional[AsyncSession]) -> None:
+        async with semaphore:
+            results[index] = await _dispatch(request, current_user, items[index], shared_db)
+
+    for is_read, indexes in _groups(items):
+        if len(indexes) > 1:
+            await asyncio.gather(*(run(index, None) for index in indexes))
+        else:
+            await run(indexes[0], None if is_read and wrote else db)
+        wrote = wrote or not is_read
+
+    return ORJSONResponse(results)
@@ -1,9 +1,10 @@
 """Dashboard API routes."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.coalescing import coalesced
 from src.api.deps import get_current_user
-from src.core.database import get_db
+from src.core.database import get_read_db
 from src.models.user import User
 from src.schemas.dashboard import DashboardStats
 from src.services.dashboard_service import DashboardService
@@ -13,8 +14,9 @@ router = APIRouter()
 
 @router.get("/", response_model=DashboardStats)
 async def get_dashboard(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get dashboard statistics.
@@ -24,20 +26,33 @@ async def get_dashboard(
     - Budget information (total budget, total spent, usage rate)
     - Overdue projects and tasks count
     - User's pending tasks count
+
+    Identical concurrent requests from the same user share one computation.
     """
-    stats = await DashboardService.get_dashboard_stats(db, current_user.id)
-    return stats
+    return await coalesced(
+        request,
+        "dashboard",
+        lambda: DashboardService.get_dashboard_stats(db, current_user.id),
+        db=db,
+        principal=current_user.id,
+    )
 
 
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get dashboard statistics (alias endpoint).
 
     Same as GET / but provides an explicit /stats endpoint.
     """
-    stats = await DashboardService.get_dashboard_stats(db, current_user.id)
-    return stats
+    return await coalesced(
+        request,
+        "dashboard",
+        lambda: DashboardService.get_dashboard_stats(db, current_user.id),
+        db=db,
+        principal=current_user.id,
+    )
@@ -0,0 +1,64 @@
+"""Change feed API route (server-sent events)."""
+import asyncio
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.deps import get_current_user
+from src.core.change_feed import RESYNC, Subscription, change_bus, pg_bridge
+from src.core.config import settings
+from src.models.user import User
+
+router = APIRouter()
+
+# Reconnect delay suggested to EventSource clients (milliseconds)
+RETRY_MS = 3000
+
+
+async def event_stream(
+    subscription: Subscription, heartbeat_seconds: float
+) -> AsyncIterator[bytes]:
+    """Server-sent events for one subscription, with comment lines as heartbeats."""
+    yield b"retry: %d\n\n" % RETRY_MS
+    while True:
+        try:
+            change = await asyncio.wait_for(subscription.get(), heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield b": ping\n\n"
+            continue
+        yield b"event: resync\ndata: {}\n\n" if change is RESYNC else change.sse()
+
+
+@router.get("/")
+async def stream_events(
+    project_id: Optional[UUID] = Query(None, description="Only changes in this project"),
+    assignee_id: Optional[UUID] = Query(
+        None, description="Only changes concerning this user (task assignee or member)"
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream project, task, expense and member changes as server-sent events.
+
+    Each event is named `<resource>.<action>` (e.g. `task.updated`) and its data
+    holds `resource`, `action`, `id`, `project_id` and `user_ids`. Fetch the
+    changed resource to get its new state.
+
+    An `event: resync` means changes were dropped because the client read too
+    slowly (or another worker's events were missed): refetch the lists being
+    shown. Clients should also refetch after reconnecting.
+    """
+    pg_bridge.ensure_listening()
+
+    async def stream() -> AsyncIterator[bytes]:
+        with change_bus.subscribe(project_id, assignee_id, settings.EVENTS_BUFFER_SIZE) as sub:
+            async for chunk in event_stream(sub, settings.EVENTS_HEARTBEAT_SECONDS):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
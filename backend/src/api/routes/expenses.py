@@ -1,15 +1,18 @@
 """Expense API routes."""
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_current_user, get_db
+from src.api.deps import get_current_user, get_db, get_read_db
+from src.api.fieldsets import field_selection, sparse_response
+from src.api.responses import list_response
 from src.models.user import User
 from src.schemas.expense import BudgetSummary, ExpenseCreate, ExpenseResponse, ExpenseUpdate
-from src.services.expense_service import ExpenseService
+from src.services.expense_service import EXPENSE_FIELDS, ExpenseService
 from src.services.project_service import ProjectService
+from src.services.projections import FieldSelection
 
 router = APIRouter()
 
@@ -32,8 +35,7 @@ async def create_expense(
     - **expense_data**: Expense creation data
     """
     # Verify project exists
-    project = await ProjectService.get_project_by_id(db=db, project_id=project_id)
-    if not project:
+    if not await ProjectService.project_exists(db=db, project_id=project_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found",
@@ -54,8 +56,9 @@ async def list_project_expenses(
     project_id: UUID,
     skip: int = 0,
     limit: int = 100,
+    selection: Optional[FieldSelection] = Depends(field_selection(EXPENSE_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all expenses for a project.
@@ -63,15 +66,25 @@ async def list_project_expenses(
     - **project_id**: Project ID
     - **skip**: Number of records to skip (pagination)
     - **limit**: Maximum number of records to return
+    - **fields** / **expand**: Sparse fieldset (optional)
     """
     # Verify project exists
-    project = await ProjectService.get_project_by_id(db=db, project_id=project_id)
-    if not project:
+    if not await ProjectService.project_exists(db=db, project_id=project_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found",
         )
 
+    if selection:
+        expenses = await ExpenseService.list_expense_rows(
+            db=db,
+            project_id=project_id,
+            selection=selection,
+            skip=skip,
+            limit=limit,
+        )
+        return sparse_response(EXPENSE_FIELDS, selection, expenses)
+
     expenses = await ExpenseService.list_expenses(
         db=db,
         project_id=project_id,
@@ -79,14 +92,14 @@ async def list_project_expenses(
         limit=limit,
     )
 
-    return expenses
+    return list_response(ExpenseResponse, expenses)
 
 
 @router.get("/projects/{project_id}/budget", response_model=BudgetSummary)
 async def get_project_budget_summary(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get budget summary for a project.
@@ -110,15 +123,22 @@ async def get_project_budget_summary(
 @router.get("/expenses/{expense_id}", response_model=ExpenseResponse)
 async def get_expense(
     expense_id: UUID,
+    selection: Optional[FieldSelection] = Depends(field_selection(EXPENSE_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get a specific expense by ID.
 
     - **expense_id**: Expense ID
+    - **fields** / **expand**: Sparse fieldset (optional)
     """
-    expense = await ExpenseService.get_expense_by_id(db=db, expense_id=expense_id)
+    if selection:
+        expense = await ExpenseService.get_expense_row(
+            db=db, expense_id=expense_id, selection=selection
+        )
+    else:
+        expense = await ExpenseService.get_expense_by_id(db=db, expense_id=expense_id)
 
     if not expense:
         raise HTTPException(
@@ -126,6 +146,8 @@ async def get_expense(
             detail=f"Expense with id {expense_id} not found",
         )
 
+    if selection:
+        return sparse_response(EXPENSE_FIELDS, selection, expense, many=False)
     return expense
 
 
@@ -0,0 +1,51 @@
+"""Metrics API routes."""
+from fastapi import APIRouter, Depends, Query, status
+
+from src.api.deps import get_current_admin_user
+from src.core.database import engine, replica_engine, slow_query_log
+from src.core.db_pool import pool_snapshot
+from src.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+async def get_db_pool_metrics(
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Connection pool metrics for the primary and (if configured) replica engines.
+
+    Gauges: `size`, `in_use`, `idle`, `overflow`. Histograms (cumulative buckets):
+    `checkout_wait_seconds` and `connection_age_seconds` at checkout. Counters:
+    `connects`, `liveness_pings`, `liveness_failures`.
+    """
+    return {"primary": pool_snapshot(engine), "replica": pool_snapshot(replica_engine)}
+
+
+@router.get("/slow-queries")
+async def list_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of records"),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Most recent slow statements (newest first).
+
+    Each record has the normalized SQL, parameter types (values are redacted), the
+    route endpoint and service method that issued it, its duration, and the
+    `EXPLAIN (ANALYZE, BUFFERS)` output if it was sampled for one.
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "items": slow_query_log.snapshot(limit),
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Clear the slow query log.
+    """
+    slow_query_log.clear()
@@ -4,10 +4,11 @@ API routes for project operations.
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db
+from ...core.config import settings
+from ...core.database import AsyncSessionLocal, get_db, get_read_db
 from ...models.project import ProjectStatus
 from ...models.user import User
 from ...schemas.project import (
@@ -18,13 +19,21 @@ from ...schemas.project import (
     ProjectDetailResponse,
     ProjectListItem,
     ProjectMemberAdd,
+    ProjectMemberBulkRequest,
+    ProjectMemberBulkResponse,
     ProjectMemberResponse,
+    ProjectPurgeResponse,
     ProjectResponse,
     ProjectUpdate,
 )
 from ...services.audit_service import AuditService
-from ...services.project_service import ProjectService
+from ...services.project_purge_service import ProjectPurgeService
+from ...services.project_service import PROJECT_FIELDS, ProjectService
+from ...services.projections import FieldSelection
+from ..coalescing import coalesced
 from ..deps import get_current_user
+from ..fieldsets import field_selection, sparse_response
+from ..responses import list_response
 
 router = APIRouter()
 
@@ -61,47 +70,67 @@ async def create_project(
 
 @router.get("/", response_model=List[ProjectResponse])
 async def list_projects(
+    request: Request,
     status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
     owner_id: Optional[UUID] = Query(None, description="Filter by owner ID"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
+    selection: Optional[FieldSelection] = Depends(field_selection(PROJECT_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List projects with optional filters.
 
     Supports filtering by status and owner, with pagination.
+    Use `fields` / `expand` to return a sparse fieldset.
     """
-    projects = await ProjectService.list_projects(
-        db=db, status=status, owner_id=owner_id, skip=skip, limit=limit
-    )
-    return projects
+
+    async def compute():
+        projects = await ProjectService.list_project_rows(
+            db=db, status=status, owner_id=owner_id, skip=skip, limit=limit, selection=selection
+        )
+        if selection:
+            return sparse_response(PROJECT_FIELDS, selection, projects)
+        return list_response(ProjectResponse, projects)
+
+    return await coalesced(request, "projects", compute, db=db)
 
 
 @router.get("/overdue", response_model=List[ProjectResponse])
 async def get_overdue_projects(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get all overdue projects.
 
     A project is overdue if it's not completed/archived and the end_date has passed.
     """
-    projects = await ProjectService.get_overdue_projects(db)
-    return projects
+    projects = await ProjectService.get_overdue_project_rows(db)
+    return list_response(ProjectResponse, projects)
 
 
 @router.get("/{project_id}", response_model=ProjectDetailResponse)
 async def get_project(
     project_id: UUID,
+    selection: Optional[FieldSelection] = Depends(field_selection(PROJECT_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get a project by ID with full details including members and documents.
+
+    With `fields` / `expand` only the requested fields and relations are loaded.
     """
+    if selection:
+        project = await ProjectService.get_project_row(db, project_id, selection)
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"Project {project_id} not found"
+            )
+        return sparse_response(PROJECT_FIELDS, selection, project, many=False)
+
     project = await ProjectService.get_project_by_id(db, project_id, include_details=True)
 
     if not project:
@@ -179,6 +208,59 @@ async def delete_project(
     return None
 
 
+@router.post(
+    "/{project_id}/purge",
+    response_model=ProjectPurgeResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def purge_project(
+    project_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete a very large project in the background.
+
+    Child rows are deleted in bounded batches so the database and API stay responsive;
+    poll `GET /{project_id}/purge` for progress. Starting a purge that is already
+    running returns the running job.
+    """
+    job = await ProjectPurgeService.start_purge(
+        db,
+        AsyncSessionLocal,
+        project_id,
+        batch_size=settings.PROJECT_PURGE_BATCH_SIZE,
+        current_user_id=current_user.id,
+    )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Project {project_id} not found"
+        )
+
+    return job
+
+
+@router.get("/{project_id}/purge", response_model=ProjectPurgeResponse)
+async def get_purge_progress(
+    project_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get the progress of a project purge.
+    """
+    job = await ProjectPurgeService.get_job(db, project_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No purge found for project {project_id}",
+        )
+
+    return job
+
+
 # ========== Member Management Endpoints ==========
 
 
@@ -217,17 +299,46 @@ async def add_project_member(
     return member
 
 
+@router.post("/{project_id}/members/bulk", response_model=ProjectMemberBulkResponse)
+async def bulk_update_project_members(
+    project_id: UUID,
+    bulk_data: ProjectMemberBulkRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Add, remove or change the role of many project members at once.
+
+    Each item has a `user_id`, an `action` (`add`, `remove` or `update_role`) and a
+    `role` (required for `update_role`). `add` on an existing member updates their role
+    if one is given and keeps it otherwise. Items that cannot
+    be applied are reported per row (`user_not_found`, `not_member`) instead of failing
+    the whole request.
+    """
+    results = await ProjectService.bulk_update_members(
+        db, project_id, bulk_data.items, current_user_id=current_user.id
+    )
+
+    if results is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    return ProjectMemberBulkResponse(results=results)
+
+
 @router.get("/{project_id}/members", response_model=List[ProjectMemberResponse])
 async def list_project_members(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all members of a project.
     """
     members = await ProjectService.list_members(db, project_id)
-    return members
+    return list_response(ProjectMemberResponse, members)
 
 
 @router.delete("/{project_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -302,13 +413,13 @@ async def add_document_link(
 async def list_document_links(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all document links for a project.
     """
     links = await ProjectService.list_document_links(db, project_id)
-    return links
+    return list_response(DocumentLinkResponse, links)
 
 
 @router.patch("/documents/{link_id}", response_model=DocumentLinkResponse)
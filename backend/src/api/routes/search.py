@@ -0,0 +1,45 @@
+"""Search API routes."""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import get_current_user, get_read_db
+from src.models.user import User
+from src.schemas.search import SearchResponse, SearchResultType
+from src.services.search_service import SearchService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(
+        ..., min_length=1, max_length=100, pattern=r"\S", description="Search text (not blank)"
+    ),
+    types: Optional[List[SearchResultType]] = Query(
+        None, alias="type", description="Restrict to resource types (repeatable)"
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Search projects, tasks and document links.
+
+    - **q**: Substring (case-insensitive) or similar word matched against titles and descriptions
+    - **type**: `project`, `task` or `document`; repeat to search several types
+    - **limit**: Page size
+    - **cursor**: `next_cursor` from the previous response
+
+    Results are ordered by relevance; title matches rank above description matches.
+    """
+    try:
+        items, next_cursor = await SearchService.search(
+            db=db, query=q.strip(), types=types, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return SearchResponse(items=items, next_cursor=next_cursor)
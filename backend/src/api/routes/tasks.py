@@ -4,16 +4,20 @@ API routes for task operations.
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db
+from ...core.database import get_db, get_read_db
 from ...models.task import TaskPriority, TaskStatus
 from ...models.user import User
 from ...schemas.task import MyTasksSummary, TaskCreate, TaskResponse, TaskStats, TaskUpdate
 from ...services.audit_service import AuditService
-from ...services.task_service import TaskService
+from ...services.projections import FieldSelection
+from ...services.task_service import TASK_FIELDS, TaskService
+from ..coalescing import coalesced
 from ..deps import get_current_user
+from ..fieldsets import field_selection, sparse_response
+from ..responses import list_response
 
 router = APIRouter()
 
@@ -48,6 +52,7 @@ async def create_task(
 
 @router.get("/", response_model=List[TaskResponse])
 async def list_tasks(
+    request: Request,
     project_id: Optional[UUID] = Query(None, description="Filter by project ID"),
     assignee_id: Optional[UUID] = Query(None, description="Filter by assignee ID"),
     status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
@@ -55,48 +60,63 @@ async def list_tasks(
     is_overdue: Optional[bool] = Query(None, description="Filter by overdue status"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
+    selection: Optional[FieldSelection] = Depends(field_selection(TASK_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List tasks with optional filters.
-    """
-    tasks = await TaskService.list_tasks(
-        db=db,
-        project_id=project_id,
-        assignee_id=assignee_id,
-        status=status,
-        priority=priority,
-        is_overdue=is_overdue,
-        skip=skip,
-        limit=limit,
-    )
-    return tasks
+
+    Use `fields` / `expand` to return a sparse fieldset, e.g.
+    `?fields=id,name,status,due_date` or `?expand=assignee,project`.
+    """
+
+    async def compute():
+        tasks = await TaskService.list_task_rows(
+            db=db,
+            project_id=project_id,
+            assignee_id=assignee_id,
+            status=status,
+            priority=priority,
+            is_overdue=is_overdue,
+            skip=skip,
+            limit=limit,
+            selection=selection,
+        )
+        if selection:
+            return sparse_response(TASK_FIELDS, selection, tasks)
+        return list_response(TaskResponse, tasks)
+
+    return await coalesced(request, "tasks", compute, db=db)
 
 
 @router.get("/my-tasks", response_model=List[TaskResponse])
 async def get_my_tasks(
     status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
     is_overdue: Optional[bool] = Query(None, description="Filter by overdue status"),
+    selection: Optional[FieldSelection] = Depends(field_selection(TASK_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get tasks assigned to the current user.
     """
-    tasks = await TaskService.list_tasks(
+    tasks = await TaskService.list_task_rows(
         db=db,
         assignee_id=current_user.id,
         status=status,
         is_overdue=is_overdue,
+        selection=selection,
     )
-    return tasks
+    if selection:
+        return sparse_response(TASK_FIELDS, selection, tasks)
+    return list_response(TaskResponse, tasks)
 
 
 @router.get("/my-tasks/summary", response_model=MyTasksSummary)
 async def get_my_tasks_summary(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get summary statistics for tasks assigned to current user.
@@ -108,12 +128,21 @@ async def get_my_tasks_summary(
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
+    selection: Optional[FieldSelection] = Depends(field_selection(TASK_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get a task by ID.
     """
+    if selection:
+        task = await TaskService.get_task_row(db, task_id, selection)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"Task {task_id} not found"
+            )
+        return sparse_response(TASK_FIELDS, selection, task, many=False)
+
     task = await TaskService.get_task_by_id(db, task_id)
 
     if not task:
@@ -194,7 +223,7 @@ async def delete_task(
 async def get_project_task_stats(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get task statistics for a specific project.
@@ -5,10 +5,13 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import get_current_admin_user, get_current_user, get_db
+from src.api.deps import get_current_admin_user, get_current_user, get_db, get_read_db
+from src.api.fieldsets import field_selection, sparse_response
+from src.api.responses import list_response
 from src.models.user import User, UserRole
 from src.schemas.user import UserCreate, UserResponse, UserUpdate
-from src.services.user_service import UserService
+from src.services.projections import FieldSelection
+from src.services.user_service import USER_FIELDS, UserService
 
 router = APIRouter()
 
@@ -18,8 +21,9 @@ async def list_users(
     is_active: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
+    selection: Optional[FieldSelection] = Depends(field_selection(USER_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all users.
@@ -27,26 +31,41 @@ async def list_users(
     - **is_active**: Filter by active status (optional)
     - **skip**: Number of records to skip (pagination)
     - **limit**: Maximum number of records to return
+    - **fields**: Sparse fieldset, e.g. `id,name` (optional)
     """
+    if selection:
+        users = await UserService.list_user_rows(
+            db=db,
+            selection=selection,
+            is_active=is_active,
+            skip=skip,
+            limit=limit,
+        )
+        return sparse_response(USER_FIELDS, selection, users)
+
     users = await UserService.list_users(
         db=db,
         is_active=is_active,
         skip=skip,
         limit=limit,
     )
-    return users
+    return list_response(UserResponse, users)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
+    selection: Optional[FieldSelection] = Depends(field_selection(USER_FIELDS)),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get a specific user by ID.
     """
-    user = await UserService.get_user_by_id(db=db, user_id=user_id)
+    if selection:
+        user = await UserService.get_user_row(db=db, user_id=user_id, selection=selection)
+    else:
+        user = await UserService.get_user_by_id(db=db, user_id=user_id)
 
     if not user:
         raise HTTPException(
@@ -54,6 +73,8 @@ async def get_user(
             detail=f"User with id {user_id} not found",
         )
 
+    if selection:
+        return sparse_response(USER_FIELDS, selection, user, many=False)
     return user
 
 
@@ -0,0 +1,166 @@
+"""
+Non-blocking log pipeline with a structured JSON access log.
+
+Records are put on a bounded in-memory queue by a ``QueueHandler`` on the
+root logger and written by a ``QueueListener`` thread, so a slow sink (a
+container's stdout under backpressure) never stalls the event loop. When the
+queue is full, records are dropped and counted instead of waiting.
+
+Application logs keep the plain text format on stderr; records from the
+``access`` logger are written as one JSON object per line on stdout. Every
+record carries the correlation ID of the request that produced it.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+ACCESS_LOGGER = "access"
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Correlation ID of the request being handled (None outside requests)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Incoming X-Request-ID values are reused only if they look like an ID
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+def request_id_from_header(value: Optional[str]) -> str:
+    """Reuse a well-formed incoming request ID or generate a new one."""
+    if value and _VALID_REQUEST_ID.match(value):
+        return value
+    return uuid.uuid4().hex
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request's correlation ID to every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; fields from ``extra={"access": {...}}`` are merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update(getattr(record, "access", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of waiting."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the listener thread; only resolve what cannot cross threads
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogQueueListener(QueueListener):
+    """QueueListener whose ``stop`` waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class _ExcludeFilter(logging.Filter):
+    """Reject records from one logger (and its children)."""
+
+    def __init__(self, name: str):
+        super().__init__()
+        self._only = logging.Filter(name)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not self._only.filter(record)
+
+
+class QueueLogging:
+    """Root logger setup: queue handler in front, writer thread behind."""
+
+    def __init__(self):
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[LogQueueListener] = None
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full."""
+        return self.handler.dropped if self.handler is not None else 0
+
+    def install(
+        self,
+        queue_size: int = 10000,
+        level: int = logging.INFO,
+        text_stream=None,
+        access_stream=None,
+    ) -> None:
+        """Route the root logger through the queue (replaces ``logging.basicConfig``)."""
+        if self.handler is not None:
+            return
+
+        text = logging.StreamHandler(text_stream or sys.stderr)
+        text.setFormatter(logging.Formatter(TEXT_FORMAT))
+        text.addFilter(_ExcludeFilter(ACCESS_LOGGER))
+
+        access = logging.StreamHandler(access_stream or sys.stdout)
+        access.setFormatter(JsonFormatter())
+        access.addFilter(logging.Filter(ACCESS_LOGGER))
+
+        self.handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+        self.handler.addFilter(RequestIdFilter())
+        self.listener = LogQueueListener(
+            self.handler.queue, text, access, respect_handler_level=True
+        )
+        self.listener.start()
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.handler)
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread."""
+        if self.listener is None:
+            return
+        logging.getLogger().removeHandler(self.handler)
+        self.listener.stop()
+        self.listener = None
+        self.handler = None
+
+
+queue_logging = QueueLogging()
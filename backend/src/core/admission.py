@@ -0,0 +1,245 @@
+"""
+Admission control: per-route-class concurrency limits that adapt to the database.
+
+When the database saturates, every request otherwise waits up to
+DB_POOL_TIMEOUT for a pool connection and latency grows for all routes
+alike. Instead, each API request is put in a class (``auth``, ``read``,
+``aggregate``, ``write``, ``bulk``) with its own concurrency limit and a short
+queue deadline; a request that cannot start before the deadline (or finds
+the queue full) is rejected at once with 503 and Retry-After, so the
+requests that are admitted stay fast and clients back off.
+
+Limits adapt every ADMISSION_ADJUST_SECONDS to the database latency seen in
+that period: the average statement time of admitted requests plus the
+average pool checkout wait. Above the target (ADMISSION_DB_LATENCY_MS, or
+twice the best latency seen, whichever is higher) the limits shrink in
+proportion to the excess (multiplicative decrease, by at most half); below
+it, classes that had to queue get one more slot (additive increase).
+
+``auth`` (login, register) has a fixed limit of its own, so logins keep
+working while other classes are throttled. Health checks, /metrics, the docs
+and the change feed stream are never limited. Neither is the batch endpoint
+itself: each of its sub-requests is admitted in its own class instead.
+"""
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+
+from src.core.config import settings
+from src.core.database import engine
+from src.core.query_stats import QueryStats
+
+RETRY_AFTER_SECONDS = 1
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    """
+    Concurrency settings of one class of routes.
+
+    Attributes:
+        name: Class name (metrics label)
+        max_limit: Concurrent requests when the database is healthy; also the queue size
+        min_limit: Concurrent requests the limit never shrinks below
+        queue_timeout: Seconds a request may wait for a slot before it is shed
+        adaptive: Whether the limit follows database latency
+    """
+
+    name: str
+    max_limit: int
+    min_limit: int
+    queue_timeout: float
+    adaptive: bool = True
+
+
+def default_classes(pool_capacity: int) -> List[RouteClass]:
+    """Route classes sized for a pool of ``pool_capacity`` connections."""
+    return [
+        RouteClass("auth", 4, 4, 2.0, adaptive=False),
+        RouteClass("read", max(2, pool_capacity), 2, 0.25),
+        RouteClass("aggregate", max(2, pool_capacity // 3), 1, 0.5),
+        RouteClass("write", max(2, pool_capacity // 2), 1, 1.0),
+        RouteClass("bulk", 2, 1, 0.5),
+    ]
+
+
+# (method or None for any, path pattern, class or None for exempt); first match wins.
+# Other GETs are "read", other methods "write".
+ROUTE_CLASSES: List[Tuple[Optional[str], Pattern, Optional[str]]] = [
+    ("GET", re.compile(r"/api/v1/events/?"), None),  # Long-lived stream, holds no connection
+    (None, re.compile(r"/api/v1/auth/(login|register|logout)/?"), "auth"),
+    ("POST", re.compile(r"/api/v1/batch/?"), None),  # Sub-requests are admitted one by one
+    ("POST", re.compile(r"/api/v1/projects/[^/]+/(purge|members/bulk)/?"), "bulk"),
+    ("GET", re.compile(r"/api/v1/(dashboard|search|audit-logs)/.*"), "aggregate"),
+    ("GET", re.compile(r"/api/v1/projects/[^/]+/budget/?"), "aggregate"),
+    ("GET", re.compile(r"/api/v1/tasks/projects/[^/]+/stats/?"), "aggregate"),
+]
+
+
+class ClassLimiter:
+    """
+    Concurrency limit and bounded FIFO queue of one route class.
+
+    Attributes:
+        limit: Current limit (fractional while adapting; ``int(limit)`` slots)
+        in_flight: Requests holding a slot
+        counts: Requests by outcome: ``admitted`` at once, ``queued`` then
+            admitted, or ``shed``
+    """
+
+    def __init__(self, route_class: RouteClass):
+        self.route_class = route_class
+        self.limit = float(route_class.max_limit)
+        self.in_flight = 0
+        self.counts: Dict[str, int] = {"admitted": 0, "queued": 0, "shed": 0}
+        self.saturated = False  # Some request had to queue since the last adjustment
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting at most the class's queue timeout; False if shed."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.counts["admitted"] += 1
+            return True
+
+        self.saturated = True
+        if len(self._waiters) >= self.route_class.max_limit:
+            self.counts["shed"] += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.route_class.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            self.counts["shed"] += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # The slot was handed over just as the client went away
+            else:
+                self._forget(waiter)
+            raise
+        self.counts["queued"] += 1
+        return True
+
+    def release(self) -> None:
+        """Give a slot back, handing it to the longest waiting request."""
+        self.in_flight -= 1
+        self.wake()
+
+    def wake(self) -> None:
+        """Hand free slots to waiting requests (after a release or a raised limit)."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _forget(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionController:
+    """
+    Route classification, per-class limiters and the adaptation loop.
+
+    Attributes:
+        db_latency: Database latency of the last adjustment period (seconds)
+        best_latency: Lowest period latency seen, drifting up 1% per period
+    """
+
+    def __init__(
+        self,
+        classes: List[RouteClass],
+        target_latency: float,
+        adjust_seconds: float,
+    ):
+        self.enabled = settings.ADMISSION_ENABLED
+        self.limiters = {rc.name: ClassLimiter(rc) for rc in classes}
+        self.target_latency = target_latency
+        self.adjust_seconds = adjust_seconds
+        self.db_latency: Optional[float] = None
+        self.best_latency: Optional[float] = None
+        self._statements = 0
+        self._statement_seconds = 0.0
+        self._pool_wait = self._pool_wait_totals()
+        self._next_adjust = time.monotonic() + adjust_seconds
+
+    @staticmethod
+    def classify(method: str, path: str) -> Optional[str]:
+        """Class of a request, or None if it is never limited."""
+        if not path.startswith("/api/") or method == "OPTIONS":
+            return None
+        for route_method, pattern, name in ROUTE_CLASSES:
+            if (route_method is None or method == route_method) and pattern.fullmatch(path):
+                return name
+        return "read" if method in ("GET", "HEAD") else "write"
+
+    def observe(self, queries: QueryStats) -> None:
+        """Record an admitted request's statements; adjust limits once a period."""
+        self._statements += queries.count
+        self._statement_seconds += queries.seconds
+        if time.monotonic() >= self._next_adjust:
+            self.adjust()
+
+    @staticmethod
+    def _pool_wait_totals() -> Tuple[float, int]:
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is None:
+            return 0.0, 0
+        return metrics.checkout_wait.sum, metrics.checkout_wait.count
+
+    def _period_latency(self) -> Optional[float]:
+        wait_sum, wait_count = self._pool_wait_totals()
+        waits = wait_count - self._pool_wait[1]
+        latency = None
+        if self._statements:
+            latency = self._statement_seconds / self._statements
+        if waits > 0:
+            latency = (latency or 0.0) + (wait_sum - self._pool_wait[0]) / waits
+        self._pool_wait = (wait_sum, wait_count)
+        self._statements, self._statement_seconds = 0, 0.0
+        return latency
+
+    def adjust(self) -> None:
+        """Apply AIMD to the adaptive limits from the last period's database latency."""
+        self._next_adjust = time.monotonic() + self.adjust_seconds
+        latency = self._period_latency()
+        if latency is not None:
+            self.db_latency = latency
+            if self.best_latency is None or latency < self.best_latency:
+                self.best_latency = latency
+            else:
+                self.best_latency *= 1.01  # Accept a lasting shift in the baseline slowly
+        threshold = max(self.target_latency, 2 * (self.best_latency or 0.0))
+
+        for limiter in self.limiters.values():
+            route_class = limiter.route_class
+            if not route_class.adaptive:
+                continue
+            if latency is not None and latency > threshold:
+                factor = max(0.5, threshold / latency)
+                limiter.limit = max(float(route_class.min_limit), limiter.limit * factor)
+            elif limiter.saturated:
+                limiter.limit = min(float(route_class.max_limit), limiter.limit + 1)
+                limiter.wake()
+            limiter.saturated = False
+
+
+admission = AdmissionController(
+    default_classes(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW),
+    target_latency=settings.ADMISSION_DB_LATENCY_MS / 1000,
+    adjust_seconds=settings.ADMISSION_ADJUST_SECONDS,
+)
@@ -0,0 +1,288 @@
+"""
+Change feed: project, task, expense and member events for server-sent events.
+
+Services call ``record_change`` next to their audit log entry. Events are kept
+on the session and published only when its transaction commits (dropped on
+rollback), so subscribers never see a change that did not happen.
+
+- ``change_bus`` delivers events to the subscribers of this process. Each
+  subscriber has a bounded buffer. When a slow client's buffer fills up, the
+  buffered events are dropped and replaced by one ``resync`` marker, which
+  tells the client to refetch instead of applying deltas. Publishers never
+  wait on a slow client.
+- With PostgreSQL and EVENTS_PG_BRIDGE, the commit also issues ``pg_notify``
+  in the same transaction, so other workers receive the event exactly when it
+  becomes visible. ``pg_bridge`` LISTENs on a dedicated connection, started
+  when the first client subscribes, and republishes events from other
+  workers locally.
+"""
+import asyncio
+import logging
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+from uuid import UUID
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "change_feed"
+
+# Session.info key holding events recorded in the current transaction
+_PENDING = "change_feed.pending"
+
+Id = Union[UUID, str]
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    A committed change to a project, task, expense or project member.
+
+    Attributes:
+        resource: ``project``, ``task``, ``expense`` or ``member``
+        action: ``created``, ``updated`` or ``deleted``
+        id: ID of the changed row (the user ID for members)
+        project_id: Owning project (the project itself for projects)
+        user_ids: Users the change concerns: task assignees before and after,
+            or the member's user
+    """
+
+    resource: str
+    action: str
+    id: str
+    project_id: Optional[str] = None
+    user_ids: Tuple[str, ...] = ()
+
+    def matches(self, project_id: Optional[str], user_id: Optional[str]) -> bool:
+        """Whether a subscriber filtering on these IDs wants this event."""
+        if project_id is not None and self.project_id != project_id:
+            return False
+        return user_id is None or user_id in self.user_ids
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChangeEvent":
+        return cls(
+            resource=data["resource"],
+            action=data["action"],
+            id=data["id"],
+            project_id=data.get("project_id"),
+            user_ids=tuple(data.get("user_ids", ())),
+        )
+
+    def sse(self) -> bytes:
+        """The event as a server-sent event (``event: task.updated``)."""
+        data = orjson.dumps(self.to_dict())
+        return b"event: %s.%s\ndata: %s\n\n" % (self.resource.encode(), self.action.encode(), data)
+
+
+# Put in a subscriber's buffer in place of the events it was too slow to take
+RESYNC = object()
+
+
+class Subscription:
+    """One client's filter and bounded event buffer."""
+
+    def __init__(self, project_id: Optional[str], user_id: Optional[str], buffer_size: int):
+        self.project_id = project_id
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(buffer_size)
+
+    async def get(self):
+        """Next ChangeEvent, or RESYNC after events were dropped."""
+        return await self.queue.get()
+
+    def deliver(self, item) -> bool:
+        """Buffer an item without waiting; False when the buffer overflowed."""
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+
+class ChangeBus:
+    """
+    In-process fan-out of change events to subscribers.
+
+    Attributes:
+        published: Events published, by source (``local`` or ``remote`` worker)
+        resyncs: Times a subscriber fell behind and was told to resync
+    """
+
+    def __init__(self):
+        self.published: Dict[str, int] = {"local": 0, "remote": 0}
+        self.resyncs = 0
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    @contextmanager
+    def subscribe(
+        self,
+        project_id: Optional[Id] = None,
+        user_id: Optional[Id] = None,
+        buffer_size: int = 100,
+    ) -> Iterator[Subscription]:
+        """Subscribe for the duration of the ``with`` block."""
+        subscription = Subscription(
+            str(project_id) if project_id else None, str(user_id) if user_id else None, buffer_size
+        )
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    def publish(self, change: ChangeEvent, source: str = "local") -> None:
+        """Deliver an event to every matching subscriber."""
+        self.published[source] += 1
+        for subscription in self._subscribers:
+            if change.matches(subscription.project_id, subscription.user_id):
+                if not subscription.deliver(change):
+                    self.resyncs += 1
+
+    def resync_all(self) -> None:
+        """Tell every subscriber to refetch (events may have been missed)."""
+        for subscription in self._subscribers:
+            subscription.deliver(RESYNC)
+
+
+change_bus = ChangeBus()
+
+
+class PgNotifyBridge:
+    """LISTEN for events NOTIFYed by other workers and republish them locally."""
+
+    def __init__(self, bus: ChangeBus, retry_seconds: float = 5.0):
+        self.bus = bus
+        self.retry_seconds = retry_seconds
+        self.origin = uuid.uuid4().hex  # Identifies this worker's own notifications
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.EVENTS_PG_BRIDGE and settings.database_url_async.startswith(
+            "postgresql+asyncpg://"
+        )
+
+    def ensure_listening(self) -> None:
+        """Start the listener task if it is not running yet."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def payload(self, change: ChangeEvent) -> str:
+        return orjson.dumps({**change.to_dict(), "origin": self.origin}).decode()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        data = orjson.loads(payload)
+        if data.get("origin") != self.origin:
+            self.bus.publish(ChangeEvent.from_dict(data), source="remote")
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        url = settings.EVENTS_LISTEN_URL or settings.database_url_async
+        dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        connected_before = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                if connected_before:
+                    self.bus.resync_all()  # Events sent while disconnected were missed
+                connected_before = True
+                await closed.wait()
+                logger.warning("Change feed listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                if connection is not None:
+                    await connection.close()
+                raise
+            except Exception:
+                logger.warning("Change feed listener failed; retrying", exc_info=True)
+            await asyncio.sleep(self.retry_seconds)
+
+
+pg_bridge = PgNotifyBridge(change_bus)
+
+
+def record_change(
+    db: AsyncSession,
+    resource: str,
+    action: str,
+    resource_id: Id,
+    project_id: Optional[Id] = None,
+    *user_ids: Optional[Id],
+) -> None:
+    """
+    Record a change to publish when the session's transaction commits.
+
+    Args:
+        db: Session making the change
+        resource: ``project``, ``task``, ``expense`` or ``member``
+        action: ``created``, ``updated`` or ``deleted``
+        resource_id: ID of the changed row
+        project_id: Owning project
+        user_ids: Users the change concerns (None values are ignored)
+    """
+    change = ChangeEvent(
+        resource=resource,
+        action=action,
+        id=str(resource_id),
+        project_id=str(project_id) if project_id else None,
+        user_ids=tuple(dict.fromkeys(str(u) for u in user_ids if u)),
+    )
+    db.sync_session.info.setdefault(_PENDING, []).append(change)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_other_workers(session: Session) -> None:
+    """NOTIFY in the committing transaction, so delivery coincides with visibility."""
+    pending = session.info.get(_PENDING)
+    if not pending or not settings.EVENTS_PG_BRIDGE:
+        return
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    session.connection().execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": CHANNEL, "payloads": [pg_bridge.payload(change) for change in pending]},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    for change in session.info.pop(_PENDING, ()):
+        change_bus.publish(change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,310 @@
+"""
+Response compression with zstd / brotli / gzip negotiation and a compressed-bytes cache.
+
+Replaces Starlette's ``GZipMiddleware``, which compresses every large body on
+the event loop at the default level and recompresses identical responses.
+
+- The encoding is negotiated from ``Accept-Encoding`` (q-values respected;
+  ties go to zstd, then br, then gzip). zstd and brotli are used when the
+  optional ``zstandard`` / ``brotli`` packages are installed.
+- Levels are tuned for dynamic content (fast, most of the ratio).
+- Bodies of at least ``offload_size`` bytes are compressed on a small thread
+  pool (zlib, brotli and zstd release the GIL), so the loop keeps serving.
+- Successful GET responses get a strong ``ETag`` (hash of the uncompressed
+  body) if they have none, weakened when the body is compressed;
+  ``If-None-Match`` hits are answered with 304.
+  Compressed bytes are cached per (ETag, encoding) in a byte-bounded LRU, so
+  repeated dashboard and list responses are hashed but not recompressed. The
+  key is derived from the content itself, so a cached entry can only be
+  served to a request whose response already has exactly that content.
+
+Streaming responses (several body messages) pass through uncompressed, so
+server-sent events are never buffered.
+"""
+import asyncio
+import gzip
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Server preference when the client's q-values tie
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+# Levels for dynamic responses: close to the default ratio at a fraction of the CPU
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+_NEVER_COMPRESS = ("text/event-stream",)
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Encoders usable in this environment, keyed by content-coding."""
+    encoders: Dict[str, Callable[[bytes], bytes]] = {"gzip": _gzip}
+    try:
+        import brotli
+
+        encoders["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        # A compressor must not be shared between threads; creating one is cheap
+        encoders["zstd"] = lambda body: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    except ImportError:
+        pass
+    return encoders
+
+
+def negotiate(accept_encoding: Optional[str], available) -> Optional[str]:
+    """
+    Pick a content-coding from an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip, br;q=0.9, *;q=0"``
+        available: Codings the server can produce
+
+    Returns:
+        The chosen coding, or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding not in available:
+            continue
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """True for text-like media types (excluding event streams)."""
+    if not content_type:
+        return False
+    content_type = content_type.lower()
+    if content_type.startswith(_NEVER_COMPRESS):
+        return False
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _opaque(etag: str) -> str:
+    """ETag without the weak prefix, for weak comparison."""
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in (_opaque(tag.strip()) for tag in if_none_match.split(","))
+
+
+class CompressedCache:
+    """LRU of compressed bodies bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        """Cached bytes for (etag, encoding), or None."""
+        data = self._entries.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key: Tuple[str, str], data: bytes) -> None:
+        """Store bytes, evicting least recently used entries beyond ``max_bytes``."""
+        if len(data) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionMiddleware:
+    """
+    Negotiated response compression with thread offload and an ETag-keyed cache.
+
+    Attributes:
+        bytes_in: Uncompressed bytes of compressed responses, per encoding
+        bytes_out: Bytes sent for them, per encoding
+        not_modified: Responses answered with 304 Not Modified
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        offload_size: int = 64 * 1024,
+        cache_bytes: int = 32 * 1024 * 1024,
+        workers: int = 2,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.cache = CompressedCache(cache_bytes)
+        self.encoders = available_encoders()
+        self.workers = workers
+        self.bytes_in: Dict[str, int] = {coding: 0 for coding in self.encoders}
+        self.bytes_out: Dict[str, int] = {coding: 0 for coding in self.encoders}
+        self.not_modified = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"), self.encoders)
+        is_get = scope["method"] == "GET"
+        if encoding is None and not is_get:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start = message  # Held until the body shows whether it is complete
+            elif message["type"] == "http.response.body":
+                if message.get("more_body", False):
+                    passthrough = True  # Streaming: send as is
+                    await send(start)
+                    await send(message)
+                else:
+                    await self._send_complete(
+                        start, message.get("body", b""), encoding, is_get, request_headers, send
+                    )
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _send_complete(
+        self,
+        start: Message,
+        body: bytes,
+        encoding: Optional[str],
+        is_get: bool,
+        request_headers: Headers,
+        send: Send,
+    ) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        negotiable = (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type"))
+        )
+        if negotiable:
+            headers.add_vary_header("Accept-Encoding")
+        cacheable = (
+            is_get and start["status"] == 200 and "no-store" not in headers.get("cache-control", "")
+        )
+
+        compress = negotiable and encoding is not None
+        etag = headers.get("etag")
+        if cacheable and etag is None:
+            etag = body_etag(body)
+            headers["etag"] = etag
+        if compress and etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"  # Same content, different bytes
+
+        if cacheable and etag and etag_matches(request_headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            not_modified = MutableHeaders(raw=[])
+            for name in ("etag", "cache-control", "vary"):
+                if name in headers:
+                    not_modified[name] = headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if compress:
+            data = await self._compress(body, encoding, etag if cacheable else None)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(data))
+            self.bytes_in[encoding] += len(body)
+            self.bytes_out[encoding] += len(data)
+            body = data
+
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
+
+    async def _compress(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        key = (etag, encoding) if etag else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        encoder = self.encoders[encoding]
+        if len(body) >= self.offload_size:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="compress")
+            data = await asyncio.get_running_loop().run_in_executor(self._executor, encoder, body)
+        else:
+            data = encoder(body)
+
+        if key is not None:
+            self.cache.put(key, data)
+        return data
+
+    def stats(self) -> List[Tuple[str, int, int]]:
+        """(encoding, bytes in, bytes out) per encoding."""
+        return [(coding, self.bytes_in[coding], self.bytes_out[coding]) for coding in self.encoders]
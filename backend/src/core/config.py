@@ -1,7 +1,7 @@
 """Application configuration management."""
 import secrets
 import os
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
@@ -18,14 +18,101 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
 
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this (seconds, -1 never)
+    DB_POOL_IDLE_PING_SECONDS: float = 30.0  # Ping at checkout after this idle time (-1 never)
+    # Connecting through PgBouncer in transaction mode (needs max_prepared_statements > 0)
+    DB_PGBOUNCER: bool = False
+
+    # Optional read replica for read-only routes
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_STICKY_SECONDS: float = 5.0  # Read-your-writes window after a mutation
+    REPLICA_RETRY_SECONDS: float = 30.0  # Use the primary this long after a replica failure
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # Token validity: 30 minutes (industry standard)
 
+    # Threads for bcrypt hashing/verification (keeps logins off the event loop)
+    PASSWORD_HASH_WORKERS: int = 2
+
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:5173"
 
+    # Autocomplete (in-process prefix index)
+    AUTOCOMPLETE_ENABLED: bool = True
+    AUTOCOMPLETE_MEMORY_BUDGET_MB: int = 64
+
+    # Bearer token required to scrape /metrics (open when unset)
+    METRICS_TOKEN: Optional[str] = None
+
+    # Slow query log (admin: /api/v1/metrics/slow-queries)
+    SLOW_QUERY_MS: float = 500.0  # Capture statements at least this slow (-1 disables)
+    SLOW_QUERY_BUFFER_SIZE: int = 200  # Most recent slow statements kept in memory
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0  # Fraction of slow SELECTs re-run with EXPLAIN
+
+    # Logging: records are written by a background thread from a bounded queue
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered before new ones are dropped
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Fraction of successful requests logged
+    SLOW_REQUEST_MS: float = 1000.0  # Requests at least this slow are always logged
+
+    # Response compression (zstd / br need the optional zstandard / brotli packages)
+    COMPRESSION_MIN_SIZE: int = 1000  # Smaller bodies are sent uncompressed
+    COMPRESSION_OFFLOAD_SIZE: int = 65536  # Compress bodies this large on a thread
+    COMPRESSION_CACHE_MB: int = 32  # Compressed bodies kept per worker, keyed by ETag
+    COMPRESSION_WORKERS: int = 2
+
+    # POST /api/v1/batch: calls per batch, GETs run concurrently (one DB connection each),
+    # and seconds each call may take
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_CONCURRENCY: int = 4
+    BATCH_TIMEOUT_SECONDS: float = 30.0
+
+    # Rate limiting: "<count>/<second|minute|hour|day>", per user (or per IP when anonymous)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "100/minute"
+    RATE_LIMIT_LOGIN: str = "5/minute"  # Login and register, per IP
+    # shm (one host's workers only), redis (across hosts) or memory;
+    # unset: redis if RATE_LIMIT_REDIS_URL is set, else shm
+    RATE_LIMIT_BACKEND: Optional[str] = None
+    RATE_LIMIT_SHM_PATH: Optional[str] = None  # Default: /dev/shm/ux-rescue-rate-limit
+    RATE_LIMIT_SLOTS: int = 65536  # Keys the shared table holds (16 bytes each)
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # redis://[:password@]host:port/db
+
+    # Admission control: per-route-class concurrency limits, shed with 503 when exceeded
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_DB_LATENCY_MS: float = 25.0  # Limits shrink when statement + pool wait exceeds this
+    ADMISSION_ADJUST_SECONDS: float = 1.0  # How often limits adapt to database latency
+
+    # Idempotency-Key on POST/PUT/PATCH/DELETE: first response stored and replayed on retries
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_HOURS: float = 24.0  # How long a key's response is kept
+    IDEMPOTENCY_LOCK_SECONDS: float = 60.0  # A key still pending after this can be taken over
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # Duplicates wait this long for the first (then 409)
+
+    # Change feed (GET /api/v1/events, server-sent events)
+    EVENTS_BUFFER_SIZE: int = 100  # Events buffered per client; a slower client is told to resync
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # Comment line sent on idle streams (keeps proxies open)
+    EVENTS_PG_BRIDGE: bool = True  # Fan out between workers with PostgreSQL LISTEN/NOTIFY
+    EVENTS_LISTEN_URL: Optional[str] = None  # Direct (non-PgBouncer) connection for LISTEN
+
+    # Share one computation between identical concurrent reads (dashboard, lists)
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_TIMEOUT: float = 10.0  # Waiters give up and compute on their own after this
+
+    # Log a warning when one statement shape runs this many times in a request (N+1)
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Import route modules on first request instead of at startup (serverless cold starts)
+    LAZY_ROUTERS: bool = False
+
+    # Project purge (background deletion of large projects)
+    PROJECT_PURGE_BATCH_SIZE: int = 1000
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
     # Removed validation for Vercel compatibility
@@ -38,12 +125,14 @@ class Settings(BaseSettings):
         Railway provides DATABASE_URL in format: postgresql://...
         We need: postgresql+asyncpg://...
         """
-        url = self.DATABASE_URL
-        if url.startswith("postgresql://"):
-            return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        elif url.startswith("postgres://"):
-            return url.replace("postgres://", "postgresql+asyncpg://", 1)
-        return url
+        return _to_async_url(self.DATABASE_URL)
+
+    @property
+    def database_replica_url_async(self) -> Optional[str]:
+        """DATABASE_REPLICA_URL in asyncpg format, or None if no replica is configured."""
+        if not self.DATABASE_REPLICA_URL:
+            return None
+        return _to_async_url(self.DATABASE_REPLICA_URL)
 
     @property
     def cors_origins(self) -> List[str]:
@@ -52,6 +141,15 @@ class Settings(BaseSettings):
         return origins
 
 
+def _to_async_url(url: str) -> str:
+    """Convert a postgresql:// or postgres:// URL to postgresql+asyncpg://."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    elif url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
 # Global settings instance
 settings = Settings()
 
@@ -1,8 +1,29 @@
 """Database connection and session management."""
+import hashlib
+import hmac
+import logging
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 
 from src.core.config import settings
+from src.core.db_pool import instrument_engine, pool_options
+from src.core.query_stats import instrument_queries
+from src.core.slow_queries import SlowQueryLog
+
+logger = logging.getLogger(__name__)
+
+# Slow statements of both engines, browsable by admins
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_MS,
+    size=settings.SLOW_QUERY_BUFFER_SIZE,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+)
 
 # Create async engine
 # Use database_url_async property to automatically convert postgresql:// to postgresql+asyncpg://
@@ -10,8 +31,11 @@ engine = create_async_engine(
     settings.database_url_async,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
+    **pool_options(settings.database_url_async),
 )
+instrument_engine(engine, settings.DB_POOL_IDLE_PING_SECONDS)
+instrument_queries(engine.sync_engine)
+slow_query_log.instrument(engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -22,18 +46,189 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Optional read replica (DATABASE_REPLICA_URL); read-only routes use it via get_read_db
+replica_engine = (
+    create_async_engine(
+        settings.database_replica_url_async,
+        echo=settings.DEBUG,
+        future=True,
+        **pool_options(settings.database_replica_url_async),
+    )
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine, settings.DB_POOL_IDLE_PING_SECONDS)
+    instrument_queries(replica_engine.sync_engine)
+    slow_query_log.instrument(replica_engine)
+
+ReplicaSessionLocal = (
+    async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
 # Base class for all models
 Base = declarative_base()
 
+# Marker in Session.info for sessions handed out by get_read_db
+_READ_ONLY = "read_only"
+
+# Read sessions skip BEGIN/COMMIT entirely. Bound per engine rather than per
+# connection, so a read session checks out no connection until its first query.
+_READ_ONLY_OPTIONS = {"isolation_level": "AUTOCOMMIT"}
+_read_engine = engine.execution_options(**_READ_ONLY_OPTIONS)
+_replica_read_engine = (
+    replica_engine.execution_options(**_READ_ONLY_OPTIONS) if replica_engine is not None else None
+)
+
+# Safe methods never mark a client as having written; other requests never read the replica
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Read-your-writes. A committed write issues a signed token holding the time
+# until which the client's reads use the primary; PrimaryStickinessMiddleware
+# returns it as a cookie and an X-Primary-Until header, and the client sends
+# either back. Nothing is kept in process memory, so the next request may be
+# served by any worker or host.
+PRIMARY_UNTIL_COOKIE = "primary_until"
+PRIMARY_UNTIL_HEADER = "x-primary-until"
+PRIMARY_UNTIL_STATE = "primary_until"  # scope["state"] key of a token issued by this request
+
+# Scope key under which POST /api/v1/batch lends its read session to a sub-request
+SHARED_READ_SESSION = "db.shared_read_session"
+
+# Monotonic time until which the replica is skipped after a failure
+_replica_down_until = 0.0
+
+
+def _client_key(request: Optional[Request]) -> Optional[str]:
+    """Identify the client for read-your-writes (its bearer token)."""
+    if request is None:
+        return None
+    return request.headers.get("authorization")
+
+
+def _signature(client_key: str, until: str) -> str:
+    message = f"{client_key}|{until}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()[:32]
+
+
+def _token_until(client_key: str, token: str) -> float:
+    """Expiry (Unix time) of a read-your-writes token, or 0 if it is not valid for this client."""
+    until, _, signature = token.rpartition(".")
+    if not until or not hmac.compare_digest(signature, _signature(client_key, until)):
+        return 0.0
+    try:
+        return float(until)
+    except ValueError:
+        return 0.0
+
 
-async def get_db() -> AsyncSession:
+def _mark_primary_sticky(request: Optional[Request]) -> None:
+    """Route this client's reads to the primary for REPLICA_STICKY_SECONDS."""
+    key = _client_key(request)
+    if key is None or request.method in SAFE_METHODS:
+        return
+
+    until = f"{time.time() + settings.REPLICA_STICKY_SECONDS:.3f}"
+    request.scope.setdefault("state", {})[PRIMARY_UNTIL_STATE] = (
+        f"{until}.{_signature(key, until)}"
+    )
+
+
+def wrote_recently(request: Optional[Request]) -> bool:
+    """Whether this client wrote within the last REPLICA_STICKY_SECONDS."""
+    key = _client_key(request)
+    if key is None:
+        return False
+    tokens = (
+        request.scope.get("state", {}).get(PRIMARY_UNTIL_STATE),
+        request.headers.get(PRIMARY_UNTIL_HEADER),
+        request.cookies.get(PRIMARY_UNTIL_COOKIE),
+    )
+    now = time.time()
+    return any(token and _token_until(key, token) > now for token in tokens)
+
+
+def _use_replica(request: Optional[Request]) -> bool:
+    """Whether a read for this client can be served from the replica."""
+    if ReplicaSessionLocal is None or time.monotonic() < _replica_down_until:
+        return False
+    if request is not None and request.method not in SAFE_METHODS:
+        return False  # Writes are authorized and read against the primary
+    return not wrote_recently(request)
+
+
+async def get_db(request: Request = None) -> AsyncSession:
     """Dependency for getting async database session."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
             await session.commit()
+            _mark_primary_sticky(request)
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request = None) -> AsyncSession:
+    """
+    Dependency for read-only (GET) routes.
+
+    The session runs in autocommit mode, so no BEGIN/COMMIT (or ROLLBACK)
+    round trips are issued; PostgreSQL's default READ COMMITTED isolation
+    already gives each statement its own snapshot, so reads see the same data
+    as inside a transaction. It never flushes or commits, and
+    ``_reject_read_only_flush`` turns an accidental write into an error.
+
+    Uses the replica when one is configured, except for requests that write,
+    clients that wrote within the last REPLICA_STICKY_SECONDS
+    (read-your-writes) and while the replica is marked down after a
+    connection failure. Falls back to the primary in those cases, where the
+    session checks out a connection only when it is first used: a write
+    route that merely declares it (through ``get_current_user``) holds no
+    second connection.
+
+    A batch sub-request that runs on its own reuses the batch's read session.
+    """
+    global _replica_down_until
+
+    shared = request.scope.get(SHARED_READ_SESSION) if request is not None else None
+    if shared is not None:
+        yield shared  # Closed by the batch request that opened it
+        return
+
+    session = None
+    if _use_replica(request):
+        session = ReplicaSessionLocal(bind=_replica_read_engine, info={_READ_ONLY: True})
+        try:
+            # Check out a connection now so a dead replica falls back before the route runs
+            await session.connection()
+        except Exception:
+            logger.warning("Read replica unavailable; using primary", exc_info=True)
+            _replica_down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+            await session.close()
+            session = None
+
+    if session is None:
+        session = AsyncSessionLocal(bind=_read_engine, info={_READ_ONLY: True})
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session: Session, flush_context, instances) -> None:
+    """Refuse to write through a session opened by ``get_read_db``."""
+    if session.info.get(_READ_ONLY) and (session.new or session.dirty or session.deleted):
+        raise InvalidRequestError("Attempted to write through a read-only session")
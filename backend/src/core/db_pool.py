@@ -0,0 +1,164 @@
+"""
+Connection pool configuration and instrumentation.
+
+Engines use ``InstrumentedAsyncPool``, which times every checkout, and an
+idle-time liveness check instead of ``pool_pre_ping``: only connections that
+sat in the pool longer than ``DB_POOL_IDLE_PING_SECONDS`` are pinged at
+checkout, so busy pools skip the extra round trip entirely. A failed ping
+raises ``DisconnectionError``, which makes the pool replace the connection
+transparently.
+
+With ``DB_PGBOUNCER`` enabled, prepared statements get globally unique names
+so that PgBouncer (1.21+, ``max_prepared_statements`` > 0) can track them per
+client in transaction mode. SQLAlchemy's per-connection prepared statement
+cache keeps working, and asyncpg's own cache, which uses per-connection
+counters that collide behind a pooler, is disabled.
+"""
+import time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import settings
+from src.core.metrics import Histogram
+
+# Seconds; checkout includes connecting and the liveness ping when they happen
+CHECKOUT_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5, 30)
+CONNECTION_AGE_BUCKETS = (1, 10, 60, 300, 900, 1800, 3600, 7200)
+
+
+class PoolMetrics:
+    """Counters and histograms for one pool."""
+
+    def __init__(self):
+        self.checkout_wait = Histogram(CHECKOUT_WAIT_BUCKETS)
+        self.connection_age = Histogram(CONNECTION_AGE_BUCKETS)  # Age at checkout
+        self.connects = 0
+        self.liveness_pings = 0
+        self.liveness_failures = 0
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records checkout wait times."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+
+
+def prepared_statement_name() -> str:
+    """Globally unique prepared statement name (safe behind PgBouncer)."""
+    return f"__asyncpg_{uuid4().hex}__"
+
+
+def pgbouncer_connect_args() -> Dict[str, Any]:
+    """asyncpg ``connect_args`` for PgBouncer transaction mode."""
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": prepared_statement_name,
+    }
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """
+    Keyword arguments for ``create_async_engine`` from the pool settings.
+
+    SQLite (used by local tooling) keeps SQLAlchemy's default pool.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if settings.DB_PGBOUNCER:
+        options["connect_args"] = pgbouncer_connect_args()
+    return options
+
+
+def instrument_engine(engine: AsyncEngine, idle_ping_seconds: float) -> None:
+    """
+    Track connection age and ping connections that were idle too long.
+
+    Args:
+        engine: Engine created with ``pool_options``
+        idle_ping_seconds: Ping at checkout after this much idle time (-1 disables)
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        now = time.monotonic()
+        connection_record.info["connected_at"] = now
+        connection_record.info["idle_since"] = now
+        metrics = getattr(sync_engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        now = time.monotonic()
+        metrics = getattr(sync_engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.connection_age.observe(now - connection_record.info.get("connected_at", now))
+
+        idle = now - connection_record.info.get("idle_since", now)
+        if idle_ping_seconds < 0 or idle <= idle_ping_seconds:
+            return
+
+        if metrics is not None:
+            metrics.liveness_pings += 1
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            if metrics is not None:
+                metrics.liveness_failures += 1
+            raise DisconnectionError("Idle connection failed liveness ping") from e
+
+
+def pool_snapshot(engine: Optional[AsyncEngine]) -> Optional[Dict[str, Any]]:
+    """Gauges and histograms for an engine's pool (None if no engine)."""
+    if engine is None:
+        return None
+
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return {"status": pool.status()}
+
+    metrics = pool.metrics
+    return {
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "connects": metrics.connects,
+        "liveness_pings": metrics.liveness_pings,
+        "liveness_failures": metrics.liveness_failures,
+        "checkout_wait_seconds": metrics.checkout_wait.snapshot(),
+        "connection_age_seconds": metrics.connection_age.snapshot(),
+    }
@@ -0,0 +1,355 @@
+"""
+Idempotency keys for mutating API requests.
+
+A client that may retry a POST, PUT, PATCH or DELETE (flaky mobile networks)
+sends an ``Idempotency-Key`` header with a value unique to the operation. The
+first request with a key claims it by inserting a pending row into
+``idempotency_keys``, whose primary key (principal, key) guarantees exactly
+one claim across workers. Its response is then stored on that row, and later
+requests with the same key get the stored response back (with an
+``Idempotent-Replayed: true`` header) without running the endpoint again, so
+there are no duplicate rows, budget recomputes or audit entries.
+
+- A duplicate arriving while the first request still runs waits for it: on
+  the future of the first request in the same worker, otherwise by polling
+  the row, for up to IDEMPOTENCY_WAIT_SECONDS (then 409).
+- Reusing a key for a different request (method, path, query or body) is
+  rejected with 422.
+- Server errors (5xx) are not stored: the pending row is deleted so a retry
+  runs again. A pending row older than IDEMPOTENCY_LOCK_SECONDS (its worker
+  died) can be claimed by a retry.
+- Keys are scoped to the authenticated user (or the client address) and
+  expire after IDEMPOTENCY_TTL_HOURS; expired rows are purged periodically.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.database import AsyncSessionLocal
+from src.core.middleware import rate_limit_key, send_json_error
+from src.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+
+# Responses that describe the attempt rather than the operation are not stored
+_NOT_STORED = {401}
+
+Ident = Tuple[str, str]  # (principal, key)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A completed request's fingerprint and response, or a pending claim."""
+
+    fingerprint: bytes
+    status_code: Optional[int] = None
+    headers: Optional[bytes] = None
+    body: Optional[bytes] = None
+
+    @property
+    def pending(self) -> bool:
+        return self.status_code is None
+
+
+def request_fingerprint(scope: Scope, body: bytes) -> bytes:
+    """SHA-256 of what makes two requests the same operation."""
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope["query_string"], body):
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.digest()
+
+
+class IdempotencyStore:
+    """
+    Claims, stored responses and expiry in the ``idempotency_keys`` table.
+
+    Attributes:
+        counts: Keyed requests by outcome: ``executed``, ``replayed``,
+            ``conflict`` (still running after the wait) or ``mismatch``
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        ttl_seconds: float,
+        lock_seconds: float,
+        purge_interval: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.purge_interval = purge_interval
+        self._next_purge = time.monotonic() + purge_interval
+        self.counts: Dict[str, int] = {"executed": 0, "replayed": 0, "conflict": 0, "mismatch": 0}
+
+    async def claim(self, ident: Ident, fingerprint: bytes) -> Optional[StoredResponse]:
+        """
+        Claim a key for this request.
+
+        Returns:
+            None if this request now owns the key and must run, otherwise the
+            row of the request that owns it (pending or completed).
+        """
+        principal, key = ident
+        async with self.session_factory() as db:
+            while True:
+                now = datetime.utcnow()
+                db.add(
+                    IdempotencyKey(
+                        principal=principal,
+                        key=key,
+                        fingerprint=fingerprint,
+                        created_at=now,
+                        expires_at=now + self.ttl,
+                    )
+                )
+                try:
+                    await db.commit()
+                    return None
+                except IntegrityError:
+                    await db.rollback()
+
+                row = (
+                    await db.execute(
+                        select(IdempotencyKey)
+                        .where(IdempotencyKey.principal == principal, IdempotencyKey.key == key)
+                        .execution_options(populate_existing=True)
+                    )
+                ).scalar_one_or_none()
+                if row is None:
+                    continue  # Deleted (server error or purge) in between: insert again
+                abandoned = row.status_code is None and row.created_at <= now - self.lock
+                if row.expires_at > now and not abandoned:
+                    return StoredResponse(row.fingerprint, row.status_code, row.headers, row.body)
+
+                # Expired, or its request's worker died: take it over unless another retry did
+                result = await db.execute(
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.principal == principal,
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.created_at == row.created_at,
+                    )
+                    .values(
+                        fingerprint=fingerprint,
+                        status_code=None,
+                        headers=None,
+                        body=None,
+                        created_at=now,
+                        expires_at=now + self.ttl,
+                    )
+                )
+                await db.commit()
+                if result.rowcount == 1:
+                    return None
+                db.expunge_all()
+
+    async def get(self, ident: Ident) -> Optional[StoredResponse]:
+        principal, key = ident
+        async with self.session_factory() as db:
+            row = (
+                await db.execute(
+                    select(IdempotencyKey).where(
+                        IdempotencyKey.principal == principal, IdempotencyKey.key == key
+                    )
+                )
+            ).scalar_one_or_none()
+        if row is None:
+            return None
+        return StoredResponse(row.fingerprint, row.status_code, row.headers, row.body)
+
+    async def complete(
+        self, ident: Ident, status_code: int, headers: List[Tuple[bytes, bytes]], body: bytes
+    ) -> None:
+        """Store the response of the request that claimed the key."""
+        principal, key = ident
+        encoded = orjson.dumps([[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers])
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.principal == principal, IdempotencyKey.key == key)
+                .values(
+                    status_code=status_code,
+                    headers=encoded,
+                    body=body,
+                    expires_at=datetime.utcnow() + self.ttl,
+                )
+            )
+            await db.commit()
+        if time.monotonic() >= self._next_purge:
+            await self.purge_expired()
+
+    async def release(self, ident: Ident) -> None:
+        """Drop a pending claim (the request failed), so that a retry runs again."""
+        principal, key = ident
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.principal == principal,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None),
+                )
+            )
+            await db.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete expired rows; returns how many."""
+        self._next_purge = time.monotonic() + self.purge_interval
+        async with self.session_factory() as db:
+            result = await db.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())
+            )
+            await db.commit()
+        return result.rowcount
+
+
+idempotency_store = IdempotencyStore(
+    AsyncSessionLocal,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_HOURS * 3600,
+    lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+class IdempotencyMiddleware:
+    """Run a mutating request with an Idempotency-Key once and replay its response."""
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, wait_seconds: float):
+        self.app = app
+        self.store = store
+        self.wait_seconds = wait_seconds
+        self._running: Dict[Ident, asyncio.Future] = {}  # Keys claimed by this worker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = None
+        if (
+            scope["type"] == "http"
+            and settings.IDEMPOTENCY_ENABLED
+            and scope["method"] in MUTATING_METHODS
+            and scope["path"].startswith("/api/")
+            and not scope["path"].startswith("/api/v1/auth/")  # Never store tokens
+        ):
+            key = Headers(scope=scope).get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await send_json_error(send, 400, f"Idempotency-Key 必须为 1-{MAX_KEY_LENGTH} 个字符")
+            return
+
+        body = await _read_body(receive)
+        fingerprint = request_fingerprint(scope, body)
+        ident = (rate_limit_key(scope), key)
+
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.05
+        while True:
+            running = self._running.get(ident)
+            if running is not None:
+                await asyncio.wait({running}, timeout=max(0.0, deadline - time.monotonic()))
+                stored = await self.store.get(ident)
+                if stored is None:
+                    continue  # It failed and released the key: claim it
+            else:
+                stored = await self.store.claim(ident, fingerprint)
+                if stored is None:
+                    await self._execute(ident, scope, body, receive, send)
+                    return
+            if stored.fingerprint != fingerprint:
+                self.store.counts["mismatch"] += 1
+                await send_json_error(send, 422, "Idempotency-Key 已用于另一个请求")
+                return
+            if not stored.pending:
+                self.store.counts["replayed"] += 1
+                await self._replay(stored, send)
+                return
+            if time.monotonic() >= deadline:
+                self.store.counts["conflict"] += 1
+                await send_json_error(send, 409, "相同 Idempotency-Key 的请求仍在处理中", "1")
+                return
+            if ident not in self._running:  # Claimed by another worker: poll its row
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                delay = min(delay * 2, 0.5)
+
+    async def _execute(
+        self, ident: Ident, scope: Scope, body: bytes, receive: Receive, send: Send
+    ) -> None:
+        self.store.counts["executed"] += 1
+        done = asyncio.get_running_loop().create_future()
+        self._running[ident] = done
+        start: Dict = {}
+        chunks: List[bytes] = []
+        sent = False
+
+        async def replay_body() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        stored = False
+        try:
+            await self.app(scope, replay_body, capture)
+            status = start.get("status", 500)
+            if status < 500 and status not in _NOT_STORED:
+                await self.store.complete(
+                    ident, status, list(start.get("headers", ())), b"".join(chunks)
+                )
+                stored = True
+        finally:
+            try:
+                if not stored:
+                    await self.store.release(ident)
+            except Exception:
+                logger.warning("Could not release idempotency key", exc_info=True)
+            finally:
+                if self._running.get(ident) is done:
+                    del self._running[ident]
+                done.set_result(None)
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send: Send) -> None:
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in orjson.loads(stored.headers)
+        ]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send(
+            {"type": "http.response.start", "status": stored.status_code, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": stored.body or b""})
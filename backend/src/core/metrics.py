@@ -0,0 +1,115 @@
+"""In-process metric primitives and Prometheus text exposition."""
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds
+REQUEST_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with Prometheus ``le`` semantics.
+
+    ``observe`` is a bisect and two additions, cheap enough for hot paths.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts, sum and count."""
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else f"{bound:g}"] = running
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class RequestMetrics:
+    """
+    Request latency histograms by endpoint, method and status, and in-flight requests.
+
+    Series live in nested dicts keyed by the route's endpoint function, the
+    method string and the status code, so recording a request does not build a
+    label key; a histogram is allocated only the first time a combination is
+    seen. Updates happen on the event loop thread and need no lock.
+    """
+
+    def __init__(self, buckets: Sequence[float] = REQUEST_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self.latency: Dict[Any, Dict[str, Dict[int, Histogram]]] = {}
+
+    def observe(self, endpoint: Any, method: str, status: int, seconds: float) -> None:
+        """Record one finished request (``endpoint`` is None when no route matched)."""
+        by_method = self.latency.get(endpoint)
+        if by_method is None:
+            by_method = self.latency[endpoint] = {}
+        by_status = by_method.get(method)
+        if by_status is None:
+            by_status = by_method[method] = {}
+        histogram = by_status.get(status)
+        if histogram is None:
+            histogram = by_status[status] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def series(self, templates: Dict[Any, str]) -> Iterable[Tuple[Dict[str, str], Histogram]]:
+        """Yield (labels, histogram) with endpoints resolved to route templates."""
+        for endpoint, by_method in list(self.latency.items()):
+            route = templates.get(endpoint, "<unmatched>")
+            for method, by_status in list(by_method.items()):
+                for status, histogram in list(by_status.items()):
+                    yield {"route": route, "method": method, "status": str(status)}, histogram
+
+
+# Process-wide request metrics, recorded by the request middleware
+request_metrics = RequestMetrics()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Optional[Dict[str, str]]) -> str:
+    """Render ``{name="value",...}`` (empty string for no labels)."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def exposition(
+    lines: List[str],
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[Tuple[Optional[Dict[str, str]], Any]],
+) -> None:
+    """
+    Append one metric family in Prometheus text format.
+
+    ``samples`` are (labels, value) pairs; for ``kind="histogram"`` the value
+    is a ``Histogram`` and the bucket, sum and count series are written.
+    """
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        if kind != "histogram":
+            lines.append(f"{name}{format_labels(labels)} {value}")
+            continue
+
+        snapshot = value.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            bucket_labels = dict(labels or {}, le=bound)
+            lines.append(f"{name}_bucket{format_labels(bucket_labels)} {count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {snapshot['sum']}")
+        lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
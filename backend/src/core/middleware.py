@@ -1,46 +1,313 @@
 """
-安全中间件配置
+安全、速率限制、准入控制、读主库令牌与请求计时中间件配置
+
+中间件均为纯 ASGI 实现：不像 BaseHTTPMiddleware 那样为每个请求创建额外的
+任务和内存流，流式响应也能逐块发送。响应头在 ``http.response.start``
+消息中以预先编码好的字节追加。
 """
-from typing import Callable
-from fastapi import Request, Response
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+import random
+import time
+from typing import Optional
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.access_log import ACCESS_LOGGER, request_id_from_header, request_id_var
+from src.core.admission import RETRY_AFTER_SECONDS, AdmissionController
+from src.core.config import settings
+from src.core.database import PRIMARY_UNTIL_COOKIE, PRIMARY_UNTIL_HEADER, PRIMARY_UNTIL_STATE
+from src.core.metrics import request_metrics
+from src.core.query_stats import track_queries
+from src.core.rate_limit import LOGIN_PATHS, RateLimiter, address_key, user_key
 
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(ACCESS_LOGGER)
 
-# 速率限制器
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["100/minute"],  # 默认限制
-)
 
+# 安全响应头（预先编码，每个响应直接追加）
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+    # 如果是生产环境，添加 HSTS
+    # (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityHeadersMiddleware:
     """添加安全响应头中间件"""
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *SECURITY_HEADERS]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class PrimaryStickinessMiddleware:
+    """
+    读写分离的 read-your-writes 令牌中间件
+
+    请求提交写入后（``get_db``），把签发的读主库令牌通过 Cookie 和
+    X-Primary-Until 响应头交给客户端；客户端带回任意一个，之后
+    REPLICA_STICKY_SECONDS 内的读取走主库，无论由哪个 worker 或主机处理。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})  # 共享给下游，get_db 在其中写入令牌
+
+        async def send_with_token(message: Message) -> None:
+            token = state.get(PRIMARY_UNTIL_STATE)
+            if message["type"] == "http.response.start" and token:
+                max_age = max(1, round(settings.REPLICA_STICKY_SECONDS))
+                cookie = (
+                    f"{PRIMARY_UNTIL_COOKIE}={token}; Max-Age={max_age}; Path=/; HttpOnly; "
+                    "SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (PRIMARY_UNTIL_HEADER.encode(), token.encode()),
+                    (b"set-cookie", cookie.encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_token)
+
+
+class RequestTimingMiddleware:
+    """
+    请求计时、访问日志与指标中间件
+
+    在响应头中添加 X-Request-ID、X-Process-Time（秒）、X-DB-Queries 和 X-DB-Time，
+    记录 N+1 告警以及 /metrics 的延迟直方图和在途请求数。
+
+    每个请求最多写一条 JSON 访问日志（经队列由后台线程写出）：错误（>= 400）和
+    慢请求总是记录，其余按 ``sample_rate`` 抽样。请求 ID 优先沿用客户端传入的
+    X-Request-ID，并附加到该请求期间的所有日志记录上。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        n_plus_one_threshold: int = 5,
+        sample_rate: float = 1.0,
+        slow_request_ms: float = 1000.0,
+    ):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.sample_rate = sample_rate
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    def should_log(self, status_code: int, process_time: float) -> bool:
+        """错误和慢请求总是记录，其余按比例抽样"""
+        if status_code >= 400 or process_time >= self.slow_request_seconds:
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method, path = scope["method"], scope["path"]
+        status_code = 500
+        request_id = request_id_from_header(Headers(scope=scope).get("x-request-id"))
+        request_id_token = request_id_var.set(request_id)
+        request_metrics.in_flight += 1
+
+        with track_queries() as queries:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-request-id", request_id.encode()),
+                        (b"x-process-time", str(time.perf_counter() - start_time).encode()),
+                        (b"x-db-queries", str(queries.count).encode()),
+                        (b"x-db-time", str(queries.seconds).encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            except Exception as e:
+                logger.error(
+                    "Error: %s %s - Exception: %s - Time: %.3fs",
+                    method,
+                    path,
+                    e,
+                    time.perf_counter() - start_time,
+                )
+                raise
+            finally:
+                process_time = time.perf_counter() - start_time
+                request_metrics.in_flight -= 1
+                request_metrics.observe(scope.get("endpoint"), method, status_code, process_time)
+                if self.should_log(status_code, process_time):
+                    self._log_access(scope, status_code, process_time, queries)
+                request_id_var.reset(request_id_token)
+
+        for shape, count in queries.repeated(self.n_plus_one_threshold):
+            logger.warning("Possible N+1 on %s %s: %dx %s", method, path, count, shape[:300])
+
+    def _log_access(self, scope: Scope, status_code: int, process_time: float, queries) -> None:
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400 or process_time >= self.slow_request_seconds:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        client = scope.get("client")
+        access_logger.log(
+            level,
+            "%s %s %d",
+            scope["method"],
+            scope["path"],
+            status_code,
+            extra={
+                "access": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query": scope.get("query_string", b"").decode("latin-1"),
+                    "status": status_code,
+                    "duration_ms": round(process_time * 1000, 3),
+                    "db_queries": queries.count,
+                    "db_ms": round(queries.seconds * 1000, 3),
+                    "client": client[0] if client else None,
+                    "slow": process_time >= self.slow_request_seconds,
+                }
+            },
+        )
+
+
+RATE_LIMITED_DETAIL = "Rate limit exceeded. Please try again later."
+
+OVERLOADED_DETAIL = "服务繁忙，请稍后重试"
+
+
+async def send_json_error(
+    send: Send, status: int, detail: str, retry_after: Optional[str] = None
+) -> None:
+    """直接发送 JSON 错误响应（不进入路由），可附带 Retry-After"""
+    body = orjson.dumps({"detail": detail})
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if retry_after is not None:
+        headers.append((b"retry-after", retry_after.encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+def rate_limit_key(scope: Scope) -> str:
+    """
+    速率限制的计数键
+
+    携带有效 Bearer token 的请求按用户计数（同一用户的多个会话、多个 IP 共用
+    一个额度），其余请求按客户端地址计数。
+    """
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        from src.core.security import decode_access_token  # jose: imported on first use
+
+        payload = decode_access_token(token)
+        if payload and payload.get("sub"):
+            return user_key(payload["sub"])
+    client = scope.get("client")
+    return address_key(client[0] if client else None)
+
+
+class RateLimitMiddleware:
+    """
+    速率限制中间件
+
+    只限制 /api/ 下的请求（健康检查、/metrics 和文档不受限，CORS 预检也不计数）。
+    登录和注册按客户端地址单独限制；其余接口按用户（或地址）计数，开销大的接口
+    按 ``ROUTE_COSTS`` 多计几次。超限时返回 429 和 Retry-After。
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.limiter.enabled
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        if path.rstrip("/") in LOGIN_PATHS:
+            client = scope.get("client")
+            key = "login:" + address_key(client[0] if client else None)
+            limit = self.limiter.login_limit
+        else:
+            key, limit = rate_limit_key(scope), None
+        decision = await self.limiter.hit(key, self.limiter.cost(method, path), limit)
+        if decision.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        await send_json_error(send, 429, RATE_LIMITED_DETAIL, decision.retry_after_header)
+
 
-        # 安全头部
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+class AdmissionControlMiddleware:
+    """
+    准入控制中间件
 
-        # 如果是生产环境，添加 HSTS
-        # if settings.ENVIRONMENT == "production":
-        #     response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    按路由类别（auth、read、aggregate、write、bulk）限制并发，超出时短暂排队；
+    排不上的请求直接返回 503 和 Retry-After，而不是在连接池上排队拖慢所有请求。
+    各类别的并发上限随数据库延迟自适应调整（见 ``src.core.admission``）。
+    """
 
-        return response
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = None
+        if scope["type"] == "http" and self.controller.enabled:
+            route_class = self.controller.classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
 
-def rate_limit_error_handler(request: Request, exc: RateLimitExceeded):
-    """速率限制错误处理"""
-    return Response(
-        content="Rate limit exceeded. Please try again later.",
-        status_code=429,
-        headers={"Retry-After": str(exc.detail)},
-    )
+        limiter = self.controller.limiters[route_class]
+        if not await limiter.acquire():
+            await send_json_error(send, 503, OVERLOADED_DETAIL, str(RETRY_AFTER_SECONDS))
+            return
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                limiter.release()
+                self.controller.observe(queries)
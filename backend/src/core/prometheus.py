@@ -0,0 +1,292 @@
+"""
+Prometheus text exposition for ``GET /metrics``.
+
+Everything here reads counters that the hot paths already maintain (request
+histograms, pool metrics, executor and cache counters); the cost of building
+label sets and text is paid at scrape time only.
+"""
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+
+from src.core.access_log import queue_logging
+from src.core.admission import admission
+from src.core.change_feed import change_bus
+from src.core.compression import CompressionMiddleware
+from src.core.database import engine, replica_engine, slow_query_log
+from src.core.db_pool import InstrumentedAsyncPool
+from src.core.idempotency import idempotency_store
+from src.core.metrics import exposition, request_metrics
+from src.core.rate_limit import rate_limiter
+from src.core.security import password_hash_executor
+from src.core.single_flight import single_flight
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _route_templates(app: FastAPI) -> Dict[Any, str]:
+    """Map endpoint functions to their path templates."""
+    return {
+        route.endpoint: route.path
+        for route in app.router.routes
+        if getattr(route, "endpoint", None) is not None
+    }
+
+
+def _middleware(app: FastAPI, cls: type) -> Optional[Any]:
+    """Find a middleware instance in the built middleware stack."""
+    layer = app.middleware_stack
+    while layer is not None:
+        if isinstance(layer, cls):
+            return layer
+        layer = getattr(layer, "app", None)
+    return None
+
+
+def _compression_metrics(app: FastAPI, lines: List[str]) -> None:
+    """Append compression byte counters, cache lookups and 304 responses."""
+    compression = _middleware(app, CompressionMiddleware)
+    if compression is None:
+        return
+
+    samples = []
+    for encoding, bytes_in, bytes_out in compression.stats():
+        samples.append(({"encoding": encoding, "direction": "in"}, bytes_in))
+        samples.append(({"encoding": encoding, "direction": "out"}, bytes_out))
+    exposition(
+        lines,
+        "http_compression_bytes_total",
+        "counter",
+        "Bytes of compressed responses before (in) and after (out) compression.",
+        samples,
+    )
+    exposition(
+        lines,
+        "http_compression_cache_lookups_total",
+        "counter",
+        "Compressed-body cache lookups by ETag and encoding.",
+        [
+            ({"result": "hit"}, compression.cache.hits),
+            ({"result": "miss"}, compression.cache.misses),
+        ],
+    )
+    exposition(
+        lines,
+        "http_not_modified_total",
+        "counter",
+        "Responses answered with 304 Not Modified.",
+        [(None, compression.not_modified)],
+    )
+
+
+def _pool_metrics(lines: List[str]) -> None:
+    """Append gauges, counters and checkout wait histograms for the instrumented pools."""
+    pools = [("primary", engine), ("replica", replica_engine)]
+    pools = [
+        (name, e.sync_engine.pool)
+        for name, e in pools
+        if e is not None and isinstance(e.sync_engine.pool, InstrumentedAsyncPool)
+    ]
+
+    gauges = [
+        ("db_pool_size", "Configured pool size.", lambda pool: pool.size()),
+        ("db_pool_in_use", "Connections checked out.", lambda pool: pool.checkedout()),
+        ("db_pool_idle", "Connections idle in the pool.", lambda pool: pool.checkedin()),
+        ("db_pool_overflow", "Overflow connections open.", lambda pool: max(pool.overflow(), 0)),
+    ]
+    for name, help_text, read in gauges:
+        exposition(lines, name, "gauge", help_text, [({"engine": e}, read(p)) for e, p in pools])
+
+    counters = [
+        ("db_pool_connects_total", "Connections opened.", "connects"),
+        ("db_pool_liveness_pings_total", "Idle connections pinged.", "liveness_pings"),
+        ("db_pool_liveness_failures_total", "Failed liveness pings.", "liveness_failures"),
+    ]
+    for name, help_text, attribute in counters:
+        exposition(
+            lines,
+            name,
+            "counter",
+            help_text,
+            [({"engine": e}, getattr(p.metrics, attribute)) for e, p in pools],
+        )
+
+    exposition(
+        lines,
+        "db_pool_checkout_wait_seconds",
+        "histogram",
+        "Time to check out a connection.",
+        [({"engine": e}, p.metrics.checkout_wait) for e, p in pools],
+    )
+
+
+def render(app: FastAPI) -> str:
+    """Render all metrics in Prometheus text format."""
+    from src.services.autocomplete_service import AutocompleteService
+
+    lines: List[str] = []
+
+    exposition(
+        lines,
+        "http_request_duration_seconds",
+        "histogram",
+        "Request latency by route template, method and status.",
+        request_metrics.series(_route_templates(app)),
+    )
+    exposition(
+        lines,
+        "http_requests_in_flight",
+        "gauge",
+        "Requests being processed.",
+        [(None, request_metrics.in_flight)],
+    )
+
+    _compression_metrics(app, lines)
+    _pool_metrics(lines)
+
+    exposition(
+        lines,
+        "db_slow_queries_total",
+        "counter",
+        "Statements slower than SLOW_QUERY_MS.",
+        [(None, slow_query_log.captured)],
+    )
+    exposition(
+        lines,
+        "autocomplete_index_lookups_total",
+        "counter",
+        "Autocomplete lookups per kind, served from the index (hit) or the database (miss).",
+        [
+            ({"result": "hit"}, AutocompleteService.index_hits),
+            ({"result": "miss"}, AutocompleteService.index_misses),
+        ],
+    )
+    exposition(
+        lines,
+        "password_hash_pending",
+        "gauge",
+        "bcrypt calls submitted to the executor and not finished.",
+        [(None, password_hash_executor.pending)],
+    )
+    exposition(
+        lines,
+        "password_hash_queued",
+        "gauge",
+        "bcrypt calls waiting for a free executor thread.",
+        [(None, password_hash_executor.queued)],
+    )
+    exposition(
+        lines,
+        "password_hash_completed_total",
+        "counter",
+        "bcrypt calls completed.",
+        [(None, password_hash_executor.completed)],
+    )
+    exposition(
+        lines,
+        "single_flight_requests_total",
+        "counter",
+        "Coalesced reads: flights led, requests that joined one, and waiters that timed out.",
+        [
+            ({"name": name, "result": result}, count)
+            for name, result, count in single_flight.snapshot()
+        ],
+    )
+    exposition(
+        lines,
+        "single_flight_in_flight",
+        "gauge",
+        "Coalesced computations currently running.",
+        [(None, single_flight.in_flight)],
+    )
+    exposition(
+        lines,
+        "change_feed_subscribers",
+        "gauge",
+        "Clients connected to the change feed.",
+        [(None, change_bus.subscribers)],
+    )
+    exposition(
+        lines,
+        "change_feed_events_total",
+        "counter",
+        "Change events published, from this worker (local) or another one (remote).",
+        [({"source": source}, count) for source, count in change_bus.published.items()],
+    )
+    exposition(
+        lines,
+        "change_feed_resyncs_total",
+        "counter",
+        "Times a slow client's buffer overflowed and it was told to resync.",
+        [(None, change_bus.resyncs)],
+    )
+    exposition(
+        lines,
+        "rate_limit_decisions_total",
+        "counter",
+        "Rate limit checks made by this worker, allowed or limited (429).",
+        [({"result": result}, count) for result, count in rate_limiter.decisions.items()],
+    )
+    exposition(
+        lines,
+        "rate_limit_backend_errors_total",
+        "counter",
+        "Checks allowed without a decision because the rate limit backend failed.",
+        [(None, rate_limiter.backend_errors)],
+    )
+    limiters = admission.limiters.items()
+    exposition(
+        lines,
+        "admission_requests_total",
+        "counter",
+        "API requests by route class: admitted at once, admitted after queueing, or shed (503).",
+        [
+            ({"class": name, "result": result}, count)
+            for name, limiter in limiters
+            for result, count in limiter.counts.items()
+        ],
+    )
+    exposition(
+        lines,
+        "admission_limit",
+        "gauge",
+        "Current concurrency limit per route class.",
+        [({"class": name}, int(limiter.limit)) for name, limiter in limiters],
+    )
+    exposition(
+        lines,
+        "admission_in_flight",
+        "gauge",
+        "Admitted requests running per route class.",
+        [({"class": name}, limiter.in_flight) for name, limiter in limiters],
+    )
+    exposition(
+        lines,
+        "admission_queued",
+        "gauge",
+        "Requests waiting for a slot per route class.",
+        [({"class": name}, limiter.queued) for name, limiter in limiters],
+    )
+    exposition(
+        lines,
+        "admission_db_latency_seconds",
+        "gauge",
+        "Statement time plus pool wait in the last adjustment period, that limits adapt to.",
+        [(None, admission.db_latency or 0.0)],
+    )
+    exposition(
+        lines,
+        "idempotency_requests_total",
+        "counter",
+        "Requests with an Idempotency-Key: executed, replayed, conflict (409), mismatch (422).",
+        [({"result": result}, count) for result, count in idempotency_store.counts.items()],
+    )
+    exposition(
+        lines,
+        "log_records_dropped_total",
+        "counter",
+        "Log records dropped because the log queue was full.",
+        [(None, queue_logging.dropped)],
+    )
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,92 @@
+"""
+Per-request SQL statement counting and N+1 detection.
+
+``track_queries()`` starts collecting statements for the current context (the
+request-logging middleware opens one per request). ``instrument_queries``
+hooks an engine's cursor events so that every statement executed while a
+tracker is active is counted, timed and grouped by shape; a shape that repeats
+within one request is the signature of an N+1.
+
+Trackers nest: a statement counts toward every enclosing tracker, so a test
+can wrap a request that the middleware also tracks.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Bind parameter lists such as "IN ($1, $2, $3)", for any paramstyle
+_PARAM = r"(?:\$\d+|\?|%\(\w+\)s|%s|:\w+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so that executions differing only in IN-list length match."""
+    return _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statement count, database time and statement shapes for one tracked block."""
+
+    __slots__ = ("count", "seconds", "shapes", "parent")
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.parent = parent
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Add one executed statement to this tracker and every enclosing one."""
+        shape = statement_shape(statement)
+        stats: Optional[QueryStats] = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in the current context until the block exits."""
+    stats = QueryStats(_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_queries(sync_engine: Engine) -> None:
+    """Count and time the engine's statements for the active tracker (if any)."""
+    if getattr(sync_engine, "_query_stats_instrumented", False):
+        return
+    sync_engine._query_stats_instrumented = True
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current.get() is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = getattr(context, "_query_started", None)
+        if stats is not None and started is not None:
+            stats.record(statement, time.perf_counter() - started)
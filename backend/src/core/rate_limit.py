@@ -0,0 +1,475 @@
+"""
+Rate limiting shared by all workers of a host (or all hosts, with Redis).
+
+Limits use GCRA (the generic cell rate algorithm): a token bucket stored as
+one number per key, the "theoretical arrival time" (TAT). A limit of N
+requests per period admits one request every ``period / N`` seconds with
+bursts of up to N; a request of cost C advances the TAT by C intervals and is
+rejected while that would put the TAT more than one period in the future.
+The window slides continuously, so there is no burst at window boundaries.
+
+Backends (RATE_LIMIT_BACKEND; by default ``redis`` when RATE_LIMIT_REDIS_URL
+is set, else ``shm``):
+
+- ``shm``: a fixed-size table in a memory-mapped file (``/dev/shm`` by
+  default) shared by every worker process on the host. It only works within
+  one host: behind a load balancer each host keeps its own counts, so a
+  client gets the limit once per host. Use ``redis`` for several hosts.
+  Each key hashes to a bucket of 8 slots (key hash + TAT, 16 bytes each); a
+  check locks only that bucket's byte range with a non-blocking
+  ``fcntl.lockf``, reads and writes the slots in place and unlocks: two
+  system calls, no global or Python-level lock. While another worker holds
+  the bucket the check yields to the event loop and retries, and allows the
+  request (fail open) if the lock is still taken after
+  SHM_LOCK_TIMEOUT_SECONDS. When every slot of a bucket is in use by a
+  throttled key, the key closest to being allowed again is evicted, so size
+  RATE_LIMIT_SLOTS well above the number of clients active within one period.
+- ``redis``: one Lua script per check against a Redis-protocol server, so
+  limits hold across hosts. The script uses the server's clock. If the server
+  is unreachable, requests are allowed (fail open) and a warning is logged.
+- ``memory``: a dict per process (tests, single-worker deployments).
+"""
+import asyncio
+import errno
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import unquote, urlsplit
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class Limit:
+    """``count`` requests (of cost 1) per ``period`` seconds."""
+
+    count: int
+    period: float
+
+    @classmethod
+    def parse(cls, text: str) -> "Limit":
+        """Parse ``"100/minute"`` (units: second, minute, hour, day)."""
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(second|minute|hour|day)s?\s*", text)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {text!r}")
+        return cls(int(match.group(1)), _PERIODS[match.group(2)])
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return self.period / self.count
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of a rate limit check; ``retry_after`` is 0 when allowed."""
+
+    allowed: bool
+    retry_after: float = 0.0
+
+    @property
+    def retry_after_header(self) -> str:
+        """Whole seconds for the Retry-After header (at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def gcra(tat: float, now: float, cost: float, limit: Limit) -> Tuple[Optional[float], float]:
+    """
+    Apply one request to a key's TAT.
+
+    Returns:
+        (new TAT, 0) when allowed, or (None, seconds until allowed) when not.
+        A cost above the limit's count is charged as the full count.
+    """
+    if tat - now > limit.period:
+        tat = now  # Not reachable by allowed requests: a stale clock base, start over
+    new_tat = max(tat, now) + min(cost, limit.count) * limit.interval
+    excess = new_tat - now - limit.period
+    if excess > 1e-9:
+        return None, excess
+    return new_tat, 0.0
+
+
+class MemoryBackend:
+    """TATs in a dict of this process (limits are per worker)."""
+
+    def __init__(self):
+        self.tats: Dict[str, float] = {}
+        self.errors = 0
+
+    async def hit(self, key: str, cost: float, limit: Limit) -> Decision:
+        now = time.monotonic()
+        tat, retry_after = gcra(self.tats.get(key, now), now, cost, limit)
+        if tat is None:
+            return Decision(False, retry_after)
+        self.tats[key] = tat
+        if len(self.tats) > 100_000:
+            self.tats = {k: t for k, t in self.tats.items() if t > now}
+        return Decision(True)
+
+    def reset(self) -> None:
+        self.tats.clear()
+
+
+# Seconds a check waits for a bucket locked by another worker (held for microseconds)
+SHM_LOCK_TIMEOUT_SECONDS = 0.05
+_SHM_LOCK_RETRY_SECONDS = 0.0005
+
+_SLOT = struct.Struct("<Qd")  # Key hash (0 = empty), TAT on the host's monotonic clock
+_BUCKET_SLOTS = 8
+_BUCKET = struct.Struct("<" + "Qd" * _BUCKET_SLOTS)
+
+
+def _key_hash(key: str) -> int:
+    """Stable 64-bit key hash (``hash()`` differs between processes); never 0."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryBackend:
+    """
+    TATs in a memory-mapped file shared by the processes of one host.
+
+    ``time.monotonic()`` is the same clock in every process of a host, so TATs
+    written by one worker are valid in the others. Checks run on the event
+    loop thread: byte-range locks exclude other processes, not other threads.
+    The lock is only tried (``LOCK_NB``), so a worker that holds a bucket,
+    or is stopped while holding it, never blocks another worker's event loop.
+    """
+
+    def __init__(self, path: str, slots: int):
+        self.buckets = max(1, slots // _BUCKET_SLOTS)
+        self.path = path
+        self.errors = 0
+        size = self.buckets * _BUCKET.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)  # Zero-filled: every slot empty
+            self._map = mmap.mmap(self._fd, size)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def _check(self, key: str, cost: float, limit: Limit) -> Optional[Decision]:
+        """Check ``key`` in its bucket; None if another process holds the bucket."""
+        key_hash = _key_hash(key)
+        offset = (key_hash % self.buckets) * _BUCKET.size
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, _BUCKET.size, offset)
+        except OSError as exc:
+            if exc.errno in (errno.EACCES, errno.EAGAIN):
+                return None
+            raise
+        try:
+            now = time.monotonic()
+            fields = _BUCKET.unpack_from(self._map, offset)
+            hashes, tats = fields[0::2], fields[1::2]
+            if key_hash in hashes:
+                slot = hashes.index(key_hash)
+                tat = tats[slot]
+            else:
+                # A free or expired slot (TAT in the past), else the one expiring first
+                slot = min(range(_BUCKET_SLOTS), key=tats.__getitem__)
+                tat = now
+            new_tat, retry_after = gcra(tat, now, cost, limit)
+            if new_tat is None:
+                return Decision(False, retry_after)
+            _SLOT.pack_into(self._map, offset + slot * _SLOT.size, key_hash, new_tat)
+            return Decision(True)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _BUCKET.size, offset)
+
+    async def hit(self, key: str, cost: float, limit: Limit) -> Decision:
+        decision = self._check(key, cost, limit)
+        if decision is not None:
+            return decision
+
+        deadline = time.monotonic() + SHM_LOCK_TIMEOUT_SECONDS
+        await asyncio.sleep(0)
+        while (decision := self._check(key, cost, limit)) is None:
+            if time.monotonic() >= deadline:
+                self.errors += 1
+                logger.warning("Rate limit bucket of %r stayed locked; allowing request", key)
+                return Decision(True)
+            await asyncio.sleep(_SHM_LOCK_RETRY_SECONDS)
+        return decision
+
+    def reset(self) -> None:
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            self._map[:] = bytes(len(self._map))
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+
+class RedisError(Exception):
+    """Error reply from the Redis server."""
+
+
+# KEYS[1]: key; ARGV: interval, period, cost. Returns {allowed, retry_after} (floats as strings,
+# Lua numbers become integers in replies).
+GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local interval, period = tonumber(ARGV[1]), tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat - now > period then tat = now end
+local new_tat = math.max(tat, now) + tonumber(ARGV[3]) * interval
+local excess = new_tat - now - period
+if excess > 1e-9 then return {0, tostring(excess)} end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+GCRA_SHA = hashlib.sha1(GCRA_SCRIPT.encode()).hexdigest()
+
+
+def _encode_command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return RedisError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2].decode()
+    if kind == b"*":
+        length = int(payload)
+        return None if length < 0 else [await _read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected Redis reply: {line!r}")
+
+
+class RedisBackend:
+    """
+    GCRA in a Redis-protocol server, over one pipelined connection.
+
+    Commands are written as soon as they are issued and replies matched to
+    them in order by a reader task, so concurrent checks share the connection
+    without a lock. The script is run by SHA (EVALSHA) and sent in full once
+    the server reports it is not cached.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.25):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip("/") or 0)
+        self.timeout = timeout
+        self.errors = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connecting: Optional[asyncio.Future] = None
+        self._pending: Deque[asyncio.Future] = deque()
+        self._failing = False
+
+    async def _connect(self) -> None:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        self._writer = writer
+        self._reader_task = asyncio.create_task(self._read_replies(reader))
+        if self.password:
+            await self._send("AUTH", self.password)
+        if self.db:
+            await self._send("SELECT", self.db)
+
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                reply = await _read_reply(reader)
+                waiter = self._pending.popleft()
+                if waiter.done():
+                    continue  # Timed out; the reply still had to be consumed
+                if isinstance(reply, RedisError):
+                    waiter.set_exception(reply)
+                else:
+                    waiter.set_result(reply)
+        except (OSError, EOFError, ConnectionError, asyncio.IncompleteReadError) as exc:
+            self._disconnect(ConnectionError(f"Redis connection lost: {exc!r}"))
+
+    def _disconnect(self, exc: Exception) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = self._reader_task = self._connecting = None
+        while self._pending:
+            waiter = self._pending.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+
+    async def _send(self, *args):
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending.append(waiter)
+        self._writer.write(_encode_command(*args))
+        return await asyncio.wait_for(waiter, self.timeout)
+
+    async def _command(self, *args):
+        if self._writer is None:
+            if self._connecting is None:
+                self._connecting = asyncio.ensure_future(self._connect())
+            try:
+                await asyncio.shield(self._connecting)
+            except BaseException:
+                self._connecting = None
+                raise
+        return await self._send(*args)
+
+    async def hit(self, key: str, cost: float, limit: Limit) -> Decision:
+        args = (1, key, repr(limit.interval), repr(limit.period), repr(min(cost, limit.count)))
+        try:
+            try:
+                allowed, retry_after = await self._command("EVALSHA", GCRA_SHA, *args)
+            except RedisError as exc:
+                if not str(exc).startswith("NOSCRIPT"):
+                    raise
+                allowed, retry_after = await self._command("EVAL", GCRA_SCRIPT, *args)
+        except (OSError, ConnectionError, RedisError, asyncio.TimeoutError) as exc:
+            self.errors += 1
+            if not self._failing:
+                logger.warning("Rate limit backend unavailable, allowing requests: %r", exc)
+            self._failing = True
+            if isinstance(exc, asyncio.TimeoutError) and self._writer is not None:
+                self._disconnect(ConnectionError("Redis timed out"))
+            return Decision(True)
+        self._failing = False
+        return Decision(allowed == 1, float(retry_after))
+
+    async def close(self) -> None:
+        task = self._reader_task
+        self._disconnect(ConnectionError("Redis connection closed"))
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+def create_backend(kind: Optional[str]):
+    """
+    The backend named by RATE_LIMIT_BACKEND (``shm`` falls back to ``memory``).
+
+    Unset, it is ``redis`` when RATE_LIMIT_REDIS_URL is configured (limits must
+    hold across hosts), else ``shm``.
+    """
+    if kind is None:
+        kind = "redis" if settings.RATE_LIMIT_REDIS_URL else "shm"
+    if kind == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise ValueError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_REDIS_URL")
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    if kind == "shm":
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        path = settings.RATE_LIMIT_SHM_PATH or os.path.join(directory, "ux-rescue-rate-limit")
+        try:
+            return SharedMemoryBackend(path, settings.RATE_LIMIT_SLOTS)
+        except OSError as exc:
+            logger.warning("Shared rate limit table unavailable (%s); limits are per worker", exc)
+    return MemoryBackend()
+
+
+# Endpoints charged more than one request: (method, path pattern, cost)
+ROUTE_COSTS: List[Tuple[str, Pattern, float]] = [
+    ("POST", re.compile(r"/api/v1/batch/?"), 0),  # Each sub-request is charged instead
+    ("POST", re.compile(r"/api/v1/projects/[^/]+/purge/?"), 10),
+    ("POST", re.compile(r"/api/v1/projects/[^/]+/members/bulk/?"), 5),
+    ("GET", re.compile(r"/api/v1/search/.*"), 5),
+    ("GET", re.compile(r"/api/v1/dashboard/.*"), 3),
+    ("GET", re.compile(r"/api/v1/audit-logs/.*"), 3),
+    ("GET", re.compile(r"/api/v1/projects/[^/]+/budget/?"), 2),
+    ("GET", re.compile(r"/api/v1/tasks/projects/[^/]+/stats/?"), 2),
+]
+
+# Unauthenticated endpoints limited per client address with RATE_LIMIT_LOGIN
+LOGIN_PATHS = {"/api/v1/auth/login", "/api/v1/auth/register"}
+
+
+class RateLimiter:
+    """
+    Per-key rate limits with route costs, on the configured backend.
+
+    The backend is created on first use, so importing the app opens no file
+    or connection.
+
+    Attributes:
+        decisions: Checks made, by result (``allowed`` or ``limited``)
+    """
+
+    def __init__(self):
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.default_limit = Limit.parse(settings.RATE_LIMIT_DEFAULT)
+        self.login_limit = Limit.parse(settings.RATE_LIMIT_LOGIN)
+        self.decisions: Dict[str, int] = {"allowed": 0, "limited": 0}
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = create_backend(settings.RATE_LIMIT_BACKEND)
+        return self._backend
+
+    @property
+    def backend_errors(self) -> int:
+        return self._backend.errors if self._backend is not None else 0
+
+    @staticmethod
+    def cost(method: str, path: str) -> float:
+        """Requests an endpoint is charged as."""
+        for route_method, pattern, cost in ROUTE_COSTS:
+            if method == route_method and pattern.fullmatch(path):
+                return cost
+        return 1
+
+    async def hit(self, key: str, cost: float = 1, limit: Optional[Limit] = None) -> Decision:
+        """Charge ``cost`` requests to ``key``; allowed or not, with the wait."""
+        if not self.enabled:
+            return Decision(True)
+        decision = await self.backend.hit(key, cost, limit or self.default_limit)
+        self.decisions["allowed" if decision.allowed else "limited"] += 1
+        return decision
+
+    def reset(self) -> None:
+        """Forget all counters of a local backend (tests)."""
+        if self._backend is not None and hasattr(self._backend, "reset"):
+            self._backend.reset()
+
+
+rate_limiter = RateLimiter()
+
+
+def user_key(email: str) -> str:
+    """Rate limit key of an authenticated user (tokens carry the email as ``sub``)."""
+    return f"user:{email}"
+
+
+def address_key(address: Optional[str]) -> str:
+    return f"ip:{address or 'unknown'}"
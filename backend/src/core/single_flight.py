@@ -0,0 +1,123 @@
+"""
+Single-flight execution of identical concurrent reads.
+
+The first caller for a key (the leader) runs the computation; callers arriving
+while it is in flight wait for the same result instead of issuing the same
+queries again. Nothing is cached: once the leader finishes, the next caller
+starts a new flight.
+
+- Errors raised by the leader are raised to every waiter.
+- A waiter that has waited ``timeout`` seconds stops waiting and runs the
+  computation itself, as it would have without coalescing.
+- If the leader is cancelled (client disconnected), its waiters retry: one of
+  them becomes the new leader.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+from src.core.config import settings
+
+T = TypeVar("T")
+
+RESULTS = ("leader", "coalesced", "timeout")
+
+
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leader was cancelled; waiters retry."""
+
+
+class SingleFlight:
+    """
+    Registry of in-flight computations keyed by (name, key).
+
+    Attributes:
+        timeout: Seconds a waiter waits before computing on its own
+        counts: name -> {"leader" | "coalesced" | "timeout": count}
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._flights: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Computations currently running."""
+        return len(self._flights)
+
+    def _count(self, name: str, result: str) -> None:
+        counts = self.counts.get(name)
+        if counts is None:
+            counts = self.counts[name] = dict.fromkeys(RESULTS, 0)
+        counts[result] += 1
+
+    async def run(
+        self,
+        name: str,
+        key: Hashable,
+        compute: Callable[[], Awaitable[T]],
+        on_wait: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> T:
+        """
+        Run ``compute`` or join an identical computation already in flight.
+
+        Args:
+            name: Metrics label for the kind of computation, e.g. ``"dashboard"``
+            key: Identifies identical computations within ``name``
+            compute: Coroutine function producing the result
+            on_wait: Called once before waiting on another caller's flight
+                (e.g. to release a pooled connection that is not needed)
+
+        Returns:
+            The result of ``compute`` (this caller's or the leader's)
+        """
+        flight_key = (name, key)
+        while True:
+            future = self._flights.get(flight_key)
+            if future is None:
+                return await self._lead(name, flight_key, compute)
+
+            self._count(name, "coalesced")
+            if on_wait is not None:
+                await on_wait()
+                on_wait = None
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                self._count(name, "timeout")
+                return await compute()
+            except _LeaderCancelled:
+                continue
+
+    async def _lead(
+        self, name: str, flight_key: Tuple[str, Hashable], compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        future = asyncio.get_running_loop().create_future()
+        self._flights[flight_key] = future
+        self._count(name, "leader")
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._flights[flight_key]
+            if future.done() and not future.cancelled():
+                future.exception()  # Mark retrieved when nobody was waiting
+
+    def snapshot(self) -> List[Tuple[str, str, int]]:
+        """(name, result, count) for every counter."""
+        return [
+            (name, result, count)
+            for name, counts in sorted(self.counts.items())
+            for result, count in counts.items()
+        ]
+
+
+single_flight = SingleFlight(settings.SINGLE_FLIGHT_TIMEOUT)
@@ -0,0 +1,214 @@
+"""
+Slow query capture with optional sampled ``EXPLAIN (ANALYZE, BUFFERS)``.
+
+Statements slower than the threshold are recorded in a bounded ring buffer
+with their normalized SQL, redacted parameters (types only, never values), the
+route endpoint and service method that issued them, and the duration.
+
+The caller is found by walking the awaiting coroutines' frames: with the
+async engine, cursor events run in a greenlet whose parent is suspended inside
+``greenlet_spawn``, so the parent's frame stack leads back through the
+``AsyncSession`` call to the service and route coroutines.
+
+With a sample rate above zero, a sampled slow SELECT is re-run as
+``EXPLAIN (ANALYZE, BUFFERS)`` in a background task on a separate pooled
+connection, inside a rolled-back transaction with a statement timeout; at most
+one EXPLAIN runs at a time.
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.query_stats import statement_shape
+
+logger = logging.getLogger(__name__)
+
+_SERVICE_PREFIX = "src.services."
+_ROUTE_PREFIX = "src.api.routes."
+
+# Parameter values shown per statement (executemany batches can be large)
+_MAX_PARAMETERS = 20
+
+# Statement timeout for the EXPLAIN ANALYZE re-run
+_EXPLAIN_TIMEOUT_MS = 10_000
+
+# Execution option marking the EXPLAIN side connection, whose statements are not captured
+_EXPLAIN_OPTION = "slow_query_explain"
+
+
+@dataclass
+class SlowQueryRecord:
+    """One captured slow statement."""
+
+    at: str
+    duration_ms: float
+    statement: str
+    parameters: Any
+    route: Optional[str]
+    caller: Optional[str]
+    plan: Optional[str] = None
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return f"<{type(value).__name__}[{len(value)}]>"
+    return f"<{type(value).__name__}>"
+
+
+def redact(parameters: Any) -> Any:
+    """Replace parameter values with their type names."""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters[:_MAX_PARAMETERS]]
+    return _redact_value(parameters)
+
+
+def _caller_frames():
+    """Innermost frame of the code that issued the statement."""
+    try:
+        import greenlet
+
+        parent = greenlet.getcurrent().parent
+        frame = parent.gr_frame if parent is not None else None
+    except ImportError:  # pragma: no cover - greenlet ships with SQLAlchemy asyncio
+        frame = None
+    return frame or sys._getframe(1)
+
+
+def find_caller() -> Tuple[Optional[str], Optional[str]]:
+    """Return the (route endpoint, service method) that issued the current statement."""
+    route = caller = None
+    frame = _caller_frames()
+    while frame is not None and route is None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_SERVICE_PREFIX):
+            # Keep the outermost service frame: the method the route called
+            caller = frame.f_code.co_qualname
+        elif module.startswith(_ROUTE_PREFIX):
+            route = f"{module[len(_ROUTE_PREFIX):]}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return route, caller
+
+
+class SlowQueryLog:
+    """Bounded in-memory log of slow statements."""
+
+    def __init__(self, threshold_ms: float, size: int = 200, explain_sample_rate: float = 0.0):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.records: Deque[SlowQueryRecord] = deque(maxlen=size)
+        self.captured = 0  # Total ever captured (the buffer keeps the latest)
+        self._explaining = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """Capture the engine's statements that exceed the threshold."""
+        if self.threshold_ms < 0:
+            return
+
+        sync_engine = engine.sync_engine
+        threshold = self.threshold_ms / 1000
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def start_timer(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context._slow_query_started = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_slow_query_started", None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            if elapsed >= threshold and not context.execution_options.get(_EXPLAIN_OPTION):
+                self.capture(engine, statement, parameters, elapsed, executemany)
+
+    def capture(
+        self,
+        engine: AsyncEngine,
+        statement: str,
+        parameters: Any,
+        elapsed: float,
+        executemany: bool = False,
+    ) -> SlowQueryRecord:
+        """Record a slow statement and maybe schedule an EXPLAIN for it."""
+        route, caller = find_caller()
+        record = SlowQueryRecord(
+            at=datetime.utcnow().isoformat(),
+            duration_ms=round(elapsed * 1000, 3),
+            statement=statement_shape(statement),
+            parameters=redact(parameters),
+            route=route,
+            caller=caller,
+        )
+        self.records.append(record)
+        self.captured += 1
+        logger.warning(
+            "Slow query %.1fms in %s (%s): %s",
+            record.duration_ms,
+            caller or "-",
+            route or "-",
+            record.statement[:300],
+        )
+
+        if (
+            not executemany
+            and not self._explaining
+            and engine.dialect.name == "postgresql"
+            and record.statement.upper().startswith("SELECT")
+            and random.random() < self.explain_sample_rate
+        ):
+            self._schedule_explain(engine, statement, parameters, record)
+        return record
+
+    def _schedule_explain(
+        self, engine: AsyncEngine, statement: str, parameters: Any, record: SlowQueryRecord
+    ) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explaining = True
+        task = loop.create_task(self._explain(engine, statement, parameters, record))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(
+        self, engine: AsyncEngine, statement: str, parameters: Any, record: SlowQueryRecord
+    ) -> None:
+        """Re-run the statement under EXPLAIN ANALYZE on a side connection."""
+        try:
+            async with engine.connect() as conn:
+                await conn.execution_options(**{_EXPLAIN_OPTION: True})
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {_EXPLAIN_TIMEOUT_MS}"
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                )
+                record.plan = "\n".join(row[0] for row in result)
+                await conn.rollback()
+        except Exception as exc:
+            record.plan = f"EXPLAIN failed: {exc}"
+        finally:
+            self._explaining = False
+
+    def snapshot(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent records first."""
+        return [asdict(record) for record in list(reversed(self.records))[:limit]]
+
+    def clear(self) -> None:
+        """Drop all records."""
+        self.records.clear()
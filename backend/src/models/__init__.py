@@ -1,5 +1,22 @@
 """Database models."""
 from src.models.audit_log import AuditLog
+from src.models.document_link import DocumentLink
+from src.models.expense import Expense
+from src.models.idempotency_key import IdempotencyKey
+from src.models.project import Project
+from src.models.project_member import ProjectMember
+from src.models.project_purge import ProjectPurge
+from src.models.task import Task
 from src.models.user import User
 
-__all__ = ["User", "AuditLog"]
+__all__ = [
+    "User",
+    "AuditLog",
+    "Project",
+    "ProjectMember",
+    "Task",
+    "Expense",
+    "DocumentLink",
+    "IdempotencyKey",
+    "ProjectPurge",
+]
@@ -0,0 +1,27 @@
+"""IdempotencyKey model: stored responses of mutating requests, replayed on retries."""
+from sqlalchemy import Column, DateTime, LargeBinary, SmallInteger, String
+
+from src.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Outcome of a mutating request sent with an ``Idempotency-Key`` header.
+
+    The primary key (principal, key) is the unique index that lets exactly one
+    request claim a key. ``status_code`` is NULL while that request runs.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    principal = Column(String(320), primary_key=True)  # "user:<email>" or "ip:<address>"
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(LargeBinary(32), nullable=False)  # SHA-256 of method, path and body
+    status_code = Column(SmallInteger, nullable=True)
+    headers = Column(LargeBinary, nullable=True)  # JSON list of [name, value]
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key} of {self.principal} ({self.status_code})>"
@@ -53,13 +53,27 @@ class Project(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
+    # Children are removed by the FKs' ON DELETE CASCADE; passive_deletes keeps
+    # SQLAlchemy from loading them just to issue per-row DELETEs.
     owner = relationship("User", back_populates="owned_projects", foreign_keys=[owner_id])
-    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan")
+    members = relationship(
+        "ProjectMember",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     document_links = relationship(
-        "DocumentLink", back_populates="project", cascade="all, delete-orphan"
+        "DocumentLink",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
+    expenses = relationship(
+        "Expense", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
     )
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    expenses = relationship("Expense", back_populates="project", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Project {self.name} ({self.status.value})>"
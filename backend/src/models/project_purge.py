@@ -0,0 +1,41 @@
+"""ProjectPurge model: progress of background project purges."""
+import enum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.core.database import Base
+
+
+class ProjectPurgeStatus(str, enum.Enum):
+    """State of a background project purge."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ProjectPurge(Base):
+    """
+    Latest purge of a project, updated in the same transaction as each batch.
+
+    Kept in the database rather than in process memory so any worker can report
+    progress, and a purge whose worker died (``updated_at`` goes stale) can be
+    restarted. There is no foreign key: the row outlives the project.
+    """
+
+    __tablename__ = "project_purges"
+
+    project_id = Column(UUID(as_uuid=True), primary_key=True)
+    project_name = Column(String(200), nullable=False)
+    status = Column(Enum(ProjectPurgeStatus), nullable=False)
+    total = Column(JSON, nullable=False)  # Child rows per table when the purge started
+    deleted = Column(JSON, nullable=False)  # Child rows deleted so far
+    started_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<ProjectPurge {self.project_id} ({self.status.value})>"
@@ -77,7 +77,7 @@ class Task(Base):
     assignee = relationship("User", foreign_keys=[assignee_id])
     created_by = relationship("User", foreign_keys=[created_by_id])
     document_links = relationship(
-        "DocumentLink", back_populates="task", cascade="all, delete-orphan"
+        "DocumentLink", back_populates="task", cascade="all, delete-orphan", passive_deletes=True
     )
 
     def __repr__(self):
@@ -0,0 +1,29 @@
+"""Autocomplete Pydantic schemas."""
+import enum
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class AutocompleteType(str, enum.Enum):
+    """Resource types offered by autocomplete."""
+
+    USER = "user"
+    PROJECT = "project"
+    TASK = "task"
+
+
+class AutocompleteItem(BaseModel):
+    """A single autocomplete suggestion."""
+
+    type: AutocompleteType
+    id: UUID
+    label: str
+
+
+class AutocompleteResponse(BaseModel):
+    """Autocomplete suggestions and where they were served from."""
+
+    items: List[AutocompleteItem]
+    source: str  # "index", "database" or "mixed"
@@ -0,0 +1,30 @@
+"""Batch request Pydantic schemas."""
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from src.core.config import settings
+
+
+class BatchRequestItem(BaseModel):
+    """One API call inside a batch."""
+
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., description="API path with query string, e.g. /api/v1/tasks/?limit=5")
+    body: Optional[Any] = None  # JSON body for POST / PUT / PATCH
+
+
+class BatchRequest(BaseModel):
+    """API calls to run in one round trip."""
+
+    requests: List[BatchRequestItem] = Field(
+        ..., min_length=1, max_length=settings.BATCH_MAX_REQUESTS
+    )
+
+
+class BatchResponseItem(BaseModel):
+    """Result of one call, in the order of the request."""
+
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None  # Parsed JSON, text, or None for an empty body
@@ -1,14 +1,16 @@
 """
 Pydantic schemas for project-related operations.
 """
+import enum
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from ..models.project import ProjectStatus
+from ..models.project_purge import ProjectPurgeStatus
 from .user import UserResponse
 
 # ========== Project Schemas ==========
@@ -73,6 +75,17 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+class ProjectBrief(BaseModel):
+    """Minimal project reference embedded in other resources."""
+
+    id: UUID
+    name: str
+    status: ProjectStatus
+
+    class Config:
+        from_attributes = True
+
+
 class ProjectListItem(BaseModel):
     """Simplified schema for project list display."""
 
@@ -123,6 +136,84 @@ class ProjectMemberResponse(BaseModel):
         from_attributes = True
 
 
+class MemberBulkAction(str, enum.Enum):
+    """Operation applied to one user in a bulk member request."""
+
+    ADD = "add"  # Add, or set the role if already a member
+    REMOVE = "remove"
+    UPDATE_ROLE = "update_role"
+
+
+class MemberBulkOutcome(str, enum.Enum):
+    """Result of one bulk member operation."""
+
+    ADDED = "added"
+    UPDATED = "updated"
+    REMOVED = "removed"
+    USER_NOT_FOUND = "user_not_found"
+    NOT_MEMBER = "not_member"
+
+
+class ProjectMemberBulkItem(BaseModel):
+    """One operation in a bulk member request."""
+
+    user_id: UUID
+    action: MemberBulkAction = MemberBulkAction.ADD
+    role: Optional[str] = Field(None, max_length=50)  # Adding an existing member keeps its role
+
+    @model_validator(mode="after")
+    def validate_role(self) -> "ProjectMemberBulkItem":
+        """Changing a role needs the new role."""
+        if self.action == MemberBulkAction.UPDATE_ROLE and self.role is None:
+            raise ValueError("role is required for update_role")
+        return self
+
+
+class ProjectMemberBulkRequest(BaseModel):
+    """Schema for adding, removing and re-assigning members in one request."""
+
+    items: List[ProjectMemberBulkItem] = Field(..., min_length=1, max_length=500)
+
+    @field_validator("items")
+    @classmethod
+    def validate_unique_users(cls, v: List[ProjectMemberBulkItem]) -> List[ProjectMemberBulkItem]:
+        """Each user may appear only once per request."""
+        if len({item.user_id for item in v}) != len(v):
+            raise ValueError("Each user may appear only once per request")
+        return v
+
+
+class ProjectMemberBulkResult(BaseModel):
+    """Per-user result of a bulk member request."""
+
+    user_id: UUID
+    action: MemberBulkAction
+    outcome: MemberBulkOutcome
+    role: Optional[str] = None
+
+
+class ProjectMemberBulkResponse(BaseModel):
+    """Schema for bulk member response."""
+
+    results: List[ProjectMemberBulkResult]
+
+
+class ProjectPurgeResponse(BaseModel):
+    """Progress of a background project purge."""
+
+    project_id: UUID
+    project_name: str
+    status: ProjectPurgeStatus
+    total: Dict[str, int]  # Child rows per table when the purge started
+    deleted: Dict[str, int]  # Child rows deleted so far
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 # ========== DocumentLink Schemas ==========
 
 
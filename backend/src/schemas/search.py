@@ -0,0 +1,35 @@
+"""Search Pydantic schemas."""
+import enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchResultType(str, enum.Enum):
+    """Searchable resource types."""
+
+    PROJECT = "project"
+    TASK = "task"
+    DOCUMENT = "document"
+
+
+class SearchHit(BaseModel):
+    """A single search result."""
+
+    type: SearchResultType
+    id: UUID
+    title: str
+    snippet: Optional[str] = None
+    project_id: Optional[UUID] = None  # Owning project (the project itself for projects)
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+
+class SearchResponse(BaseModel):
+    """Ranked search results with a keyset pagination cursor."""
+
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,435 @@
+"""
+Autocomplete service backed by an in-process prefix index.
+
+The index keeps sorted arrays of normalized keys (name, name tokens and, when
+``pypinyin`` is installed, full pinyin and pinyin initials) for users, projects
+and tasks. It is built at startup and kept current from ORM session events, so
+every committed service write is reflected without extra queries. Kinds that
+are not indexed yet, or that were evicted for exceeding the memory budget, are
+answered with a prefix query against the database instead.
+"""
+import logging
+import sys
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, null, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.models.project import Project
+from src.models.task import Task
+from src.models.user import User
+from src.schemas.autocomplete import AutocompleteItem, AutocompleteType
+
+logger = logging.getLogger(__name__)
+
+# Separator between key, kind and id in index entries (sorts before any printable char)
+_SEP = "\x00"
+
+# Rough per-entry bookkeeping overhead (list slots, dict entry, tuples)
+_ENTRY_OVERHEAD = 200
+
+_MODELS = {
+    AutocompleteType.USER: User,
+    AutocompleteType.PROJECT: Project,
+    AutocompleteType.TASK: Task,
+}
+
+# Group column per kind; tasks are grouped by project so that a project delete
+# (whose tasks go away through ON DELETE CASCADE) can drop them from the index.
+_GROUPS = {AutocompleteType.TASK: Task.project_id}
+
+
+# pypinyin loads large phrase dictionaries on import; it is imported on first use
+_lazy_pinyin = None
+_pinyin_checked = False
+
+
+def _pinyin():
+    """Return ``pypinyin.lazy_pinyin``, or None if pypinyin is not installed."""
+    global _lazy_pinyin, _pinyin_checked
+    if not _pinyin_checked:
+        try:
+            from pypinyin import lazy_pinyin as _lazy_pinyin
+        except ImportError:  # pragma: no cover - pinyin keys are optional
+            _lazy_pinyin = None
+        _pinyin_checked = True
+    return _lazy_pinyin
+
+
+def normalize(text: str) -> str:
+    """Normalize text for prefix matching."""
+    return " ".join(text.lower().split())
+
+
+def name_keys(name: str) -> Set[str]:
+    """
+    Build the prefix keys for a name.
+
+    Includes the full normalized name, each later word (so "Zhang San" matches
+    "san"), and the full pinyin and pinyin initials for Chinese names.
+    """
+    base = normalize(name)
+    if not base:
+        return set()
+
+    keys = {base}
+    keys.update(base.split(" ")[1:])
+
+    lazy_pinyin = _pinyin() if not base.isascii() else None
+    if lazy_pinyin is not None:
+        syllables = [s.strip() for s in lazy_pinyin(base) if s.strip()]
+        if syllables:
+            keys.add("".join(syllables).replace(" ", ""))
+            keys.add("".join(s[0] for s in syllables))
+
+    return keys
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index with a memory budget.
+
+    Each kind keeps its own sorted key array. While a kind is loading its array
+    is appended to unsorted and sorted once in ``finish_load``; ids and groups
+    removed meanwhile are kept as tombstones so the snapshot being loaded does
+    not bring them back. Rows are ``(id, label)`` or ``(id, label, group_id)``.
+    """
+
+    def __init__(self, memory_budget_bytes: int):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._keys: Dict[str, List[str]] = {}
+        self._entries: Dict[Tuple[str, UUID], Tuple[str, Tuple[str, ...], Optional[UUID]]] = {}
+        self._ready: Set[str] = set()
+        self._loading: Set[str] = set()
+        # Tombstones of kinds being loaded: removed ids and removed groups
+        self._removed: Dict[str, Set[UUID]] = {}
+        self._removed_groups: Dict[str, Set[UUID]] = {}
+        self._memory_bytes = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory used by the index."""
+        return self._memory_bytes
+
+    def is_ready(self, kind: AutocompleteType) -> bool:
+        """Whether queries for ``kind`` can be served from memory."""
+        return kind.value in self._ready
+
+    def load(self, kind: AutocompleteType, rows: Iterable[Tuple]) -> bool:
+        """
+        Replace all entries of ``kind`` and mark it ready.
+
+        Returns:
+            False if the memory budget was exceeded (the kind stays cold)
+        """
+        self.start_load(kind)
+        if not self.extend(kind, rows):
+            return False
+        self.finish_load(kind)
+        return True
+
+    def start_load(self, kind: AutocompleteType) -> None:
+        """Clear ``kind`` and start accepting rows (and live writes) for it."""
+        self.evict(kind)
+        self._loading.add(kind.value)
+
+    def extend(self, kind: AutocompleteType, rows: Iterable[Tuple]) -> bool:
+        """
+        Add a batch of rows while loading ``kind``.
+
+        Rows whose entry was upserted, removed or had its group removed during
+        the load are skipped: the live change is at least as new as the
+        snapshot being loaded.
+
+        Returns:
+            False if the memory budget was exceeded (the kind is evicted)
+        """
+        removed = self._removed.get(kind.value, set())
+        removed_groups = self._removed_groups.get(kind.value, set())
+        for id_, label, *group in rows:
+            if (kind.value, id_) in self._entries or id_ in removed:
+                continue
+            if group and group[0] in removed_groups:
+                continue
+            if not self._add(kind.value, id_, label, group[0] if group else None):
+                self._over_budget(kind)
+                return False
+        return True
+
+    def finish_load(self, kind: AutocompleteType) -> None:
+        """Sort the keys of ``kind`` and mark it ready to serve queries."""
+        if kind.value in self._loading:
+            self._keys.setdefault(kind.value, []).sort()
+            self._loading.discard(kind.value)
+            self._drop_tombstones(kind.value)
+            self._ready.add(kind.value)
+
+    def evict(self, kind: AutocompleteType) -> None:
+        """Drop all entries of ``kind`` and mark it cold."""
+        self._ready.discard(kind.value)
+        self._loading.discard(kind.value)
+        self._drop_tombstones(kind.value)
+        self._keys.pop(kind.value, None)
+        for key in [key for key in self._entries if key[0] == kind.value]:
+            label, keys, _ = self._entries.pop(key)
+            self._memory_bytes -= _entry_size(label, keys)
+
+    def upsert(
+        self, kind: AutocompleteType, id_: UUID, label: str, group: Optional[UUID] = None
+    ) -> None:
+        """Insert or replace one entry (ignored while ``kind`` is cold)."""
+        if kind.value not in self._ready and kind.value not in self._loading:
+            return
+        self._remove(kind.value, id_)
+        if not self._add(kind.value, id_, label, group):
+            self._over_budget(kind)
+
+    def remove(self, kind: AutocompleteType, id_: UUID) -> None:
+        """Remove one entry."""
+        if kind.value in self._loading:
+            self._removed.setdefault(kind.value, set()).add(id_)
+        self._remove(kind.value, id_)
+
+    def remove_group(self, kind: AutocompleteType, group: UUID) -> None:
+        """Remove every entry of ``kind`` in ``group`` (e.g. all tasks of a project)."""
+        if kind.value in self._loading:
+            self._removed_groups.setdefault(kind.value, set()).add(group)
+        for key, entry in list(self._entries.items()):
+            if key[0] == kind.value and entry[2] == group:
+                self._remove(kind.value, key[1])
+
+    def search(
+        self, prefix: str, kinds: Sequence[AutocompleteType], limit: int
+    ) -> List[AutocompleteItem]:
+        """Return up to ``limit`` entries whose keys start with ``prefix``."""
+        prefix = normalize(prefix)
+        matches: List[Tuple[str, str, UUID]] = []
+
+        for kind in kinds:
+            if kind.value not in self._ready:
+                continue
+            keys = self._keys.get(kind.value, [])
+            seen: Set[UUID] = set()
+            position = bisect_left(keys, prefix)
+            while position < len(keys) and len(seen) < limit:
+                key, _, raw_id = keys[position].split(_SEP)
+                position += 1
+                if not key.startswith(prefix):
+                    break
+                id_ = UUID(raw_id)
+                if id_ not in seen:
+                    seen.add(id_)
+                    matches.append((key, kind.value, id_))
+
+        matches.sort()
+        return [
+            AutocompleteItem(type=kind, id=id_, label=self._entries[(kind, id_)][0])
+            for _, kind, id_ in matches[:limit]
+        ]
+
+    def _over_budget(self, kind: AutocompleteType) -> None:
+        self.evict(kind)
+        logger.warning("Autocomplete index over budget; %s falls back to DB", kind.value)
+
+    def _drop_tombstones(self, kind: str) -> None:
+        self._removed.pop(kind, None)
+        self._removed_groups.pop(kind, None)
+
+    def _add(self, kind: str, id_: UUID, label: str, group: Optional[UUID]) -> bool:
+        keys = tuple(f"{key}{_SEP}{kind}{_SEP}{id_}" for key in name_keys(label))
+        size = _entry_size(label, keys)
+        if self._memory_bytes + size > self.memory_budget_bytes:
+            return False
+
+        kind_keys = self._keys.setdefault(kind, [])
+        if kind in self._loading:
+            kind_keys.extend(keys)
+        else:
+            for key in keys:
+                insort(kind_keys, key)
+        self._entries[(kind, id_)] = (label, keys, group)
+        self._memory_bytes += size
+        return True
+
+    def _remove(self, kind: str, id_: UUID) -> None:
+        entry = self._entries.pop((kind, id_), None)
+        if entry is None:
+            return
+
+        label, keys, _ = entry
+        kind_keys = self._keys.get(kind, [])
+        for key in keys:
+            if kind in self._loading:
+                kind_keys.remove(key)
+                continue
+            position = bisect_left(kind_keys, key)
+            if position < len(kind_keys) and kind_keys[position] == key:
+                del kind_keys[position]
+        self._memory_bytes -= _entry_size(label, keys)
+
+
+def _entry_size(label: str, keys: Tuple[str, ...]) -> int:
+    """Estimate the memory held by one index entry."""
+    return _ENTRY_OVERHEAD + sys.getsizeof(label) + sum(sys.getsizeof(key) for key in keys)
+
+
+class AutocompleteService:
+    """Service for name autocomplete on users, projects and tasks."""
+
+    index: Optional[PrefixIndex] = None
+
+    # Per-kind lookups served from the index (hits) and from the database (misses)
+    index_hits = 0
+    index_misses = 0
+
+    @staticmethod
+    def configure(memory_budget_mb: int) -> PrefixIndex:
+        """Create the process-wide index and start tracking session writes."""
+        AutocompleteService.index = PrefixIndex(memory_budget_mb * 1024 * 1024)
+        _register_session_hooks()
+        return AutocompleteService.index
+
+    @staticmethod
+    async def rebuild(session_factory: async_sessionmaker) -> None:
+        """Load all names from the database into the index."""
+        index = AutocompleteService.index
+        if index is None:
+            return
+
+        for kind, model in _MODELS.items():
+            query = select(model.id, model.name, _GROUPS.get(kind, null()))
+            if model is User:
+                query = query.where(User.is_active.is_(True))
+
+            index.start_load(kind)
+            try:
+                async with session_factory() as db:
+                    result = await db.stream(query.execution_options(yield_per=5000))
+                    async for partition in result.partitions():
+                        if not index.extend(kind, partition):
+                            break
+                    else:
+                        index.finish_load(kind)
+            except Exception:
+                index.evict(kind)
+                logger.exception("Failed to build autocomplete index for %s", kind.value)
+
+        logger.info("Autocomplete index built (%.1f MiB)", index.memory_bytes / 1024 / 1024)
+
+    @staticmethod
+    def forget_project(project_id: UUID) -> None:
+        """Drop a project and its tasks after they were deleted outside the ORM."""
+        index = AutocompleteService.index
+        if index is not None:
+            index.remove(AutocompleteType.PROJECT, project_id)
+            index.remove_group(AutocompleteType.TASK, project_id)
+
+    @staticmethod
+    async def suggest(
+        db: AsyncSession,
+        query: str,
+        kinds: Optional[Sequence[AutocompleteType]] = None,
+        limit: int = 10,
+    ) -> Tuple[List[AutocompleteItem], str]:
+        """
+        Suggest names starting with ``query``.
+
+        Args:
+            db: Database session (used for kinds the index cannot serve)
+            query: Prefix typed by the user
+            kinds: Restrict to these kinds (all if omitted)
+            limit: Maximum number of suggestions
+
+        Returns:
+            Tuple of (suggestions, source) where source is "index", "database" or "mixed"
+        """
+        kinds = list(kinds or AutocompleteType)
+        index = AutocompleteService.index
+
+        warm = [kind for kind in kinds if index is not None and index.is_ready(kind)]
+        cold = [kind for kind in kinds if kind not in warm]
+        AutocompleteService.index_hits += len(warm)
+        AutocompleteService.index_misses += len(cold)
+
+        items = index.search(query, warm, limit) if warm else []
+        for kind in cold:
+            if len(items) >= limit:
+                break
+            items.extend(await _database_prefix(db, kind, query, limit - len(items)))
+
+        source = "mixed" if warm and cold else ("index" if warm else "database")
+        return items, source
+
+
+async def _database_prefix(
+    db: AsyncSession, kind: AutocompleteType, query: str, limit: int
+) -> List[AutocompleteItem]:
+    """Fallback prefix match on the name column (no pinyin)."""
+    model = _MODELS[kind]
+    escaped = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    statement = select(model.id, model.name).where(model.name.ilike(f"{escaped}%", escape="\\"))
+    if model is User:
+        statement = statement.where(User.is_active.is_(True))
+
+    result = await db.execute(statement.order_by(model.name).limit(limit))
+    return [AutocompleteItem(type=kind, id=row.id, label=row.name) for row in result]
+
+
+# ========== Incremental Updates ==========
+
+_PENDING_KEY = "autocomplete_pending"
+_hooks_registered = False
+
+
+def _register_session_hooks() -> None:
+    """Track flushed User/Project/Task changes and apply them after commit."""
+    global _hooks_registered
+    if _hooks_registered:
+        return
+    event.listen(Session, "after_flush", _collect_changes)
+    event.listen(Session, "after_commit", _apply_changes)
+    event.listen(Session, "after_rollback", _discard_changes)
+    _hooks_registered = True
+
+
+def _collect_changes(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for obj in list(session.new) + list(session.dirty):
+        kind = _kind_of(obj)
+        if kind is None:
+            continue
+        if isinstance(obj, User) and not obj.is_active:
+            pending.append(("remove", kind, obj.id))
+        else:
+            group = getattr(obj, _GROUPS[kind].key) if kind in _GROUPS else None
+            pending.append(("upsert", kind, obj.id, obj.name, group))
+    for obj in session.deleted:
+        kind = _kind_of(obj)
+        if kind is not None:
+            pending.append(("remove", kind, obj.id))
+        if kind == AutocompleteType.PROJECT:
+            # Tasks are removed by ON DELETE CASCADE without session events
+            pending.append(("remove_group", AutocompleteType.TASK, obj.id))
+
+
+def _apply_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    index = AutocompleteService.index
+    if not pending or index is None:
+        return
+    for operation, *args in pending:
+        getattr(index, operation)(*args)
+
+
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _kind_of(obj) -> Optional[AutocompleteType]:
+    for kind, model in _MODELS.items():
+        if isinstance(obj, model):
+            return kind
+    return None
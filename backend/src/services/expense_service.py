@@ -1,16 +1,53 @@
 """Expense service for budget tracking operations."""
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.change_feed import record_change
 from src.models.expense import Expense
 from src.models.project import Project
-from src.schemas.expense import ExpenseCreate, ExpenseUpdate
+from src.models.user import User
+from src.schemas.expense import ExpenseCreate, ExpenseResponse, ExpenseUpdate
+from src.schemas.user import UserResponse
 from src.services.audit_service import AuditService
+from src.services.projections import (
+    USER_SUMMARY_FIELDS,
+    Expansion,
+    FieldSelection,
+    ResourceFields,
+)
+
+_created_by = User.__table__.alias("created_by")
+
+# Fields available to ``fields=`` / ``expand=`` on expense endpoints
+EXPENSE_FIELDS = ResourceFields(
+    name="expense",
+    model=Expense,
+    schema=ExpenseResponse,
+    columns={
+        "id": Expense.id,
+        "project_id": Expense.project_id,
+        "amount": Expense.amount,
+        "description": Expense.description,
+        "category": Expense.category,
+        "recorded_at": Expense.recorded_at,
+        "created_by_id": Expense.created_by_id,
+        "created_at": Expense.created_at,
+        "updated_at": Expense.updated_at,
+    },
+    expansions={
+        "created_by": Expansion(
+            entity=_created_by,
+            onclause=Expense.created_by_id == _created_by.c.id,
+            fields=USER_SUMMARY_FIELDS,
+            schema=UserResponse,
+        ),
+    },
+)
 
 
 class ExpenseService:
@@ -72,6 +109,7 @@ class ExpenseService:
                 },
                 ip_address=ip_address,
             )
+        record_change(db, "expense", "created", expense.id, project_id)
 
         await db.commit()
         await db.refresh(expense)
@@ -108,6 +146,55 @@ class ExpenseService:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def list_expense_rows(
+        db: AsyncSession,
+        project_id: UUID,
+        selection: FieldSelection,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        List expenses for a project as lightweight rows.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            selection: Sparse fieldset
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            List of expense dicts
+        """
+        query = (
+            EXPENSE_FIELDS.select(selection)
+            .where(Expense.project_id == project_id)
+            .order_by(Expense.recorded_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return await EXPENSE_FIELDS.fetch(db, query, selection)
+
+    @staticmethod
+    async def get_expense_row(
+        db: AsyncSession, expense_id: UUID, selection: FieldSelection
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get an expense by ID as a lightweight row.
+
+        Args:
+            db: Database session
+            expense_id: Expense ID
+            selection: Sparse fieldset
+
+        Returns:
+            Expense dict or None
+        """
+        query = EXPENSE_FIELDS.select(selection).where(Expense.id == expense_id)
+        rows = await EXPENSE_FIELDS.fetch(db, query, selection)
+        return rows[0] if rows else None
+
     @staticmethod
     async def get_expense_by_id(db: AsyncSession, expense_id: UUID) -> Optional[Expense]:
         """
@@ -187,6 +274,7 @@ class ExpenseService:
                 },
                 ip_address=ip_address,
             )
+        record_change(db, "expense", "updated", expense.id, project_id)
 
         await db.commit()
         await db.refresh(expense)
@@ -234,6 +322,7 @@ class ExpenseService:
                 details={"project_name": project.name},
                 ip_address=ip_address,
             )
+        record_change(db, "expense", "deleted", expense_id, project_id)
 
         await db.commit()
 
@@ -252,9 +341,8 @@ class ExpenseService:
         )
         total_spent = result.scalar() or Decimal("0")
 
-        # Update project
-        project_result = await db.execute(select(Project).where(Project.id == project_id))
-        project = project_result.scalar_one_or_none()
+        # Update project (usually already in the identity map, so no query)
+        project = await db.get(Project, project_id)
 
         if project:
             project.spent = total_spent
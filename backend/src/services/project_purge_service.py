@@ -0,0 +1,190 @@
+"""
+Background purge of large projects.
+
+Deleting a project relies on ``ON DELETE CASCADE``, which removes every child
+row in one statement and transaction. For projects with tens of thousands of
+tasks that holds locks for a long time, so the purge job deletes children in
+bounded batches, each in its own short transaction, yielding to the event loop
+between batches. The project row itself is deleted last.
+
+Progress is stored in the ``project_purges`` table, updated in the same
+transaction as each batch, so any worker can report it and a purge whose
+worker died can be started again (the deletes simply continue).
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Set
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.change_feed import record_change
+from ..models.document_link import DocumentLink
+from ..models.expense import Expense
+from ..models.project import Project
+from ..models.project_member import ProjectMember
+from ..models.project_purge import ProjectPurge, ProjectPurgeStatus
+from ..models.task import Task
+from .audit_service import AuditService
+from .autocomplete_service import AutocompleteService
+
+logger = logging.getLogger(__name__)
+
+# Child tables in deletion order (document links first: task deletes cascade to them)
+_CHILDREN = {
+    "document_links": DocumentLink,
+    "project_members": ProjectMember,
+    "expenses": Expense,
+    "tasks": Task,
+}
+
+# A pending or running purge not updated for this long has lost its worker
+STALE_AFTER = timedelta(minutes=5)
+
+
+class ProjectPurgeService:
+    """Service for purging large projects in the background."""
+
+    # Strong references to running tasks (the event loop only keeps weak ones)
+    _tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    async def start_purge(
+        db: AsyncSession,
+        session_factory: async_sessionmaker,
+        project_id: UUID,
+        batch_size: int,
+        current_user_id: Optional[UUID] = None,
+    ) -> Optional[ProjectPurge]:
+        """
+        Start purging a project in the background.
+
+        Commits ``db``: the job row must be visible to the background task, and the
+        row lock taken here must not outlive the call.
+
+        Args:
+            db: Database session (used to look up the project and record the job)
+            session_factory: Factory for the sessions used by the background job
+            project_id: Project ID
+            batch_size: Maximum rows deleted per statement
+            current_user_id: ID of the user purging the project (for audit logging)
+
+        Returns:
+            The running or newly started job, or None if project not found
+        """
+        now = datetime.utcnow()
+        job = await db.get(ProjectPurge, project_id, with_for_update=True)
+        if (
+            job
+            and job.status in (ProjectPurgeStatus.PENDING, ProjectPurgeStatus.RUNNING)
+            and now - job.updated_at < STALE_AFTER
+        ):
+            await db.commit()  # Release the row lock, which the running job needs
+            return job
+
+        project_name = await db.scalar(select(Project.name).where(Project.id == project_id))
+        if project_name is None:
+            await db.commit()
+            return None
+
+        if job is None:
+            job = ProjectPurge(project_id=project_id)
+            db.add(job)
+        job.project_name = project_name
+        job.status = ProjectPurgeStatus.PENDING
+        job.total, job.deleted = {}, {}
+        job.started_at = job.updated_at = now
+        job.finished_at = job.error = None
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker started it between our lookup and insert
+            await db.rollback()
+            return await db.get(ProjectPurge, project_id)
+
+        task = asyncio.create_task(
+            ProjectPurgeService._run(project_id, session_factory, batch_size, current_user_id)
+        )
+        ProjectPurgeService._tasks.add(task)
+        task.add_done_callback(ProjectPurgeService._tasks.discard)
+        return job
+
+    @staticmethod
+    async def get_job(db: AsyncSession, project_id: UUID) -> Optional[ProjectPurge]:
+        """Return the latest purge job of a project, if any."""
+        return await db.get(ProjectPurge, project_id)
+
+    @staticmethod
+    async def _run(
+        project_id: UUID,
+        session_factory: async_sessionmaker,
+        batch_size: int,
+        current_user_id: Optional[UUID],
+    ) -> None:
+        async with session_factory() as db:
+            try:
+                job = await db.get(ProjectPurge, project_id)
+                job.status = ProjectPurgeStatus.RUNNING
+                job.total = {
+                    name: await db.scalar(
+                        select(func.count()).where(model.project_id == project_id)
+                    )
+                    for name, model in _CHILDREN.items()
+                }
+                job.deleted = dict.fromkeys(_CHILDREN, 0)
+                job.updated_at = datetime.utcnow()
+                await db.commit()
+
+                for name, model in _CHILDREN.items():
+                    while True:
+                        batch = (
+                            select(model.id)
+                            .where(model.project_id == project_id)
+                            .limit(batch_size)
+                            .scalar_subquery()
+                        )
+                        result = await db.execute(delete(model).where(model.id.in_(batch)))
+                        # Reassigned, not mutated: plain JSON columns do not track changes
+                        job.deleted = {**job.deleted, name: job.deleted[name] + result.rowcount}
+                        job.updated_at = datetime.utcnow()
+                        await db.commit()
+                        if result.rowcount < batch_size:
+                            break
+                        await asyncio.sleep(0)
+
+                await db.execute(delete(Project).where(Project.id == project_id))
+                await AuditService.log_action(
+                    db=db,
+                    user_id=current_user_id,
+                    action_type="purge_project",
+                    resource_type="project",
+                    resource_id=project_id,
+                    resource_name=job.project_name,
+                    details={"deleted": job.deleted},
+                )
+                record_change(db, "project", "deleted", project_id, project_id)
+                job.status = ProjectPurgeStatus.COMPLETED
+                job.finished_at = job.updated_at = datetime.utcnow()
+                await db.commit()
+            except Exception as e:
+                logger.exception("Purge of project %s failed", project_id)
+                await db.rollback()
+                await ProjectPurgeService._fail(db, project_id, str(e))
+                return
+
+        AutocompleteService.forget_project(project_id)
+
+    @staticmethod
+    async def _fail(db: AsyncSession, project_id: UUID, error: str) -> None:
+        # If this fails too, the job goes stale and can be started again
+        try:
+            job = await db.get(ProjectPurge, project_id, populate_existing=True)
+            job.status = ProjectPurgeStatus.FAILED
+            job.error = error
+            job.finished_at = job.updated_at = datetime.utcnow()
+            await db.commit()
+        except Exception:
+            logger.exception("Could not record the failed purge of project %s", project_id)
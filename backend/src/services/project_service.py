@@ -2,25 +2,140 @@
 Service layer for project operations.
 """
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, delete, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from ..core.change_feed import record_change
 from ..models.document_link import DocumentLink
 from ..models.project import Project, ProjectStatus
 from ..models.project_member import ProjectMember
 from ..models.user import User
 from ..schemas.project import (
     DocumentLinkCreate,
+    DocumentLinkResponse,
     DocumentLinkUpdate,
+    MemberBulkAction,
+    MemberBulkOutcome,
     ProjectCreate,
+    ProjectDetailResponse,
     ProjectMemberAdd,
+    ProjectMemberBulkItem,
+    ProjectMemberBulkResult,
+    ProjectMemberResponse,
     ProjectUpdate,
 )
+from ..schemas.user import UserResponse
 from .audit_service import AuditService
+from .projections import (
+    USER_SUMMARY_FIELDS,
+    Collection,
+    Expansion,
+    FieldSelection,
+    ResourceFields,
+    pop_user_summary,
+    row_to_dict,
+    user_summary_columns,
+)
+
+_owner = User.__table__.alias("owner")
+
+# Bulk member outcomes that modify project_members, and their change feed action
+_MEMBER_CHANGES = {
+    MemberBulkOutcome.ADDED: "created",
+    MemberBulkOutcome.UPDATED: "updated",
+    MemberBulkOutcome.REMOVED: "deleted",
+}
+
+
+async def _load_members(db: AsyncSession, project_ids: List[UUID]) -> Dict[UUID, List[dict]]:
+    """Load members (with user summary) for several projects in one query."""
+    result = await db.execute(
+        select(
+            ProjectMember.id,
+            ProjectMember.project_id,
+            ProjectMember.user_id,
+            ProjectMember.role,
+            ProjectMember.assigned_at,
+            *user_summary_columns(User, "user"),
+        )
+        .join(User, ProjectMember.user_id == User.id)
+        .where(ProjectMember.project_id.in_(project_ids))
+        .order_by(ProjectMember.assigned_at)
+    )
+
+    grouped: Dict[UUID, List[dict]] = {}
+    for row in result:
+        data = row_to_dict(row)
+        data["user"] = pop_user_summary(data, "user")
+        grouped.setdefault(data["project_id"], []).append(data)
+    return grouped
+
+
+async def _load_document_links(
+    db: AsyncSession, project_ids: List[UUID]
+) -> Dict[UUID, List[dict]]:
+    """Load document links for several projects in one query."""
+    result = await db.execute(
+        select(
+            DocumentLink.id,
+            DocumentLink.project_id,
+            DocumentLink.title,
+            DocumentLink.url,
+            DocumentLink.description,
+            DocumentLink.created_by_id,
+            DocumentLink.created_at,
+            DocumentLink.updated_at,
+        )
+        .where(DocumentLink.project_id.in_(project_ids))
+        .order_by(DocumentLink.created_at.desc())
+    )
+
+    grouped: Dict[UUID, List[dict]] = {}
+    for row in result:
+        data = row_to_dict(row)
+        grouped.setdefault(data["project_id"], []).append(data)
+    return grouped
+
+
+# Fields available to ``fields=`` / ``expand=`` on project endpoints
+PROJECT_FIELDS = ResourceFields(
+    name="project",
+    model=Project,
+    schema=ProjectDetailResponse,
+    columns={
+        "id": Project.id,
+        "name": Project.name,
+        "description": Project.description,
+        "status": Project.status,
+        "start_date": Project.start_date,
+        "end_date": Project.end_date,
+        "budget": Project.budget,
+        "spent": Project.spent,
+        "owner_id": Project.owner_id,
+        "created_at": Project.created_at,
+        "updated_at": Project.updated_at,
+    },
+    expansions={
+        "owner": Expansion(
+            entity=_owner,
+            onclause=Project.owner_id == _owner.c.id,
+            fields=USER_SUMMARY_FIELDS,
+            schema=UserResponse,
+            outer=False,
+        ),
+    },
+    collections={
+        "members": Collection(loader=_load_members, schema=ProjectMemberResponse),
+        "document_links": Collection(loader=_load_document_links, schema=DocumentLinkResponse),
+    },
+    default_expand=("owner",),
+)
 
 
 class ProjectService:
@@ -73,9 +188,25 @@ class ProjectService:
             details={"status": project.status.value, "budget": str(project.budget)},
             ip_address=ip_address,
         )
+        record_change(db, "project", "created", project.id, project.id)
 
         return project
 
+    @staticmethod
+    async def project_exists(db: AsyncSession, project_id: UUID) -> bool:
+        """
+        Check whether a project exists without loading it.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+
+        Returns:
+            True if the project exists
+        """
+        result = await db.execute(select(Project.id).where(Project.id == project_id))
+        return result.first() is not None
+
     @staticmethod
     async def get_project_by_id(
         db: AsyncSession, project_id: UUID, include_details: bool = False
@@ -137,6 +268,63 @@ class ProjectService:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def list_project_rows(
+        db: AsyncSession,
+        status: Optional[ProjectStatus] = None,
+        owner_id: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List projects as lightweight rows.
+
+        Only the owner columns the response renders are selected (never
+        ``hashed_password``), joined in the same statement as the projects.
+
+        Args:
+            db: Database session
+            status: Filter by project status
+            owner_id: Filter by owner ID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            selection: Sparse fieldset; defaults to the full ``ProjectResponse`` shape
+
+        Returns:
+            List of project dicts
+        """
+        selection = selection or PROJECT_FIELDS.default_selection()
+        query = PROJECT_FIELDS.select(selection)
+
+        if status:
+            query = query.where(Project.status == status)
+        if owner_id:
+            query = query.where(Project.owner_id == owner_id)
+
+        query = query.offset(skip).limit(limit).order_by(Project.created_at.desc())
+
+        return await PROJECT_FIELDS.fetch(db, query, selection)
+
+    @staticmethod
+    async def get_project_row(
+        db: AsyncSession, project_id: UUID, selection: FieldSelection
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a project by ID as a lightweight row.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            selection: Sparse fieldset
+
+        Returns:
+            Project dict or None if not found
+        """
+        query = PROJECT_FIELDS.select(selection).where(Project.id == project_id)
+        rows = await PROJECT_FIELDS.fetch(db, query, selection)
+        return rows[0] if rows else None
+
     @staticmethod
     async def update_project(
         db: AsyncSession,
@@ -181,6 +369,7 @@ class ProjectService:
             details={"updated_fields": list(update_data.keys())},
             ip_address=ip_address,
         )
+        record_change(db, "project", "updated", project.id, project.id)
 
         return project
 
@@ -221,6 +410,7 @@ class ProjectService:
             resource_name=project_name,
             ip_address=ip_address,
         )
+        record_change(db, "project", "deleted", project_id, project_id)
 
         return True
 
@@ -289,6 +479,7 @@ class ProjectService:
             details={"member_name": user.name, "member_role": member_data.role},
             ip_address=ip_address,
         )
+        record_change(db, "member", "created", user.id, project_id, user.id)
 
         return member
 
@@ -341,9 +532,164 @@ class ProjectService:
                 details={"member_name": member_name},
                 ip_address=ip_address,
             )
+        record_change(db, "member", "deleted", user_id, project_id, user_id)
 
         return True
 
+    @staticmethod
+    async def bulk_update_members(
+        db: AsyncSession,
+        project_id: UUID,
+        items: List[ProjectMemberBulkItem],
+        current_user_id: Optional[UUID] = None,
+        ip_address: Optional[str] = None,
+    ) -> Optional[List[ProjectMemberBulkResult]]:
+        """
+        Add, remove and re-assign project members in a fixed number of queries.
+
+        Users are validated (and their current membership read) with one ``IN``
+        query; adds and role updates are written with a single
+        ``INSERT ... ON CONFLICT ON CONSTRAINT uq_project_member DO UPDATE`` and
+        removals with a single ``DELETE``. One audit record covers the batch.
+        Whether an upserted row was added or updated is taken from the upsert
+        itself, not the earlier lookup, so concurrent changes are reported as
+        they were applied.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            items: Operations to apply (one per user)
+            current_user_id: ID of the user making the change (for audit logging)
+            ip_address: IP address of the request (for audit logging)
+
+        Returns:
+            Per-item results in request order, or None if project not found
+        """
+        project_name = await db.scalar(select(Project.name).where(Project.id == project_id))
+        if project_name is None:
+            return None
+
+        user_ids = [item.user_id for item in items]
+        result = await db.execute(
+            select(User.id, ProjectMember.id.label("member_id"))
+            .outerjoin(
+                ProjectMember,
+                and_(ProjectMember.user_id == User.id, ProjectMember.project_id == project_id),
+            )
+            .where(User.id.in_(user_ids))
+        )
+        is_member = {row.id: row.member_id is not None for row in result}
+
+        results: List[ProjectMemberBulkResult] = []
+        upserts: List[Dict[str, Any]] = []
+        removals: List[UUID] = []
+
+        for item in items:
+            if item.user_id not in is_member:
+                outcome = MemberBulkOutcome.USER_NOT_FOUND
+            elif item.action == MemberBulkAction.REMOVE:
+                if is_member[item.user_id]:
+                    outcome = MemberBulkOutcome.REMOVED
+                    removals.append(item.user_id)
+                else:
+                    outcome = MemberBulkOutcome.NOT_MEMBER
+            elif item.action == MemberBulkAction.UPDATE_ROLE and not is_member[item.user_id]:
+                outcome = MemberBulkOutcome.NOT_MEMBER
+            else:
+                outcome = MemberBulkOutcome.ADDED  # Settled by the upsert below
+                upserts.append(
+                    {"project_id": project_id, "user_id": item.user_id, "role": item.role}
+                )
+
+            results.append(
+                ProjectMemberBulkResult(
+                    user_id=item.user_id,
+                    action=item.action,
+                    outcome=outcome,
+                    role=item.role if item.action != MemberBulkAction.REMOVE else None,
+                )
+            )
+
+        if upserts:
+            stored = await ProjectService._upsert_members(db, upserts)
+            for r in results:
+                if r.outcome != MemberBulkOutcome.ADDED:
+                    continue
+                if r.user_id not in stored:
+                    r.outcome, r.role = MemberBulkOutcome.USER_NOT_FOUND, None
+                    continue
+                r.role, inserted = stored[r.user_id]
+                if not inserted:
+                    r.outcome = MemberBulkOutcome.UPDATED
+
+        if removals:
+            await db.execute(
+                delete(ProjectMember).where(
+                    ProjectMember.project_id == project_id, ProjectMember.user_id.in_(removals)
+                )
+            )
+
+        # Audit log (one record for the whole batch)
+        changed = [r for r in results if r.outcome in _MEMBER_CHANGES]
+        if changed:
+            await AuditService.log_action(
+                db=db,
+                user_id=current_user_id,
+                action_type="bulk_update_project_members",
+                resource_type="project",
+                resource_id=project_id,
+                resource_name=project_name,
+                details={"changes": [r.model_dump(mode="json") for r in changed]},
+                ip_address=ip_address,
+            )
+        for r in changed:
+            action = _MEMBER_CHANGES[r.outcome]
+            record_change(db, "member", action, r.user_id, project_id, r.user_id)
+
+        return results
+
+    @staticmethod
+    async def _upsert_members(
+        db: AsyncSession, rows: List[Dict[str, Any]]
+    ) -> Dict[UUID, Tuple[Optional[str], bool]]:
+        """
+        Insert or update members, skipping users deleted since they were looked up.
+
+        Args:
+            db: Database session
+            rows: ``project_id``, ``user_id`` and ``role`` of each member
+
+        Returns:
+            ``(role, inserted)`` by user ID for the rows written
+        """
+        while rows:
+            # An add without a role keeps an existing member's role. xmax is 0 only
+            # for a row version this statement inserted (not one it updated).
+            statement = pg_insert(ProjectMember).values(rows)
+            statement = statement.on_conflict_do_update(
+                constraint="uq_project_member",
+                set_={"role": func.coalesce(statement.excluded.role, ProjectMember.role)},
+            ).returning(
+                ProjectMember.user_id,
+                ProjectMember.role,
+                (literal_column("xmax") == 0).label("inserted"),
+            )
+            try:
+                async with db.begin_nested():
+                    stored = (await db.execute(statement)).all()
+                return {row.user_id: (row.role, row.inserted) for row in stored}
+            except IntegrityError:
+                # A user was deleted after the lookup (foreign key violation): retry without
+                existing = set(
+                    await db.scalars(
+                        select(User.id).where(User.id.in_([row["user_id"] for row in rows]))
+                    )
+                )
+                if len(existing) == len(rows):
+                    raise
+                rows = [row for row in rows if row["user_id"] in existing]
+        return {}
+
     @staticmethod
     async def list_members(db: AsyncSession, project_id: UUID) -> List[ProjectMember]:
         """
@@ -548,6 +894,33 @@ class ProjectService:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_overdue_project_rows(db: AsyncSession) -> List[Dict[str, Any]]:
+        """
+        Get overdue projects as lightweight rows shaped like ``ProjectResponse``.
+
+        Args:
+            db: Database session
+
+        Returns:
+            List of overdue project dicts
+        """
+        today = date.today()
+        selection = PROJECT_FIELDS.default_selection()
+
+        query = (
+            PROJECT_FIELDS.select(selection)
+            .where(
+                and_(
+                    Project.end_date < today,
+                    Project.status.in_([ProjectStatus.PLANNING, ProjectStatus.IN_PROGRESS]),
+                )
+            )
+            .order_by(Project.end_date)
+        )
+
+        return await PROJECT_FIELDS.fetch(db, query, selection)
+
     @staticmethod
     async def count_overdue_projects(db: AsyncSession) -> int:
         """
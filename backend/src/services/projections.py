@@ -0,0 +1,265 @@
+"""
+Column projections for lightweight list reads.
+
+List endpoints only need a handful of columns from related rows (for example the
+owner of a project or the assignee of a task). Selecting those columns in the
+same statement avoids loading full ORM graphs, including sensitive fields such
+as ``User.hashed_password``, just to render a name.
+
+``ResourceFields`` describes which fields of a resource can be requested via
+``fields=`` / ``expand=`` and turns a ``FieldSelection`` into both the SELECT
+column list and a matching response serializer.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Columns required by ``UserResponse``
+USER_SUMMARY_FIELDS = ("id", "name", "email", "role", "is_active", "created_at")
+
+
+def user_summary_columns(user_alias: Any, prefix: str) -> List[Any]:
+    """
+    Build labelled columns for an embedded user summary.
+
+    Args:
+        user_alias: ``User`` or an ``aliased(User)`` entity
+        prefix: Label prefix, e.g. ``"owner"`` produces ``owner__name``
+
+    Returns:
+        List of labelled column expressions
+    """
+    return [getattr(user_alias, field).label(f"{prefix}__{field}") for field in USER_SUMMARY_FIELDS]
+
+
+def pop_user_summary(data: Dict[str, Any], prefix: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract an embedded user summary from a flat row mapping.
+
+    Args:
+        data: Row mapping produced from ``user_summary_columns`` labels (mutated in place)
+        prefix: Label prefix used when building the columns
+
+    Returns:
+        User summary dict, or None when the outer join found no user
+    """
+    summary = {field: data.pop(f"{prefix}__{field}") for field in USER_SUMMARY_FIELDS}
+    if summary["id"] is None:
+        return None
+    return summary
+
+
+def row_to_dict(row: Row) -> Dict[str, Any]:
+    """Convert a result row into a mutable dict keyed by column label."""
+    return dict(row._mapping)
+
+
+# ========== Sparse Fieldsets ==========
+
+
+@dataclass(frozen=True)
+class Expansion:
+    """A to-one relation that can be embedded as a nested object via ``expand=``."""
+
+    entity: Any  # Table alias, e.g. ``User.__table__.alias("owner")``
+    onclause: Any
+    fields: Tuple[str, ...]
+    schema: Type[BaseModel]
+    outer: bool = True
+
+
+@dataclass(frozen=True)
+class Collection:
+    """A to-many relation loaded with one extra ``IN`` query via ``expand=``."""
+
+    loader: Callable[[AsyncSession, List[Any]], Awaitable[Dict[Any, List[Dict[str, Any]]]]]
+    schema: Type[BaseModel]
+
+
+@dataclass(frozen=True)
+class Computed:
+    """A field derived in Python from other selected columns."""
+
+    depends_on: Tuple[str, ...]
+    compute: Callable[[Dict[str, Any]], Any]
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """Fields and expansions requested for one response."""
+
+    fields: Tuple[str, ...]
+    expand: Tuple[str, ...] = ()
+
+
+@dataclass(eq=False)
+class ResourceFields:
+    """
+    Registry of the fields a resource exposes to sparse fieldset requests.
+
+    Attributes:
+        name: Resource name used in error messages
+        model: ORM model the base columns come from
+        columns: Field name -> column expression
+        schema: Full response schema; field types are taken from it
+        computed: Field name -> derived field
+        expansions: Relation name -> to-one expansion
+        collections: Relation name -> to-many expansion
+        default_expand: Expansions included when no selection is requested
+    """
+
+    name: str
+    model: Any
+    columns: Dict[str, Any]
+    schema: Type[BaseModel]
+    computed: Dict[str, Computed] = field(default_factory=dict)
+    expansions: Dict[str, Expansion] = field(default_factory=dict)
+    collections: Dict[str, Collection] = field(default_factory=dict)
+    default_expand: Tuple[str, ...] = ()
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        """All scalar fields, in declaration order."""
+        return tuple(self.columns) + tuple(self.computed)
+
+    @property
+    def expand_names(self) -> Tuple[str, ...]:
+        """All relations that can be expanded."""
+        return tuple(self.expansions) + tuple(self.collections)
+
+    def default_selection(self) -> FieldSelection:
+        """Selection matching the full response schema."""
+        return FieldSelection(fields=self.field_names, expand=self.default_expand)
+
+    def parse(self, fields: Optional[str], expand: Optional[str]) -> FieldSelection:
+        """
+        Parse comma-separated ``fields`` / ``expand`` query parameters.
+
+        Omitting ``fields`` selects every scalar field; omitting ``expand``
+        embeds no relations.
+
+        Raises:
+            ValueError: If an unknown field or relation is requested
+        """
+        requested = _split(fields) if fields else self.field_names
+        unknown = [name for name in requested if name not in self.field_names]
+        if unknown:
+            raise ValueError(
+                f"Unknown {self.name} field(s): {', '.join(unknown)}. "
+                f"Allowed: {', '.join(self.field_names)}"
+            )
+
+        expanded = _split(expand) if expand else ()
+        unknown = [name for name in expanded if name not in self.expand_names]
+        if unknown:
+            raise ValueError(
+                f"Unknown {self.name} expansion(s): {', '.join(unknown)}. "
+                f"Allowed: {', '.join(self.expand_names) or 'none'}"
+            )
+
+        return FieldSelection(fields=requested, expand=expanded)
+
+    def select(self, selection: FieldSelection):
+        """
+        Build a select statement for the selection.
+
+        Only the requested columns (plus columns computed fields depend on) and
+        the columns of requested to-one expansions are selected.
+        """
+        names = list(selection.fields)
+        for name in selection.fields:
+            if name in self.computed:
+                names.extend(self.computed[name].depends_on)
+        if any(name in self.collections for name in selection.expand):
+            names.append("id")
+
+        labels = []
+        for name in dict.fromkeys(names):
+            if name in self.columns:
+                labels.append(self.columns[name].label(name))
+        for name in selection.expand:
+            expansion = self.expansions.get(name)
+            if expansion:
+                labels.extend(
+                    expansion.entity.c[col].label(f"{name}__{col}") for col in expansion.fields
+                )
+
+        query = select(*labels).select_from(self.model)
+        for name in selection.expand:
+            expansion = self.expansions.get(name)
+            if expansion:
+                query = query.join(expansion.entity, expansion.onclause, isouter=expansion.outer)
+        return query
+
+    async def fetch(
+        self, db: AsyncSession, query, selection: FieldSelection
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a statement built by ``select`` and shape rows for the selection.
+
+        Returns:
+            List of dicts containing exactly the selected fields and expansions
+        """
+        result = await db.execute(query)
+        rows = [row_to_dict(row) for row in result]
+
+        for name in selection.expand:
+            collection = self.collections.get(name)
+            if collection and rows:
+                grouped = await collection.loader(db, [row["id"] for row in rows])
+                for row in rows:
+                    row[name] = grouped.get(row["id"], [])
+
+        return [self._shape(row, selection) for row in rows]
+
+    def _shape(self, row: Dict[str, Any], selection: FieldSelection) -> Dict[str, Any]:
+        """Reduce a flat row mapping to the selected output shape."""
+        data = {}
+        for name in selection.fields:
+            if name in self.computed:
+                data[name] = self.computed[name].compute(row)
+            else:
+                data[name] = row[name]
+        for name in selection.expand:
+            expansion = self.expansions.get(name)
+            if expansion:
+                nested = {col: row[f"{name}__{col}"] for col in expansion.fields}
+                data[name] = None if nested.get("id") is None else nested
+            else:
+                data[name] = row[name]
+        return data
+
+    def adapter(self, selection: FieldSelection, many: bool = True) -> TypeAdapter:
+        """Serializer matching the selection (cached per selection)."""
+        return _build_adapter(self, selection, many)
+
+
+def _split(value: str) -> Tuple[str, ...]:
+    """Split a comma-separated parameter, dropping blanks and duplicates."""
+    return tuple(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+
+
+@lru_cache(maxsize=256)
+def _build_adapter(resource: ResourceFields, selection: FieldSelection, many: bool) -> TypeAdapter:
+    """Create a trimmed response model for a selection and wrap it in a TypeAdapter."""
+    definitions: Dict[str, Any] = {}
+    for name in selection.fields:
+        info = resource.schema.model_fields[name]
+        definitions[name] = (info.annotation, info)
+    for name in selection.expand:
+        if name in resource.expansions:
+            definitions[name] = (Optional[resource.expansions[name].schema], None)
+        else:
+            definitions[name] = (List[resource.collections[name].schema], [])
+
+    model = create_model(
+        f"{resource.schema.__name__}Sparse",
+        __config__={"from_attributes": True},
+        **definitions,
+    )
+    return TypeAdapter(List[model] if many else model)
@@ -0,0 +1,201 @@
+"""
+Search service for projects, tasks and document links.
+
+A row matches when its title or description contains the query
+(``ILIKE '%query%'``, which also finds Chinese text and parts of words) or
+contains a word similar to it (``%>``, word similarity above
+``pg_trgm.word_similarity_threshold``, which tolerates typos). PostgreSQL
+serves both operators from the ``gin_trgm_ops`` indexes created in migration
+20251023_005. Results are ranked with ``word_similarity`` (title weighted over
+description) and paginated with a keyset cursor on ``(rank, type, id)``.
+
+Each table is ranked, filtered by the cursor and cut to one page on its own
+before the results are merged, so the final sort handles at most one page per
+table instead of every match.
+"""
+import base64
+import json
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, and_, cast, func, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.document_link import DocumentLink
+from src.models.project import Project
+from src.models.task import Task
+from src.schemas.search import SearchHit, SearchResultType
+
+# Weight of a description match relative to a title match
+DESCRIPTION_WEIGHT = 0.5
+
+# Maximum snippet length returned for descriptions
+SNIPPET_LENGTH = 200
+
+
+def _like_pattern(query: str) -> str:
+    """Escape LIKE wildcards in user input and wrap it for substring matching."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_cursor(hit: SearchHit) -> str:
+    """Encode the keyset position after a hit as an opaque cursor."""
+    raw = json.dumps([hit.rank, hit.type.value, str(hit.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, UUID]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, type_, id_ = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), SearchResultType(type_).value, UUID(id_)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid search cursor") from e
+
+
+class SearchService:
+    """Service for searching across projects, tasks and document links."""
+
+    @staticmethod
+    def _source(
+        result_type: SearchResultType,
+        model,
+        title,
+        description,
+        project_id,
+        query: str,
+        limit: int,
+        cursor: Optional[Tuple[float, str, UUID]],
+    ):
+        """Build the select of one searchable table's best ``limit`` hits after ``cursor``."""
+        pattern = _like_pattern(query)
+        rank = cast(
+            func.greatest(
+                func.word_similarity(query, title),
+                func.word_similarity(query, func.coalesce(description, "")) * DESCRIPTION_WEIGHT,
+            ),
+            Float,
+        )
+
+        statement = select(
+            literal(result_type.value).label("type"),
+            model.id.label("id"),
+            title.label("title"),
+            func.substr(description, 1, SNIPPET_LENGTH).label("snippet"),
+            project_id.label("project_id"),
+            rank.label("rank"),
+        ).where(
+            or_(
+                title.ilike(pattern, escape="\\"),
+                description.ilike(pattern, escape="\\"),
+                title.op("%>")(query),
+                description.op("%>")(query),
+            )
+        )
+
+        if cursor:
+            # Keyset on (rank, type, id); the type is constant within one table
+            cursor_rank, cursor_type, cursor_id = cursor
+            if result_type.value > cursor_type:
+                statement = statement.where(rank <= cursor_rank)
+            elif result_type.value == cursor_type:
+                statement = statement.where(
+                    or_(rank < cursor_rank, and_(rank == cursor_rank, model.id > cursor_id))
+                )
+            else:
+                statement = statement.where(rank < cursor_rank)
+
+        # One page (plus the row that tells whether another exists) per table
+        return statement.order_by(rank.desc(), model.id).limit(limit + 1)
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        query: str,
+        types: Optional[Sequence[SearchResultType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[SearchHit], Optional[str]]:
+        """
+        Search project, task and document link titles and descriptions.
+
+        Args:
+            db: Database session
+            query: Search text (substring match, case-insensitive)
+            types: Restrict results to these resource types (all if omitted)
+            limit: Maximum number of results to return
+            cursor: Cursor returned by a previous page
+
+        Returns:
+            Tuple of (ranked hits, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        types = set(types or SearchResultType)
+        position = decode_cursor(cursor) if cursor else None
+
+        sources = []
+        if SearchResultType.PROJECT in types:
+            sources.append(
+                SearchService._source(
+                    SearchResultType.PROJECT,
+                    Project,
+                    Project.name,
+                    Project.description,
+                    Project.id,
+                    query,
+                    limit,
+                    position,
+                )
+            )
+        if SearchResultType.TASK in types:
+            sources.append(
+                SearchService._source(
+                    SearchResultType.TASK,
+                    Task,
+                    Task.name,
+                    Task.description,
+                    Task.project_id,
+                    query,
+                    limit,
+                    position,
+                )
+            )
+        if SearchResultType.DOCUMENT in types:
+            sources.append(
+                SearchService._source(
+                    SearchResultType.DOCUMENT,
+                    DocumentLink,
+                    DocumentLink.title,
+                    DocumentLink.description,
+                    DocumentLink.project_id,
+                    query,
+                    limit,
+                    position,
+                )
+            )
+
+        hits = union_all(*(source.subquery().select() for source in sources)).subquery("hits")
+
+        # Fetch one extra row to know whether another page exists
+        statement = (
+            select(hits).order_by(hits.c.rank.desc(), hits.c.type, hits.c.id).limit(limit + 1)
+        )
+
+        result = await db.execute(statement)
+        items = [SearchHit.model_validate(row._mapping) for row in result]
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1])
+
+        return items, next_cursor
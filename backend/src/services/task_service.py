@@ -2,18 +2,87 @@
 Service layer for task operations.
 """
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from ..core.change_feed import record_change
 from ..models.project import Project
 from ..models.task import Task, TaskPriority, TaskStatus
 from ..models.user import User
-from ..schemas.task import MyTasksSummary, TaskCreate, TaskStats, TaskUpdate
+from ..schemas.project import ProjectBrief
+from ..schemas.task import MyTasksSummary, TaskCreate, TaskResponse, TaskStats, TaskUpdate
+from ..schemas.user import UserResponse
 from .audit_service import AuditService
+from .projections import (
+    USER_SUMMARY_FIELDS,
+    Computed,
+    Expansion,
+    FieldSelection,
+    ResourceFields,
+)
+
+_CLOSED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+
+_assignee = User.__table__.alias("assignee")
+_created_by = User.__table__.alias("created_by")
+_project = Project.__table__.alias("project")
+
+
+def _is_overdue(row: Dict[str, Any]) -> bool:
+    """Mirror ``Task.is_overdue`` for projected rows."""
+    due_date = row["due_date"]
+    if not due_date or row["status"] in _CLOSED_STATUSES:
+        return False
+    return date.today() > due_date
+
+
+# Fields available to ``fields=`` / ``expand=`` on task endpoints
+TASK_FIELDS = ResourceFields(
+    name="task",
+    model=Task,
+    schema=TaskResponse,
+    columns={
+        "id": Task.id,
+        "name": Task.name,
+        "description": Task.description,
+        "status": Task.status,
+        "priority": Task.priority,
+        "due_date": Task.due_date,
+        "project_id": Task.project_id,
+        "assignee_id": Task.assignee_id,
+        "created_by_id": Task.created_by_id,
+        "completed_at": Task.completed_at,
+        "created_at": Task.created_at,
+        "updated_at": Task.updated_at,
+    },
+    computed={"is_overdue": Computed(depends_on=("due_date", "status"), compute=_is_overdue)},
+    expansions={
+        "assignee": Expansion(
+            entity=_assignee,
+            onclause=Task.assignee_id == _assignee.c.id,
+            fields=USER_SUMMARY_FIELDS,
+            schema=UserResponse,
+        ),
+        "created_by": Expansion(
+            entity=_created_by,
+            onclause=Task.created_by_id == _created_by.c.id,
+            fields=USER_SUMMARY_FIELDS,
+            schema=UserResponse,
+        ),
+        "project": Expansion(
+            entity=_project,
+            onclause=Task.project_id == _project.c.id,
+            fields=("id", "name", "status"),
+            schema=ProjectBrief,
+            outer=False,
+        ),
+    },
+    default_expand=("assignee",),
+)
 
 
 class TaskService:
@@ -68,6 +137,7 @@ class TaskService:
             },
             ip_address=ip_address,
         )
+        record_change(db, "task", "created", task.id, task.project_id, task.assignee_id)
 
         return task
 
@@ -129,7 +199,31 @@ class TaskService:
             selectinload(Task.project),
         )
 
-        # Apply filters
+        query = TaskService._apply_filters(
+            query,
+            project_id=project_id,
+            assignee_id=assignee_id,
+            status=status,
+            priority=priority,
+            is_overdue=is_overdue,
+        )
+
+        # Pagination and ordering
+        query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
+
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _apply_filters(
+        query,
+        project_id: Optional[UUID] = None,
+        assignee_id: Optional[UUID] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        is_overdue: Optional[bool] = None,
+    ):
+        """Apply the shared task list filters to a select statement."""
         if project_id:
             query = query.where(Task.project_id == project_id)
         if assignee_id:
@@ -157,12 +251,73 @@ class TaskService:
                         Task.status.in_([TaskStatus.COMPLETED, TaskStatus.CANCELLED]),
                     )
                 )
+        return query
 
-        # Pagination and ordering
+    @staticmethod
+    async def list_task_rows(
+        db: AsyncSession,
+        project_id: Optional[UUID] = None,
+        assignee_id: Optional[UUID] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        is_overdue: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+        selection: Optional[FieldSelection] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List tasks as lightweight rows.
+
+        Selects only the columns the response needs, with to-one relations
+        joined in the same statement, instead of loading full ORM objects plus
+        one ``selectinload`` query per relationship.
+
+        Args:
+            db: Database session
+            project_id: Filter by project ID
+            assignee_id: Filter by assignee ID
+            status: Filter by task status
+            priority: Filter by task priority
+            is_overdue: Filter by overdue status
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            selection: Sparse fieldset; defaults to the full ``TaskResponse`` shape
+
+        Returns:
+            List of task dicts
+        """
+        selection = selection or TASK_FIELDS.default_selection()
+
+        query = TaskService._apply_filters(
+            TASK_FIELDS.select(selection),
+            project_id=project_id,
+            assignee_id=assignee_id,
+            status=status,
+            priority=priority,
+            is_overdue=is_overdue,
+        )
         query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
 
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        return await TASK_FIELDS.fetch(db, query, selection)
+
+    @staticmethod
+    async def get_task_row(
+        db: AsyncSession, task_id: UUID, selection: FieldSelection
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a task by ID as a lightweight row.
+
+        Args:
+            db: Database session
+            task_id: Task ID
+            selection: Sparse fieldset
+
+        Returns:
+            Task dict or None if not found
+        """
+        query = TASK_FIELDS.select(selection).where(Task.id == task_id)
+        rows = await TASK_FIELDS.fetch(db, query, selection)
+        return rows[0] if rows else None
 
     @staticmethod
     async def update_task(
@@ -189,6 +344,8 @@ class TaskService:
         if not task:
             return None
 
+        previous_assignee_id = task.assignee_id
+
         # Update fields that are provided
         update_data = task_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
@@ -214,6 +371,9 @@ class TaskService:
             details={"updated_fields": list(update_data.keys())},
             ip_address=ip_address,
         )
+        record_change(
+            db, "task", "updated", task.id, task.project_id, previous_assignee_id, task.assignee_id
+        )
 
         return task
 
@@ -241,6 +401,7 @@ class TaskService:
             return False
 
         task_name = task.name
+        project_id, assignee_id = task.project_id, task.assignee_id
         project_name = task.project.name if task.project else None
 
         await db.delete(task)
@@ -256,6 +417,7 @@ class TaskService:
             details={"project_name": project_name},
             ip_address=ip_address,
         )
+        record_change(db, "task", "deleted", task_id, project_id, assignee_id)
 
         return True
 
@@ -1,16 +1,32 @@
 """User service for user management operations."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.security import get_password_hash
+from src.core.security import get_password_hash_async
 from src.models.user import User, UserRole
-from src.schemas.user import UserCreate, UserUpdate
+from src.schemas.user import UserCreate, UserResponse, UserUpdate
 from src.services.audit_service import AuditService
+from src.services.projections import FieldSelection, ResourceFields
+
+# Fields available to ``fields=`` on user endpoints (never includes hashed_password)
+USER_FIELDS = ResourceFields(
+    name="user",
+    model=User,
+    schema=UserResponse,
+    columns={
+        "id": User.id,
+        "name": User.name,
+        "email": User.email,
+        "role": User.role,
+        "is_active": User.is_active,
+        "created_at": User.created_at,
+    },
+)
 
 
 class UserService:
@@ -45,6 +61,55 @@ class UserService:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def list_user_rows(
+        db: AsyncSession,
+        selection: FieldSelection,
+        is_active: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        List users as lightweight rows.
+
+        Args:
+            db: Database session
+            selection: Sparse fieldset
+            is_active: Filter by active status
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            List of user dicts
+        """
+        query = USER_FIELDS.select(selection)
+
+        if is_active is not None:
+            query = query.where(User.is_active == is_active)
+
+        query = query.offset(skip).limit(limit).order_by(User.name)
+
+        return await USER_FIELDS.fetch(db, query, selection)
+
+    @staticmethod
+    async def get_user_row(
+        db: AsyncSession, user_id: UUID, selection: FieldSelection
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a user by ID as a lightweight row.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            selection: Sparse fieldset
+
+        Returns:
+            User dict or None
+        """
+        query = USER_FIELDS.select(selection).where(User.id == user_id)
+        rows = await USER_FIELDS.fetch(db, query, selection)
+        return rows[0] if rows else None
+
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
         """
@@ -108,7 +173,7 @@ class UserService:
         user = User(
             name=user_data.name,
             email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=await get_password_hash_async(user_data.password),
             role=user_data.role,
             is_active=True,
         )
@@ -0,0 +1,103 @@
+"""
+结构化访问日志与非阻塞日志队列测试
+"""
+import json
+import logging
+import queue
+import time
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.core.access_log import (
+    ACCESS_LOGGER,
+    JsonFormatter,
+    LogQueueListener,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    request_id_var,
+)
+from src.core.middleware import RequestTimingMiddleware
+
+
+class SlowStream:
+    """每次写入耗时 50ms 的输出流"""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        time.sleep(0.05)
+        self.lines.append(text)
+
+    def flush(self):
+        pass
+
+
+class TestAccessLog:
+    """访问日志测试类"""
+
+    def test_slow_sink_does_not_block_logging(self):
+        """测试输出端很慢时记录日志不阻塞，队列满时丢弃并计数"""
+        stream = SlowStream()
+        sink = logging.StreamHandler(stream)
+        handler = NonBlockingQueueHandler(queue.Queue(10))
+        listener = LogQueueListener(handler.queue, sink)
+        test_logger = logging.getLogger("tests.access_log.slow_sink")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        listener.start()
+
+        try:
+            started = time.perf_counter()
+            for i in range(100):
+                test_logger.warning("record %d", i)
+            elapsed = time.perf_counter() - started
+        finally:
+            listener.stop()
+            test_logger.removeHandler(handler)
+
+        assert elapsed < 0.5  # 同步写出需要 5 秒
+        assert handler.dropped > 0
+        assert len(stream.lines) + handler.dropped == 100
+
+    def test_json_formatter_includes_request_id_and_access_fields(self):
+        """测试 JSON 格式包含请求 ID 和访问字段"""
+        record = logging.LogRecord(ACCESS_LOGGER, logging.INFO, "", 0, "GET %s", ("/x",), None)
+        record.access = {"status": 200, "duration_ms": 1.5}
+        token = request_id_var.set("req-1")
+        try:
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "GET /x"
+        assert entry["request_id"] == "req-1"
+        assert entry["status"] == 200
+        assert entry["duration_ms"] == 1.5
+
+    def test_sampling_always_keeps_errors_and_slow_requests(self):
+        """测试抽样率为 0 时仍记录错误和慢请求"""
+        middleware = RequestTimingMiddleware(None, sample_rate=0.0, slow_request_ms=100)
+
+        assert middleware.should_log(200, 0.01) is False
+        assert middleware.should_log(404, 0.01) is True
+        assert middleware.should_log(500, 0.01) is True
+        assert middleware.should_log(200, 0.2) is True
+
+    @pytest.mark.asyncio
+    async def test_request_id_is_reused_or_generated(self, caplog):
+        """测试沿用合法的 X-Request-ID，否则生成新的，并写入访问日志"""
+        caplog.set_level(logging.INFO, logger=ACCESS_LOGGER)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            reused = await client.get("/health", headers={"X-Request-ID": "abc-123"})
+            generated = await client.get("/does-not-exist", headers={"X-Request-ID": "bad id!"})
+
+        assert reused.headers["x-request-id"] == "abc-123"
+        assert len(generated.headers["x-request-id"]) == 32
+
+        records = [r for r in caplog.records if r.name == ACCESS_LOGGER]
+        assert [r.access["status"] for r in records] == [200, 404]
+        assert records[1].levelno == logging.WARNING
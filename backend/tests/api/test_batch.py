@@ -0,0 +1,180 @@
+"""
+批量请求端点测试
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.routes import batch as batch_route
+from src.core.admission import RETRY_AFTER_SECONDS, ClassLimiter, RouteClass, admission
+from src.core.change_feed import change_bus
+from src.core.config import settings
+from src.core.rate_limit import Limit, rate_limiter
+from src.core.security import create_access_token
+from src.models.user import User, UserRole
+from src.schemas.batch import BatchRequestItem
+from src.services.project_service import ProjectService
+
+
+class TestBatch:
+    """批量请求端点测试类"""
+
+    @pytest_asyncio.fixture
+    async def headers(self, async_session: AsyncSession, monkeypatch) -> dict:
+        """创建管理员并返回认证请求头；测试客户端共用一个会话，子请求逐个执行"""
+        admin = User(
+            name="批量管理员",
+            email="batch-admin@example.com",
+            hashed_password="x" * 60,
+            role=UserRole.ADMIN,
+        )
+        async_session.add(admin)
+        await async_session.commit()
+        monkeypatch.setattr(settings, "BATCH_CONCURRENCY", 1)
+        return {"Authorization": f"Bearer {create_access_token({'sub': admin.email})}"}
+
+    def test_groups_consecutive_reads(self):
+        """测试连续的 GET 归为一组并发执行，写请求单独成组"""
+        items = [
+            BatchRequestItem(method=method, path="/api/v1/tasks/")
+            for method in ("GET", "GET", "POST", "GET", "DELETE", "PATCH", "GET", "GET")
+        ]
+
+        assert batch_route._groups(items) == [
+            (True, [0, 1]),
+            (False, [2]),
+            (True, [3]),
+            (False, [4]),
+            (False, [5]),
+            (True, [6, 7]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_runs_sub_requests_in_order_with_one_authentication(
+        self, client: AsyncClient, headers, monkeypatch
+    ):
+        """测试子请求按顺序返回结果、只认证一次，写入后的读取能看到写入"""
+        decoded = []
+        decode = batch_route.get_current_reader.__globals__["decode_access_token"]
+
+        def counting_decode(token):
+            decoded.append(token)
+            return decode(token)
+
+        monkeypatch.setitem(
+            batch_route.get_current_reader.__globals__, "decode_access_token", counting_decode
+        )
+
+        response = await client.post(
+            "/api/v1/batch",
+            headers=headers,
+            json={
+                "requests": [
+                    {"path": "/api/v1/projects/"},
+                    {"method": "POST", "path": "/api/v1/projects/", "body": {"name": "批量项目"}},
+                    {"path": "/api/v1/projects/?limit=10"},
+                    {"method": "POST", "path": "/api/v1/projects/", "body": {}},
+                    {"path": "/api/v1/unknown"},
+                    {"path": "/health"},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["status"] for r in results] == [200, 201, 200, 422, 404, 400]
+        assert results[0]["body"] == []
+        assert results[1]["body"]["name"] == "批量项目"
+        assert [p["name"] for p in results[2]["body"]] == ["批量项目"]
+        assert results[2]["headers"]["content-type"].startswith("application/json")
+        assert len(decoded) == 1
+
+    @pytest.mark.asyncio
+    async def test_sub_requests_count_against_rate_limit(
+        self, client: AsyncClient, headers, monkeypatch
+    ):
+        """测试每个子请求按用户单独计入速率限制（批量请求本身不计），超限的子请求返回 429"""
+        monkeypatch.setattr(rate_limiter, "default_limit", Limit.parse("2/minute"))
+
+        response = await client.post(
+            "/api/v1/batch",
+            headers=headers,
+            json={"requests": [{"path": "/api/v1/projects/"}] * 3 + [{"path": "/api/v1/tasks/"}]},
+        )
+
+        statuses = [r["status"] for r in response.json()]
+        assert statuses == [200, 200, 429, 429]
+        assert int(response.json()[2]["headers"]["retry-after"]) >= 1
+
+    @pytest.mark.asyncio
+    async def test_sub_requests_pass_admission_control(
+        self, client: AsyncClient, headers, monkeypatch
+    ):
+        """测试每个子请求按自己的路由类别准入（批量请求本身不占名额），被拒绝的子请求返回 503"""
+        monkeypatch.setattr(admission, "enabled", True)
+        full = {}
+        for name in ("read", "bulk"):
+            full[name] = ClassLimiter(RouteClass(name, 1, 1, queue_timeout=0.01))
+            assert await full[name].acquire()
+            monkeypatch.setitem(admission.limiters, name, full[name])
+        write = ClassLimiter(RouteClass("write", 1, 1, queue_timeout=0.01))
+        monkeypatch.setitem(admission.limiters, "write", write)
+
+        response = await client.post(
+            "/api/v1/batch",
+            headers=headers,
+            json={
+                "requests": [
+                    {"path": "/api/v1/projects/"},
+                    {"method": "POST", "path": "/api/v1/projects/", "body": {"name": "准入"}},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()
+        assert [r["status"] for r in results] == [503, 201]
+        assert results[0]["headers"]["retry-after"] == str(RETRY_AFTER_SECONDS)
+        assert write.counts["admitted"] == 1 and write.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_streaming_and_hanging_sub_requests_end(
+        self, client: AsyncClient, headers, monkeypatch
+    ):
+        """测试事件流子请求返回 400（按路径或响应类型），超时的子请求返回 504，均不占用订阅"""
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(ProjectService, "list_project_rows", hang)
+        monkeypatch.setattr(settings, "BATCH_TIMEOUT_SECONDS", 0.05)
+        monkeypatch.setattr(batch_route, "_DISCONNECT_GRACE_SECONDS", 0.05)
+
+        by_path = await client.post(
+            "/api/v1/batch", headers=headers, json={"requests": [{"path": "/api/v1/events/"}]}
+        )
+        monkeypatch.setattr(batch_route, "STREAMING_PREFIXES", ())
+        by_response = await client.post(
+            "/api/v1/batch",
+            headers=headers,
+            json={"requests": [{"path": "/api/v1/events/"}, {"path": "/api/v1/projects/"}]},
+        )
+
+        assert [r["status"] for r in by_path.json()] == [400]
+        assert [r["status"] for r in by_response.json()] == [400, 504]
+        assert "Streaming" in by_response.json()[0]["body"]["detail"]
+        assert change_bus.subscribers == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_batch(self, client: AsyncClient, headers):
+        """测试超过 BATCH_MAX_REQUESTS 的批量请求被拒绝"""
+        response = await client.post(
+            "/api/v1/batch",
+            headers=headers,
+            json={"requests": [{"path": "/api/v1/tasks/"}] * (settings.BATCH_MAX_REQUESTS + 1)},
+        )
+
+        assert response.status_code == 422
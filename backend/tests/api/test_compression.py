@@ -0,0 +1,111 @@
+"""
+响应压缩中间件测试
+"""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import AsyncClient
+
+from src.core.compression import CompressedCache, CompressionMiddleware, negotiate
+
+PAYLOAD = "用户体验拯救项目 " * 500
+
+
+def build_app(**options) -> FastAPI:
+    """带压缩中间件和三个测试端点的应用"""
+    app = FastAPI()
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse(PAYLOAD)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield PAYLOAD.encode()
+            yield PAYLOAD.encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, **options)
+    return app
+
+
+class TestCompression:
+    """响应压缩测试类"""
+
+    def test_negotiate_respects_q_values_and_preference(self):
+        """测试按 q 值协商编码，q 值相同时优先 zstd、br、gzip"""
+        available = {"gzip": None, "br": None, "zstd": None}
+
+        assert negotiate("gzip, br, zstd", available) == "zstd"
+        assert negotiate("gzip;q=1, br;q=0.5", available) == "gzip"
+        assert negotiate("br;q=0, *", available) == "zstd"
+        assert negotiate("zstd, br", {"gzip": None}) is None
+        assert negotiate("identity", available) is None
+        assert negotiate(None, available) is None
+
+    def test_cache_evicts_least_recently_used_by_size(self):
+        """测试缓存按总字节数淘汰最久未使用的条目"""
+        cache = CompressedCache(max_bytes=10)
+        cache.put(("a", "gzip"), b"12345")
+        cache.put(("b", "gzip"), b"12345")
+        assert cache.get(("a", "gzip")) == b"12345"
+        cache.put(("c", "gzip"), b"12345")
+
+        assert cache.get(("b", "gzip")) is None
+        assert cache.get(("a", "gzip")) == b"12345"
+        assert cache.size == 10
+
+    @pytest.mark.asyncio
+    async def test_compresses_caches_and_answers_not_modified(self):
+        """测试压缩大响应、重复响应命中缓存，If-None-Match 命中返回 304"""
+        app = build_app(offload_size=0)  # 所有压缩都在线程池中进行
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/text", headers={"Accept-Encoding": "gzip"})
+            second = await client.get("/text", headers={"Accept-Encoding": "gzip"})
+            middleware = app.middleware_stack.app
+            not_modified = await client.get(
+                "/text",
+                headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+            )
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.text == PAYLOAD
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert first.headers["etag"].startswith('W/"')
+        assert second.headers["etag"] == first.headers["etag"]
+        assert middleware.cache.hits == 1
+        assert middleware.bytes_out["gzip"] < middleware.bytes_in["gzip"] / 5
+
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == first.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_small_and_streaming_responses_pass_through(self):
+        """测试小响应不压缩，流式响应原样逐块发送"""
+        app = build_app()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+            streamed = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+            identity = await client.get("/text", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert small.text == "ok"
+        assert "content-encoding" not in streamed.headers
+        assert streamed.text == PAYLOAD * 2
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"].startswith('"')  # 未压缩时为强 ETag
+
+    def test_gzip_output_is_deterministic(self):
+        """测试 gzip 输出不含时间戳，相同内容字节相同"""
+        encoder = CompressionMiddleware(None).encoders["gzip"]
+        assert encoder(PAYLOAD.encode()) == encoder(PAYLOAD.encode())
+        assert gzip.decompress(encoder(PAYLOAD.encode())).decode() == PAYLOAD
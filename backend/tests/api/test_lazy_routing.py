@@ -0,0 +1,94 @@
+"""
+延迟加载路由测试
+"""
+import importlib
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.api.lazy_routing import LazyRouter, install_lazy_openapi
+from src.api.main import LAZY_PATHS
+
+
+def _lazy_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.router.routes.append(LazyRouter(app, "src.api.routes.search", "/api/v1/search", ["Search"]))
+    install_lazy_openapi(app)
+    return app
+
+
+def _placeholders(app: FastAPI):
+    return [route for route in app.router.routes if isinstance(route, LazyRouter)]
+
+
+class TestLazyRouting:
+    """延迟加载路由测试类"""
+
+    @pytest.mark.asyncio
+    async def test_router_loaded_on_first_request(self):
+        """测试首次请求时加载路由模块并分发请求"""
+        app = _lazy_app()
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/health")
+            assert response.status_code == 200
+            assert len(_placeholders(app)) == 1
+
+            # 未认证：由搜索路由处理（403），而不是 404
+            response = await client.get("/api/v1/search/", params={"q": "x"})
+            assert response.status_code == 403
+            assert _placeholders(app) == []
+
+    @pytest.mark.asyncio
+    async def test_unrelated_prefix_not_loaded(self):
+        """测试前缀不匹配时不加载路由模块"""
+        app = _lazy_app()
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/v1/searching")
+            assert response.status_code == 404
+            assert len(_placeholders(app)) == 1
+
+    def test_openapi_loads_pending_routers(self):
+        """测试生成 OpenAPI 前加载所有待加载的路由"""
+        app = _lazy_app()
+
+        schema = app.openapi()
+
+        assert "/api/v1/search/" in schema["paths"]
+        assert _placeholders(app) == []
+
+    @pytest.mark.asyncio
+    async def test_shared_prefix_router_claims_only_its_paths(self):
+        """测试共用 /api/v1 前缀的支出路由只认领自己的路径，后面路由的请求不会加载它"""
+        app = FastAPI()
+        expenses = LazyRouter(
+            app, "src.api.routes.expenses", "/api/v1", ["Expenses"], LAZY_PATHS["expenses"]
+        )
+        app.router.routes.append(expenses)
+        app.router.routes.append(
+            LazyRouter(app, "src.api.routes.search", "/api/v1/search", ["Search"])
+        )
+
+        # 支出模块的每个路由都在认领范围内
+        module = importlib.import_module("src.api.routes.expenses")
+        for route in module.router.routes:
+            path = "/api/v1" + route.path.replace("{", "").replace("}", "")
+            assert any(pattern.fullmatch(path) for pattern in expenses.patterns), route.path
+        assert not any(pattern.fullmatch("/api/v1/projects/") for pattern in expenses.patterns)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/v1/search/", params={"q": "x"})
+            assert response.status_code == 403
+            assert _placeholders(app) == [expenses]
+
+            response = await client.get(f"/api/v1/projects/{uuid4()}/budget")
+            assert response.status_code == 403
+            assert _placeholders(app) == []
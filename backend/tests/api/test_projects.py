@@ -3,6 +3,12 @@
 """
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.main import app
+from src.core.database import get_read_db
+from src.core.security import create_access_token
+from src.models.user import User, UserRole
 
 
 class TestProjectsAPI:
@@ -138,3 +144,44 @@ class TestProjectsAPI:
             headers=admin_headers,
         )
         assert get_response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_writes_authenticate_on_primary_session(
+        self, client: AsyncClient, async_session: AsyncSession
+    ):
+        """测试写请求在路由的 get_db 会话上认证、不使用只读会话；读请求在只读会话上认证"""
+        admin = User(
+            name="认证管理员",
+            email="auth-admin@example.com",
+            hashed_password="x" * 60,
+            role=UserRole.ADMIN,
+        )
+        async_session.add(admin)
+        await async_session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.email})}"}
+        reads = []
+
+        class ReadSession:
+            """记录经只读会话执行的语句"""
+
+            def __getattr__(self, name):
+                return getattr(async_session, name)
+
+            async def execute(self, statement, *args, **kwargs):
+                reads.append(statement)
+                return await async_session.execute(statement, *args, **kwargs)
+
+        async def override_get_read_db():
+            yield ReadSession()
+
+        app.dependency_overrides[get_read_db] = override_get_read_db
+
+        created = await client.post(
+            "/api/v1/projects/", headers=headers, json={"name": "主库项目"}
+        )
+        assert created.status_code == 201
+        assert reads == []
+
+        listed = await client.get("/api/v1/projects/", headers=headers)
+        assert listed.status_code == 200
+        assert reads
@@ -0,0 +1,56 @@
+"""
+Prometheus 指标端点测试
+"""
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.core.config import settings
+from src.core.metrics import RequestMetrics, format_labels
+
+
+class TestPrometheusMetrics:
+    """Prometheus 指标端点测试类"""
+
+    def test_request_metrics_reuse_series(self):
+        """测试同一端点/方法/状态复用同一个直方图"""
+        metrics = RequestMetrics(buckets=(0.1, 1))
+        endpoint = object()
+        metrics.observe(endpoint, "GET", 200, 0.05)
+        metrics.observe(endpoint, "GET", 200, 2)
+
+        (labels, histogram), = metrics.series({endpoint: "/items/{id}"})
+        assert labels == {"route": "/items/{id}", "method": "GET", "status": "200"}
+        assert histogram.snapshot()["buckets"] == {"0.1": 1, "1": 1, "+Inf": 2}
+
+    def test_format_labels_escapes_values(self):
+        """测试标签值转义"""
+        assert format_labels({"route": 'a"b\\c'}) == '{route="a\\"b\\\\c"}'
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_reports_route_templates(self):
+        """测试 /metrics 按路由模板输出延迟直方图"""
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/health")
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_request_duration_seconds_count{route="/health",method="GET",status="200"}' in (
+            response.text
+        )
+        assert "http_requests_in_flight 1" in response.text
+
+    @pytest.mark.asyncio
+    async def test_metrics_token_required_when_configured(self, monkeypatch):
+        """测试配置 METRICS_TOKEN 后需要令牌"""
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            denied = await client.get("/metrics")
+            allowed = await client.get(
+                "/metrics", headers={"Authorization": "Bearer scrape-secret"}
+            )
+
+        assert denied.status_code == 401
+        assert allowed.status_code == 200
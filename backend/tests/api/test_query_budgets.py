@@ -0,0 +1,118 @@
+"""
+SQL 语句计数与各端点查询预算测试
+"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.query_stats import instrument_queries, statement_shape, track_queries
+from src.core.security import create_access_token
+from src.models.expense import Expense
+from src.models.project import Project
+from src.models.project_member import ProjectMember
+from src.models.user import User, UserRole
+
+
+class TestQueryStats:
+    """SQL 语句计数测试类"""
+
+    @pytest.mark.asyncio
+    async def test_counts_statements_and_repeated_shapes(self):
+        """测试统计语句数、耗时及重复的语句形状"""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=NullPool)
+        instrument_queries(engine.sync_engine)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))  # 未追踪
+            with track_queries() as outer:
+                with track_queries() as inner:
+                    for i in range(3):
+                        await conn.execute(text("SELECT :x"), {"x": i})
+                await conn.execute(text("SELECT 2"))
+        await engine.dispose()
+
+        assert inner.count == 3
+        assert outer.count == 4
+        assert outer.seconds > 0
+        assert outer.repeated(3) == [("SELECT ?", 3)]
+
+    def test_shape_ignores_in_list_length(self):
+        """测试 IN 列表长度不同的语句形状相同"""
+        assert statement_shape("SELECT * FROM t WHERE id IN ($1, $2)") == statement_shape(
+            "SELECT *\n  FROM t WHERE id IN ($1, $2, $3)"
+        )
+
+
+class TestQueryBudgets:
+    """端点查询预算测试类"""
+
+    @pytest_asyncio.fixture
+    async def project_with_members(self, async_session: AsyncSession):
+        """创建带 5 名成员和 5 笔支出的项目"""
+        admin = User(
+            name="预算管理员",
+            email="budget-admin@example.com",
+            hashed_password="x" * 60,
+            role=UserRole.ADMIN,
+        )
+        members = [
+            User(
+                name=f"成员{i}",
+                email=f"budget-member{i}@example.com",
+                hashed_password="x" * 60,
+                role=UserRole.MEMBER,
+            )
+            for i in range(5)
+        ]
+        async_session.add_all([admin, *members])
+        await async_session.flush()
+
+        project = Project(name="查询预算项目", budget=Decimal("1000.00"), owner_id=admin.id)
+        async_session.add(project)
+        await async_session.flush()
+
+        async_session.add_all(ProjectMember(project_id=project.id, user_id=m.id) for m in members)
+        async_session.add_all(
+            Expense(
+                project_id=project.id,
+                amount=Decimal("10.00"),
+                description=f"支出{i}",
+                recorded_at=datetime(2025, 1, i + 1),
+                created_by_id=admin.id,
+            )
+            for i in range(5)
+        )
+        await async_session.commit()
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.email})}"}
+        return project, headers
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path, max_queries",
+        [
+            ("/api/v1/projects/", 2),
+            ("/api/v1/projects/{id}", 6),
+            ("/api/v1/projects/{id}/members", 3),
+            ("/api/v1/projects/{id}/expenses", 3),
+            ("/api/v1/projects/{id}/budget", 3),
+        ],
+    )
+    async def test_endpoint_query_budget(
+        self, client: AsyncClient, project_with_members, query_budget, path, max_queries
+    ):
+        """测试端点的 SQL 语句数不超过预算，且不随成员/支出数量增长"""
+        project, headers = project_with_members
+
+        with query_budget(max_queries):
+            response = await client.get(path.format(id=project.id), headers=headers)
+
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Queries"]) <= max_queries
+        assert float(response.headers["X-DB-Time"]) >= 0
@@ -0,0 +1,80 @@
+"""
+JSON 响应序列化测试
+"""
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from src.api.responses import ORJSONResponse, construct, list_response
+from src.models.user import UserRole
+from src.schemas.expense import ExpenseResponse
+from src.schemas.project import ProjectResponse
+
+
+def owner() -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "name": "负责人",
+        "email": "owner@example.com",
+        "role": UserRole.ADMIN,
+        "is_active": True,
+        "created_at": datetime(2025, 1, 1, 8, 30),
+    }
+
+
+class TestResponses:
+    """JSON 响应序列化测试类"""
+
+    def test_orjson_response_handles_decimal_uuid_datetime(self):
+        """测试 ORJSONResponse 直接序列化 Decimal、UUID 和 datetime"""
+        value = uuid.uuid4()
+        body = ORJSONResponse(
+            {"amount": Decimal("10.50"), "id": value, "at": datetime(2025, 1, 2, 3, 4, 5)}
+        ).body
+
+        assert json.loads(body) == {
+            "amount": "10.50",
+            "id": str(value),
+            "at": "2025-01-02T03:04:05",
+        }
+
+    def test_construct_builds_nested_models_without_validation(self):
+        """测试 construct 递归构建嵌套模型且不做校验"""
+        row = {
+            "id": uuid.uuid4(),
+            "name": "项目",
+            "budget": Decimal("100.00"),
+            "spent": Decimal("0"),
+            "owner_id": uuid.uuid4(),
+            "owner": {**owner(), "email": "not-an-email"},
+            "created_at": datetime(2025, 1, 1),
+            "updated_at": datetime(2025, 1, 1),
+        }
+
+        project = construct(ProjectResponse, row)
+
+        assert project.owner.email == "not-an-email"
+        assert project.status.value == "planning"  # 默认值
+
+    def test_list_response_matches_response_model_output(self):
+        """测试 list_response 与校验后序列化的结果一致（含 datetime 转 date）"""
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "project_id": uuid.uuid4(),
+                "amount": Decimal("12.34"),
+                "description": "支出",
+                "category": None,
+                "recorded_at": datetime(2025, 3, 1),
+                "created_by_id": None,
+                "created_at": datetime(2025, 3, 1, 9, 0),
+                "updated_at": datetime(2025, 3, 1, 9, 0),
+            }
+        ]
+
+        body = json.loads(list_response(ExpenseResponse, rows).body)
+        expected = [ExpenseResponse.model_validate(row).model_dump(mode="json") for row in rows]
+
+        assert body == expected
+        assert body[0]["recorded_at"] == "2025-03-01"
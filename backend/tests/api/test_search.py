@@ -0,0 +1,126 @@
+"""
+搜索 API 测试
+"""
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.security import create_access_token
+from src.models.document_link import DocumentLink
+from src.models.project import Project
+from src.models.task import Task
+from src.models.user import User, UserRole
+from src.schemas.search import SearchHit, SearchResultType
+from src.services.search_service import decode_cursor, encode_cursor
+
+
+class TestSearchAPI:
+    """搜索 API 测试类"""
+
+    @pytest_asyncio.fixture
+    async def headers(self, async_session: AsyncSession) -> dict:
+        """创建用户并返回认证请求头"""
+        user = User(
+            name="搜索用户",
+            email="search@example.com",
+            hashed_password="x" * 60,
+            role=UserRole.ADMIN,
+        )
+        async_session.add(user)
+        await async_session.commit()
+        self.user_id = user.id
+        return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+    @pytest_asyncio.fixture
+    async def indexed(self, async_session: AsyncSession, headers) -> dict:
+        """
+        创建同名（相同排名）的项目、任务和文档，用于检验 (rank, type, id) 上的分页；
+        需要 PostgreSQL 的 pg_trgm 扩展，否则跳过
+        """
+        if async_session.bind.dialect.name != "postgresql":
+            pytest.skip("搜索依赖 PostgreSQL 的 pg_trgm 扩展")
+        try:
+            await async_session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await async_session.commit()
+        except DBAPIError:
+            await async_session.rollback()
+            pytest.skip("pg_trgm 扩展不可用")
+
+        project = Project(name="Redesign", budget=1000, owner_id=self.user_id)
+        async_session.add(project)
+        await async_session.flush()
+        tasks = [Task(name="Redesign", project_id=project.id) for _ in range(4)]
+        documents = [
+            DocumentLink(title="Redesign", url=f"https://example.com/{n}", project_id=project.id)
+            for n in range(2)
+        ]
+        others = [Task(name="Unrelated", project_id=project.id)]
+        async_session.add_all(tasks + documents + others)
+        await async_session.commit()
+        return {
+            "project": {project.id},
+            "task": {task.id for task in tasks},
+            "document": {document.id for document in documents},
+        }
+
+    def test_cursor_round_trip(self):
+        """测试游标编码后可还原为 (rank, type, id)"""
+        hit = SearchHit(type=SearchResultType.TASK, id=uuid4(), title="t", rank=0.625)
+
+        assert decode_cursor(encode_cursor(hit)) == (0.625, "task", hit.id)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_rejects_blank_query_and_malformed_cursor(self, client: AsyncClient, headers):
+        """测试只含空白的查询返回 422，无效游标返回 400"""
+        blank = await client.get("/api/v1/search/", params={"q": "   "}, headers=headers)
+        malformed = await client.get(
+            "/api/v1/search/", params={"q": "redesign", "cursor": "bad"}, headers=headers
+        )
+
+        assert blank.status_code == 422
+        assert malformed.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_pages_without_duplicates_or_gaps(self, client: AsyncClient, headers, indexed):
+        """测试按游标逐页获取的结果与一次获取全部的结果一致，无重复无遗漏"""
+        everything = await client.get(
+            "/api/v1/search/", params={"q": "redesign", "limit": 100}, headers=headers
+        )
+        assert everything.json()["next_cursor"] is None
+
+        paged, cursor = [], None
+        while True:
+            params = {"q": "redesign", "limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get("/api/v1/search/", params=params, headers=headers)).json()
+            assert len(page["items"]) <= 2
+            paged += page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        ids = [hit["id"] for hit in paged]
+        assert ids == [hit["id"] for hit in everything.json()["items"]]
+        assert len(ids) == len(set(ids)) == 7
+        assert [hit["type"] for hit in paged] == ["document"] * 2 + ["project"] + ["task"] * 4
+
+    @pytest.mark.asyncio
+    async def test_filters_by_type(self, client: AsyncClient, headers, indexed):
+        """测试 type 参数只返回指定类型"""
+        response = await client.get(
+            "/api/v1/search/",
+            params=[("q", "redesign"), ("type", "project"), ("type", "document")],
+            headers=headers,
+        )
+
+        hits = response.json()["items"]
+        assert {hit["type"] for hit in hits} == {"project", "document"}
+        assert {hit["id"] for hit in hits} == {
+            str(id_) for id_ in indexed["project"] | indexed["document"]
+        }
@@ -2,6 +2,8 @@
 pytest 配置文件和共享 fixtures
 """
 import asyncio
+import os
+from contextlib import contextmanager
 from typing import AsyncGenerator, Generator
 
 import pytest
@@ -10,10 +12,16 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 
-from src.api.main import app
-from src.core.database import Base, get_db
-from src.core.security import get_password_hash
-from src.models.user import User
+# 速率限制计数留在测试进程内（不写共享内存文件，避免多次运行之间互相影响）
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+
+from src.api.main import app  # noqa: E402
+from src.core.config import settings  # noqa: E402
+from src.core.database import Base, get_db, get_read_db  # noqa: E402
+from src.core.query_stats import instrument_queries, track_queries  # noqa: E402
+from src.core.rate_limit import rate_limiter  # noqa: E402
+from src.core.security import get_password_hash  # noqa: E402
+from src.models.user import User  # noqa: E402
 
 # 测试数据库 URL (使用内存 SQLite 或独立测试数据库)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -68,6 +76,8 @@ async def client(async_session: AsyncSession) -> AsyncGenerator[AsyncClient, Non
         yield async_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    rate_limiter.reset()  # 每个测试从满额度开始
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
@@ -143,3 +153,30 @@ def auth_headers(auth_token: str) -> dict:
 def admin_headers(admin_token: str) -> dict:
     """获取管理员请求头"""
     return {"Authorization": f"Bearer {admin_token}"}
+
+
+@pytest.fixture
+def query_budget(async_engine):
+    """
+    断言代码块内执行的 SQL 语句数不超过预算，且没有重复执行的语句（N+1）
+
+    用法::
+
+        with query_budget(3):
+            response = await client.get(...)
+    """
+    instrument_queries(async_engine.sync_engine)
+
+    @contextmanager
+    def budget(max_queries: int, max_repeats: int = settings.N_PLUS_ONE_THRESHOLD - 1):
+        with track_queries() as stats:
+            yield stats
+
+        statements = "\n".join(f"  {n}x {shape}" for shape, n in stats.shapes.most_common())
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries, budget {max_queries}:\n{statements}"
+        )
+        repeated = stats.repeated(max_repeats + 1)
+        assert not repeated, f"Statements repeated more than {max_repeats}x:\n{statements}"
+
+    return budget
@@ -0,0 +1,130 @@
+"""
+准入控制（按路由类别限流、过载时 503）测试
+"""
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.core.admission import AdmissionController, ClassLimiter, RouteClass
+from src.core.middleware import AdmissionControlMiddleware
+from src.core.query_stats import QueryStats
+
+
+def _stats(count: int, seconds: float) -> QueryStats:
+    stats = QueryStats()
+    stats.count, stats.seconds = count, seconds
+    return stats
+
+
+class TestAdmission:
+    """准入控制测试类"""
+
+    def test_classifies_routes(self):
+        """测试路由分类：登录、聚合、批量、写入、普通读取，以及不受限的路径（含批量请求端点）"""
+        classify = AdmissionController.classify
+
+        assert classify("POST", "/api/v1/auth/login") == "auth"
+        assert classify("GET", "/api/v1/dashboard/stats") == "aggregate"
+        assert classify("GET", "/api/v1/search/") == "aggregate"
+        assert classify("POST", "/api/v1/projects/abc/purge") == "bulk"
+        assert classify("PATCH", "/api/v1/tasks/abc") == "write"
+        assert classify("GET", "/api/v1/tasks/abc") == "read"
+        assert classify("GET", "/api/v1/events/") is None
+        assert classify("POST", "/api/v1/batch") is None  # 子请求各自按类别准入
+        assert classify("GET", "/health") is None
+        assert classify("OPTIONS", "/api/v1/tasks/") is None
+
+    @pytest.mark.asyncio
+    async def test_queues_briefly_then_sheds(self):
+        """测试满额时排队等待空位，超过排队期限或队列已满时拒绝"""
+        limiter = ClassLimiter(RouteClass("read", 1, 1, queue_timeout=0.05))
+        assert await limiter.acquire()
+
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        assert not await limiter.acquire()  # 队列已满（长度为 max_limit）
+        limiter.release()
+        assert await waiting
+        assert limiter.in_flight == 1
+
+        assert not await limiter.acquire()  # 排队超时
+        assert limiter.queued == 0
+        assert limiter.counts == {"admitted": 1, "queued": 1, "shed": 2}
+
+    def test_limits_adapt_to_database_latency(self):
+        """测试数据库变慢时按比例收缩上限，恢复后排队的类别逐步放宽；auth 不调整"""
+        controller = AdmissionController(
+            [RouteClass("auth", 4, 4, 1.0, adaptive=False), RouteClass("read", 20, 2, 0.1)],
+            target_latency=0.01,
+            adjust_seconds=3600,
+        )
+        read, auth = controller.limiters["read"], controller.limiters["auth"]
+
+        controller.observe(_stats(10, 0.01))  # 平均 1ms：基线
+        controller.adjust()
+        assert read.limit == 20
+
+        controller.observe(_stats(10, 0.4))  # 平均 40ms：超过目标 10ms 的 4 倍，最多减半
+        controller.adjust()
+        assert read.limit == 10
+        assert controller.db_latency == pytest.approx(0.04)
+
+        controller.observe(_stats(10, 0.15))  # 15ms：按 10/15 收缩
+        controller.adjust()
+        assert read.limit == pytest.approx(10 * 10 / 15)
+
+        read.saturated = True
+        controller.observe(_stats(10, 0.05))
+        controller.adjust()
+        assert read.limit == pytest.approx(10 * 10 / 15 + 1)
+        assert not read.saturated
+        assert auth.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_overload_returns_503_while_health_and_login_respond(self):
+        """测试读取类满载时新读取返回 503，健康检查和登录不受影响"""
+        controller = AdmissionController(
+            [RouteClass("auth", 1, 1, 1.0, adaptive=False), RouteClass("read", 1, 1, 0.01)],
+            target_latency=0.01,
+            adjust_seconds=3600,
+        )
+        release = asyncio.Event()
+
+        async def slow(request):
+            await release.wait()
+            return PlainTextResponse("slow")
+
+        async def ok(request):
+            return PlainTextResponse("ok")
+
+        app = AdmissionControlMiddleware(
+            Starlette(
+                routes=[
+                    Route("/api/v1/items", slow),
+                    Route("/api/v1/auth/login", ok, methods=["POST"]),
+                    Route("/health", ok),
+                ]
+            ),
+            controller,
+        )
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/api/v1/items"))
+            await asyncio.sleep(0.01)
+            shed = await client.get("/api/v1/items")
+            login = await client.post("/api/v1/auth/login")
+            health = await client.get("/health")
+            release.set()
+            assert (await first).status_code == 200
+
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "1"
+        assert shed.json()["detail"]
+        assert login.status_code == 200
+        assert health.status_code == 200
+        assert controller.limiters["read"].in_flight == 0
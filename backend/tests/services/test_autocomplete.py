@@ -0,0 +1,137 @@
+"""
+自动补全前缀索引测试
+"""
+from uuid import uuid4
+
+import pytest
+
+from src.schemas.autocomplete import AutocompleteType
+from src.services.autocomplete_service import PrefixIndex, _pinyin, name_keys
+
+
+class TestNameKeys:
+    """前缀键生成测试类"""
+
+    def test_includes_full_name_and_later_words(self):
+        """测试包含完整名称及后续单词"""
+        assert name_keys("  Website   Redesign ") == {"website redesign", "redesign"}
+
+    @pytest.mark.skipif(_pinyin() is None, reason="pypinyin not installed")
+    def test_includes_pinyin_for_chinese_names(self):
+        """测试中文名称生成全拼和首字母"""
+        keys = name_keys("张三")
+        assert {"张三", "zhangsan", "zs"} <= keys
+
+
+class TestPrefixIndex:
+    """前缀索引测试类"""
+
+    def test_search_by_prefix(self):
+        """测试按前缀查询并按键排序"""
+        index = PrefixIndex(1024 * 1024)
+        beta, alpha = uuid4(), uuid4()
+        index.load(AutocompleteType.PROJECT, [(beta, "Beta launch"), (alpha, "Alpha")])
+
+        items = index.search("  B", [AutocompleteType.PROJECT], limit=10)
+        assert [item.id for item in items] == [beta]
+
+        items = index.search("", [AutocompleteType.PROJECT], limit=10)
+        assert [item.id for item in items] == [alpha, beta]
+
+    def test_entry_listed_once_per_kind(self):
+        """测试多个键命中同一条目时只返回一次"""
+        index = PrefixIndex(1024 * 1024)
+        project_id = uuid4()
+        index.load(AutocompleteType.PROJECT, [(project_id, "sales sales-report")])
+
+        items = index.search("sales", [AutocompleteType.PROJECT], limit=10)
+        assert [item.id for item in items] == [project_id]
+
+    def test_upsert_and_remove(self):
+        """测试增量更新与删除"""
+        index = PrefixIndex(1024 * 1024)
+        index.load(AutocompleteType.TASK, [])
+        task_id = uuid4()
+
+        index.upsert(AutocompleteType.TASK, task_id, "Draft spec")
+        index.upsert(AutocompleteType.TASK, task_id, "Final spec")
+        assert index.search("draft", [AutocompleteType.TASK], limit=10) == []
+        assert index.search("final", [AutocompleteType.TASK], limit=10)[0].label == "Final spec"
+
+        index.remove(AutocompleteType.TASK, task_id)
+        assert index.search("final", [AutocompleteType.TASK], limit=10) == []
+        assert index.memory_bytes == 0
+
+    def test_upsert_during_load_then_remove(self):
+        """测试加载期间的增量更新不被快照中的旧行重复加入，之后删除不留下孤立的键"""
+        index = PrefixIndex(1024 * 1024)
+        task_id, other_id = uuid4(), uuid4()
+
+        index.start_load(AutocompleteType.TASK)
+        index.upsert(AutocompleteType.TASK, task_id, "Final spec")
+        assert index.extend(AutocompleteType.TASK, [(task_id, "Draft spec"), (other_id, "Other")])
+        index.finish_load(AutocompleteType.TASK)
+
+        items = index.search("", [AutocompleteType.TASK], limit=10)
+        assert sorted(item.label for item in items) == ["Final spec", "Other"]
+
+        index.remove(AutocompleteType.TASK, task_id)
+        index.remove(AutocompleteType.TASK, other_id)
+        assert index.search("", [AutocompleteType.TASK], limit=10) == []
+        assert index.memory_bytes == 0
+
+    def test_remove_during_load(self):
+        """测试加载期间删除的条目和项目（及其任务）不会被快照中的旧行重新加入"""
+        index = PrefixIndex(1024 * 1024)
+        deleted, kept = uuid4(), uuid4()
+        project_id, other_project_id = uuid4(), uuid4()
+
+        index.start_load(AutocompleteType.TASK)
+        index.remove(AutocompleteType.TASK, deleted)
+        index.remove_group(AutocompleteType.TASK, project_id)
+        assert index.extend(
+            AutocompleteType.TASK,
+            [(deleted, "Task a", other_project_id), (uuid4(), "Task b", project_id),
+             (kept, "Task c", other_project_id)],
+        )
+        index.finish_load(AutocompleteType.TASK)
+
+        items = index.search("task", [AutocompleteType.TASK], limit=10)
+        assert [item.id for item in items] == [kept]
+
+        # 加载完成后墓碑清空，同一 ID 可以再次加入
+        index.upsert(AutocompleteType.TASK, deleted, "Task a", other_project_id)
+        assert len(index.search("task", [AutocompleteType.TASK], limit=10)) == 2
+
+    def test_cold_kind_is_not_served(self):
+        """测试未加载的类型不从索引返回，且忽略增量写入"""
+        index = PrefixIndex(1024 * 1024)
+        index.upsert(AutocompleteType.USER, uuid4(), "Alice")
+
+        assert not index.is_ready(AutocompleteType.USER)
+        assert index.search("a", [AutocompleteType.USER], limit=10) == []
+
+    def test_over_budget_evicts_kind(self):
+        """测试超出内存预算时整个类型被驱逐并回退数据库"""
+        index = PrefixIndex(2048)
+        index.load(AutocompleteType.USER, [(uuid4(), "Alice")])
+
+        rows = [(uuid4(), f"Project {n}") for n in range(100)]
+        assert not index.load(AutocompleteType.PROJECT, rows)
+        assert not index.is_ready(AutocompleteType.PROJECT)
+        assert index.is_ready(AutocompleteType.USER)
+
+    def test_remove_group(self):
+        """测试按项目移除其全部任务（级联删除后）"""
+        index = PrefixIndex(1024 * 1024)
+        project_id, other_project_id = uuid4(), uuid4()
+        kept = uuid4()
+        index.load(
+            AutocompleteType.TASK,
+            [(uuid4(), "Task a", project_id), (uuid4(), "Task b", project_id),
+             (kept, "Task c", other_project_id)],
+        )
+
+        index.remove_group(AutocompleteType.TASK, project_id)
+        items = index.search("task", [AutocompleteType.TASK], limit=10)
+        assert [item.id for item in items] == [kept]
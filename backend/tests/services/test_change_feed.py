@@ -0,0 +1,101 @@
+"""
+变更事件流（SSE）测试
+"""
+import json
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.api.routes.events import event_stream
+from src.core.change_feed import RESYNC, ChangeBus, ChangeEvent, change_bus, record_change
+
+
+class TestChangeFeed:
+    """变更事件流测试类"""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_receive_matching_events(self):
+        """测试按项目和用户过滤事件"""
+        bus = ChangeBus()
+        project, other_project, user = str(uuid4()), str(uuid4()), str(uuid4())
+        task = ChangeEvent("task", "updated", str(uuid4()), project, (user,))
+        expense = ChangeEvent("expense", "created", str(uuid4()), other_project)
+
+        with bus.subscribe(project_id=project) as by_project, bus.subscribe(
+            user_id=user
+        ) as by_user, bus.subscribe() as everything:
+            assert bus.subscribers == 3
+            bus.publish(task)
+            bus.publish(expense)
+
+            assert by_project.queue.qsize() == 1
+            assert await by_user.get() == task
+            assert everything.queue.qsize() == 2
+
+        assert bus.subscribers == 0
+        assert bus.published["local"] == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_told_to_resync(self):
+        """测试缓冲区满时丢弃积压事件并发送 resync，不阻塞发布者"""
+        bus = ChangeBus()
+        with bus.subscribe(buffer_size=2) as slow:
+            for _ in range(3):
+                bus.publish(ChangeEvent("project", "updated", str(uuid4())))
+
+            assert await slow.get() is RESYNC
+            assert slow.queue.empty()
+            assert bus.resyncs == 1
+
+    @pytest.mark.asyncio
+    async def test_events_are_published_on_commit_only(self):
+        """测试事件在事务提交后才发布，回滚时丢弃"""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=NullPool)
+        committed, rolled_back = uuid4(), uuid4()
+
+        with change_bus.subscribe(project_id=committed) as sub_a, change_bus.subscribe(
+            project_id=rolled_back
+        ) as sub_b:
+            async with AsyncSession(engine) as db:
+                await db.execute(text("SELECT 1"))
+                record_change(db, "project", "updated", committed, committed)
+                assert sub_a.queue.empty()
+                await db.commit()
+
+                await db.execute(text("SELECT 1"))
+                record_change(db, "project", "deleted", rolled_back, rolled_back)
+                await db.rollback()
+
+            change = await sub_a.get()
+            assert (change.resource, change.action, change.id) == (
+                "project",
+                "updated",
+                str(committed),
+            )
+            assert sub_b.queue.empty()
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_event_stream_format(self):
+        """测试 SSE 格式：重连间隔、事件、心跳和 resync"""
+        bus = ChangeBus()
+        with bus.subscribe(buffer_size=1) as sub:
+            stream = event_stream(sub, heartbeat_seconds=0.01)
+            assert await stream.__anext__() == b"retry: 3000\n\n"
+
+            assert await stream.__anext__() == b": ping\n\n"
+
+            change = ChangeEvent("task", "created", "t1", "p1", ("u1",))
+            bus.publish(change)
+            name, data, end = (await stream.__anext__()).split(b"\n", 2)
+            assert name == b"event: task.created"
+            assert ChangeEvent.from_dict(json.loads(data[len(b"data: ") :])) == change
+            assert end == b"\n"
+
+            bus.publish(change)
+            bus.publish(change)
+            assert await stream.__anext__() == b"event: resync\ndata: {}\n\n"
+            await stream.aclose()
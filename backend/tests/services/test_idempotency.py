@@ -0,0 +1,127 @@
+"""
+Idempotency-Key（幂等请求）测试
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+from src.models.idempotency_key import IdempotencyKey
+
+
+class TestIdempotency:
+    """幂等请求测试类"""
+
+    @pytest_asyncio.fixture
+    async def store(self, tmp_path):
+        """只包含 idempotency_keys 表的数据库（文件库：每个会话有独立的连接和事务）"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/keys.db", poolclass=NullPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(IdempotencyKey.__table__.create)
+        yield IdempotencyStore(
+            async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            ttl_seconds=3600,
+            lock_seconds=60,
+        )
+        await engine.dispose()
+
+    @pytest.fixture
+    def app(self, store):
+        """计数执行次数的测试应用：/items 创建，/slow 等待放行，/fail 返回 500"""
+        executed = []
+        release = asyncio.Event()
+
+        async def create_item(request: Request):
+            body = await request.json()
+            executed.append(body)
+            if request.url.path.endswith("/slow"):
+                await release.wait()
+            if request.url.path.endswith("/fail") and len(executed) == 1:
+                return JSONResponse({"detail": "boom"}, status_code=500)
+            return JSONResponse({"id": len(executed), **body}, status_code=201)
+
+        routes = [
+            Route(f"/api/v1/{name}", create_item, methods=["POST"])
+            for name in ("items", "slow", "fail")
+        ]
+        app = IdempotencyMiddleware(Starlette(routes=routes), store, wait_seconds=5)
+        app.executed, app.release = executed, release
+        return app
+
+    @pytest.mark.asyncio
+    async def test_replays_stored_response(self, app, store):
+        """测试相同 key 的重试返回首次响应且不再执行，不同请求复用 key 返回 422"""
+        headers = {"Idempotency-Key": "create-1"}
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.post("/api/v1/items", json={"name": "a"}, headers=headers)
+            retry = await client.post("/api/v1/items", json={"name": "a"}, headers=headers)
+            reused = await client.post("/api/v1/items", json={"name": "b"}, headers=headers)
+            unkeyed = await client.post("/api/v1/items", json={"name": "a"})
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json() == {"id": 1, "name": "a"}
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+        assert reused.status_code == 422
+        assert unkeyed.json()["id"] == 2
+        assert app.executed == [{"name": "a"}, {"name": "a"}]
+        assert store.counts == {"executed": 1, "replayed": 1, "conflict": 0, "mismatch": 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_wait_for_the_first(self, app):
+        """测试并发的重复请求等待首个请求完成后拿到同一响应，只执行一次"""
+        headers = {"Idempotency-Key": "slow-1"}
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            requests = [
+                asyncio.ensure_future(
+                    client.post("/api/v1/slow", json={"name": "s"}, headers=headers)
+                )
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            assert len(app.executed) == 1
+            app.release.set()
+            responses = await asyncio.gather(*requests)
+
+        assert [r.status_code for r in responses] == [201, 201, 201]
+        assert all(r.json() == {"id": 1, "name": "s"} for r in responses)
+        assert len(app.executed) == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_is_not_stored(self, app, store):
+        """测试 5xx 响应不保存，重试会重新执行"""
+        headers = {"Idempotency-Key": "fail-1"}
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            failed = await client.post("/api/v1/fail", json={}, headers=headers)
+            retried = await client.post("/api/v1/fail", json={}, headers=headers)
+
+        assert failed.status_code == 500
+        assert retried.status_code == 201
+        assert "idempotent-replayed" not in retried.headers
+        assert len(app.executed) == 2
+
+    @pytest.mark.asyncio
+    async def test_abandoned_and_expired_keys_are_reclaimed(self, store):
+        """测试超过锁定时间的挂起 key 可被接管，过期记录会被清理"""
+        ident = ("ip:1.2.3.4", "k")
+        assert await store.claim(ident, b"f" * 32) is None
+        assert (await store.claim(ident, b"f" * 32)).pending
+
+        store.lock = store.lock * 0  # 挂起的请求所在 worker 已退出
+        assert await store.claim(ident, b"g" * 32) is None
+        assert (await store.get(ident)).fingerprint == b"g" * 32
+
+        store.ttl = store.ttl * -1
+        await store.complete(ident, 201, [(b"content-type", b"application/json")], b"{}")
+        assert await store.purge_expired() == 1
+        async with store.session_factory() as db:
+            assert await db.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
@@ -0,0 +1,147 @@
+"""
+项目后台清除测试：分批删除、进度持久化到 project_purges 表、失败与过期任务
+"""
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.models.document_link import DocumentLink
+from src.models.expense import Expense
+from src.models.project import Project
+from src.models.project_member import ProjectMember
+from src.models.project_purge import ProjectPurge, ProjectPurgeStatus
+from src.models.task import Task
+from src.models.user import User, UserRole
+from src.services import project_purge_service
+from src.services.audit_service import AuditService
+from src.services.project_purge_service import ProjectPurgeService
+
+
+async def _finish_purges() -> None:
+    await asyncio.gather(*ProjectPurgeService._tasks)
+
+
+class TestProjectPurgeService:
+    """项目后台清除测试类"""
+
+    @pytest_asyncio.fixture
+    async def project(self, async_session: AsyncSession) -> Project:
+        """创建带 5 个任务、2 个文档、1 个成员和 1 笔支出的项目（需要数据库级 ON DELETE CASCADE）"""
+        if async_session.bind.dialect.name != "postgresql":
+            pytest.skip("后台任务使用独立连接，需要 PostgreSQL")
+
+        user = User(name="清除用户", email="purge@example.com", hashed_password="x",
+                    role=UserRole.ADMIN)
+        async_session.add(user)
+        await async_session.flush()
+        project = Project(name="待清除项目", budget=1000, owner_id=user.id)
+        async_session.add(project)
+        await async_session.flush()
+        async_session.add_all(
+            [Task(name=f"任务{i}", project_id=project.id) for i in range(5)]
+            + [
+                DocumentLink(title=f"文档{i}", url=f"https://example.com/{i}",
+                             project_id=project.id)
+                for i in range(2)
+            ]
+            + [
+                ProjectMember(project_id=project.id, user_id=user.id, role="PM"),
+                Expense(project_id=project.id, amount=Decimal("10"), description="支出"),
+            ]
+        )
+        await async_session.commit()
+        return project
+
+    @pytest.fixture
+    def factory(self, async_engine) -> async_sessionmaker:
+        """后台任务使用的会话工厂"""
+        return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    @pytest.mark.asyncio
+    async def test_purges_in_batches_and_records_progress(
+        self, async_session: AsyncSession, async_engine, factory, project
+    ):
+        """测试按批删除子表（每批一条 DELETE），并把进度写入 project_purges 表"""
+        deletes = []
+
+        def count_deletes(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("DELETE FROM tasks"):
+                deletes.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_deletes)
+        job = await ProjectPurgeService.start_purge(
+            async_session, factory, project.id, batch_size=2
+        )
+        assert job.status == ProjectPurgeStatus.PENDING
+        await _finish_purges()
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_deletes)
+
+        # 其他 worker 通过数据库读取同一进度
+        async with factory() as db:
+            job = await ProjectPurgeService.get_job(db, project.id)
+            assert job.status == ProjectPurgeStatus.COMPLETED
+            expected = {"document_links": 2, "project_members": 1, "expenses": 1, "tasks": 5}
+            assert job.total == job.deleted == expected
+            assert job.finished_at is not None
+            assert await db.get(Project, project.id) is None
+            assert await db.scalar(select(func.count()).select_from(Task)) == 0
+        assert len(deletes) == 3  # 2 + 2 + 1
+
+    @pytest.mark.asyncio
+    async def test_running_purge_is_returned_and_stale_purge_restarted(
+        self, async_session: AsyncSession, factory, project
+    ):
+        """测试进行中的清除不会重复启动，过期（worker 已退出）的清除会重新启动"""
+        first = await ProjectPurgeService.start_purge(async_session, factory, project.id, 100)
+        again = await ProjectPurgeService.start_purge(async_session, factory, project.id, 100)
+        assert again is first
+        assert len(ProjectPurgeService._tasks) == 1
+        await _finish_purges()
+
+        async with factory() as db:
+            other = Project(name="重新清除", budget=1, owner_id=project.owner_id)
+            db.add(other)
+            await db.flush()
+            stale = datetime.utcnow() - project_purge_service.STALE_AFTER - timedelta(seconds=1)
+            db.add(ProjectPurge(
+                project_id=other.id, project_name=other.name,
+                status=ProjectPurgeStatus.RUNNING, total={}, deleted={},
+                started_at=stale, updated_at=stale,
+            ))
+            await db.commit()
+
+        job = await ProjectPurgeService.start_purge(async_session, factory, other.id, 100)
+        assert job.started_at > stale
+        await _finish_purges()
+        async with factory() as db:
+            assert (await ProjectPurgeService.get_job(db, other.id)).status == (
+                ProjectPurgeStatus.COMPLETED
+            )
+
+        assert await ProjectPurgeService.get_job(async_session, uuid4()) is None
+        assert await ProjectPurgeService.start_purge(async_session, factory, uuid4(), 100) is None
+
+    @pytest.mark.asyncio
+    async def test_failed_purge_is_recorded(
+        self, async_session: AsyncSession, factory, project, monkeypatch
+    ):
+        """测试删除项目失败时记录 FAILED 和错误信息，项目行保留"""
+
+        async def fail(*args, **kwargs):
+            raise RuntimeError("audit log unavailable")
+
+        monkeypatch.setattr(AuditService, "log_action", fail)
+        await ProjectPurgeService.start_purge(async_session, factory, project.id, 100)
+        await _finish_purges()
+
+        async with factory() as db:
+            job = await ProjectPurgeService.get_job(db, project.id)
+            assert job.status == ProjectPurgeStatus.FAILED
+            assert job.error == "audit log unavailable"
+            assert await db.get(Project, project.id) is not None
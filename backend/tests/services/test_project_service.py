@@ -1,11 +1,19 @@
 """
 项目服务测试
 """
+from uuid import uuid4
+
 import pytest
+from pydantic import ValidationError
+from sqlalchemy import delete, event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.project import Project
+from src.models.project_member import ProjectMember
 from src.models.task import Task
+from src.models.user import User, UserRole
+from src.schemas.project import MemberBulkOutcome, ProjectMemberBulkItem
+from src.services.project_service import ProjectService
 
 
 class TestProjectService:
@@ -81,3 +89,142 @@ class TestProjectService:
         # 如果有预算使用记录，可以测试预算消耗
         # 这里只是验证基本属性
         assert project.actual_cost == 0.0 or project.actual_cost is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_members(self, async_session: AsyncSession):
+        """测试批量添加、移除成员及修改角色；添加已有成员且未给角色时保留原角色（仅 PostgreSQL）"""
+        if async_session.bind.dialect.name != "postgresql":
+            pytest.skip("INSERT ... ON CONFLICT ON CONSTRAINT 仅 PostgreSQL 支持")
+
+        users = [
+            User(name=f"成员{i}", email=f"bulk{i}@example.com", hashed_password="x",
+                 role=UserRole.MEMBER)
+            for i in range(4)
+        ]
+        async_session.add_all(users)
+        await async_session.flush()
+        project = Project(name="批量成员项目", budget=1000, owner_id=users[0].id)
+        async_session.add(project)
+        await async_session.flush()
+        async_session.add_all([
+            ProjectMember(project_id=project.id, user_id=users[0].id, role="PM"),
+            ProjectMember(project_id=project.id, user_id=users[3].id, role="Lead"),
+        ])
+        await async_session.commit()
+
+        items = [
+            ProjectMemberBulkItem(user_id=users[0].id, action="remove"),
+            ProjectMemberBulkItem(user_id=users[1].id, role="Dev"),
+            ProjectMemberBulkItem(user_id=users[2].id, action="update_role", role="QA"),
+            ProjectMemberBulkItem(user_id=uuid4(), role="Dev"),
+            ProjectMemberBulkItem(user_id=users[3].id),
+        ]
+        results = await ProjectService.bulk_update_members(async_session, project.id, items)
+        await async_session.commit()
+
+        assert [r.outcome for r in results] == [
+            MemberBulkOutcome.REMOVED,
+            MemberBulkOutcome.ADDED,
+            MemberBulkOutcome.NOT_MEMBER,
+            MemberBulkOutcome.USER_NOT_FOUND,
+            MemberBulkOutcome.UPDATED,
+        ]
+        assert results[4].role == "Lead"
+        members = await async_session.execute(
+            select(ProjectMember.user_id, ProjectMember.role).where(
+                ProjectMember.project_id == project.id
+            )
+        )
+        assert sorted(members.all(), key=lambda row: row.role) == [
+            (users[1].id, "Dev"),
+            (users[3].id, "Lead"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_members_reports_changes_after_lookup(
+        self, async_session: AsyncSession, monkeypatch
+    ):
+        """测试查询用户之后发生的并发变更：被删除的用户报告 USER_NOT_FOUND，已被加入的成员报告 UPDATED"""
+        if async_session.bind.dialect.name != "postgresql":
+            pytest.skip("INSERT ... ON CONFLICT ON CONSTRAINT 仅 PostgreSQL 支持")
+
+        users = [
+            User(name=f"并发{i}", email=f"race{i}@example.com", hashed_password="x",
+                 role=UserRole.MEMBER)
+            for i in range(3)
+        ]
+        async_session.add_all(users)
+        await async_session.flush()
+        project = Project(name="并发成员项目", budget=1000, owner_id=users[0].id)
+        async_session.add(project)
+        await async_session.commit()
+        added, joined, deleted = users
+
+        # 成员查询执行后：另一个请求加入了 joined，并删除了 deleted
+        execute = async_session.execute
+
+        async def execute_then_race(statement, *args, **kwargs):
+            result = await execute(statement, *args, **kwargs)
+            monkeypatch.setattr(async_session, "execute", execute)
+            if "project_members" in str(statement):
+                async_session.add(ProjectMember(project_id=project.id, user_id=joined.id))
+                await async_session.flush()
+                await execute(delete(User).where(User.id == deleted.id))
+            return result
+
+        monkeypatch.setattr(async_session, "execute", execute_then_race)
+        items = [
+            ProjectMemberBulkItem(user_id=user.id, role="Dev") for user in (added, joined, deleted)
+        ]
+        results = await ProjectService.bulk_update_members(async_session, project.id, items)
+        await async_session.commit()
+
+        assert [r.outcome for r in results] == [
+            MemberBulkOutcome.ADDED,
+            MemberBulkOutcome.UPDATED,
+            MemberBulkOutcome.USER_NOT_FOUND,
+        ]
+        assert [r.role for r in results] == ["Dev", "Dev", None]
+        members = await async_session.scalars(
+            select(ProjectMember.user_id).where(ProjectMember.project_id == project.id)
+        )
+        assert set(members) == {added.id, joined.id}
+
+    def test_bulk_update_role_requires_role(self):
+        """测试 update_role 必须提供角色"""
+        with pytest.raises(ValidationError):
+            ProjectMemberBulkItem(user_id=uuid4(), action="update_role")
+
+    @pytest.mark.asyncio
+    async def test_delete_project_cascades_in_database(self, async_session: AsyncSession):
+        """测试删除项目时子表由 ON DELETE CASCADE 删除，不先加载子行（passive_deletes，仅 PostgreSQL）"""
+        if async_session.bind.dialect.name != "postgresql":
+            pytest.skip("SQLite 默认不执行外键级联")
+
+        user = User(name="删除用户", email="cascade@example.com", hashed_password="x",
+                    role=UserRole.ADMIN)
+        async_session.add(user)
+        await async_session.flush()
+        project = Project(name="级联删除项目", budget=1000, owner_id=user.id)
+        async_session.add(project)
+        await async_session.flush()
+        async_session.add_all(
+            [Task(name=f"任务{i}", project_id=project.id) for i in range(3)]
+            + [ProjectMember(project_id=project.id, user_id=user.id, role="PM")]
+        )
+        await async_session.commit()
+        async_session.expunge_all()
+
+        statements = []
+        engine = async_session.bind.sync_engine
+        record = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            assert await ProjectService.delete_project(async_session, project.id)
+            await async_session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert not [s for s in statements if "FROM tasks" in s or "FROM project_members" in s]
+        assert await async_session.scalar(select(func.count()).select_from(Task)) == 0
+        assert await async_session.scalar(select(func.count()).select_from(ProjectMember)) == 0
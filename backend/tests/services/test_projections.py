@@ -0,0 +1,63 @@
+"""
+稀疏字段集（fields / expand）测试
+"""
+import pytest
+
+from src.services.projections import FieldSelection
+from src.services.task_service import TASK_FIELDS
+from src.services.user_service import USER_FIELDS
+
+
+class TestResourceFields:
+    """字段注册表测试类"""
+
+    def test_parse_defaults_to_all_fields(self):
+        """测试未指定 fields 时返回全部字段且不展开关联"""
+        selection = TASK_FIELDS.parse(None, None)
+        assert selection.fields == TASK_FIELDS.field_names
+        assert selection.expand == ()
+
+    def test_parse_sparse_fields(self):
+        """测试解析逗号分隔的字段列表（去空格、去重）"""
+        selection = TASK_FIELDS.parse(" id,name , status,id ", "assignee")
+        assert selection == FieldSelection(fields=("id", "name", "status"), expand=("assignee",))
+
+    def test_parse_rejects_unknown_field(self):
+        """测试拒绝未知字段"""
+        with pytest.raises(ValueError):
+            USER_FIELDS.parse("id,hashed_password", None)
+
+    def test_parse_rejects_unknown_expansion(self):
+        """测试拒绝未知关联"""
+        with pytest.raises(ValueError):
+            TASK_FIELDS.parse("id", "owner")
+
+    def test_select_only_requested_columns(self):
+        """测试 SELECT 只包含请求的列"""
+        selection = TASK_FIELDS.parse("id,name", None)
+        sql = str(TASK_FIELDS.select(selection))
+        assert "tasks.name" in sql
+        assert "tasks.description" not in sql
+        assert "JOIN" not in sql
+
+    def test_select_includes_computed_dependencies(self):
+        """测试计算字段会额外查询其依赖列"""
+        selection = TASK_FIELDS.parse("is_overdue", None)
+        sql = str(TASK_FIELDS.select(selection))
+        assert "tasks.due_date" in sql
+        assert "tasks.status" in sql
+
+    def test_select_joins_expansion(self):
+        """测试展开关联时在同一语句中 JOIN"""
+        selection = TASK_FIELDS.parse("id", "assignee")
+        sql = str(TASK_FIELDS.select(selection))
+        assert "LEFT OUTER JOIN users AS assignee" in sql
+        assert "hashed_password" not in sql
+
+    def test_adapter_serializes_only_selected_fields(self):
+        """测试序列化器只输出请求的字段"""
+        selection = TASK_FIELDS.parse("name,status", None)
+        adapter = TASK_FIELDS.adapter(selection)
+        data = adapter.validate_python([{"name": "任务", "status": "todo"}])
+        assert adapter.dump_python(data, mode="json") == [{"name": "任务", "status": "todo"}]
+        assert TASK_FIELDS.adapter(selection) is adapter
@@ -0,0 +1,240 @@
+"""
+速率限制测试
+"""
+import asyncio
+import fcntl
+import multiprocessing
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.core import rate_limit
+from src.core.config import settings
+from src.core.middleware import RateLimitMiddleware
+from src.core.rate_limit import (
+    GCRA_SCRIPT,
+    GCRA_SHA,
+    Limit,
+    MemoryBackend,
+    RateLimiter,
+    RedisBackend,
+    SharedMemoryBackend,
+    gcra,
+)
+from src.core.security import create_access_token
+
+
+def _hit_shared_table(path: str, hits: int) -> int:
+    """在子进程中打开同一个共享内存表并计数，返回放行次数"""
+    backend = SharedMemoryBackend(path, 1024)
+    limit = Limit.parse("100/minute")
+
+    async def run() -> int:
+        return sum([(await backend.hit("user:shared", 1, limit)).allowed for _ in range(hits)])
+
+    return asyncio.run(run())
+
+
+def _hold_shared_table(path: str, locked, release) -> None:
+    """在子进程中锁住整个共享内存表，直到 release 被设置"""
+    with open(path, "r+b") as table:
+        fcntl.lockf(table, fcntl.LOCK_EX)
+        locked.set()
+        release.wait(10)
+
+
+class RedisStandIn:
+    """最小的 Redis 协议替身：脚本缓存（EVALSHA/EVAL），脚本逻辑用 Python 实现"""
+
+    def __init__(self):
+        self.tats = {}
+        self.scripts = set()
+        self.commands = []
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                writer.write(self.execute(args))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def execute(self, args) -> bytes:
+        self.commands.append(args[0])
+        if args[0] == "EVAL":
+            assert args[1] == GCRA_SCRIPT
+            self.scripts.add(GCRA_SHA)
+        elif args[0] != "EVALSHA" or args[1] not in self.scripts:
+            return b"-NOSCRIPT No matching script. Please use EVAL.\r\n"
+        key, interval, period, cost = args[3], *map(float, args[4:7])
+        now = asyncio.get_running_loop().time()
+        limit = Limit(round(period / interval), period)
+        tat, retry_after = gcra(self.tats.get(key, now), now, cost, limit)
+        if tat is None:
+            retry = str(retry_after).encode()
+            return b"*2\r\n:0\r\n$%d\r\n%s\r\n" % (len(retry), retry)
+        self.tats[key] = tat
+        return b"*2\r\n:1\r\n$1\r\n0\r\n"
+
+
+class TestRateLimit:
+    """速率限制测试类"""
+
+    @pytest.mark.asyncio
+    async def test_gcra_allows_bursts_and_charges_costs(self):
+        """测试突发额度、按开销计数和 Retry-After"""
+        backend = MemoryBackend()
+        limit = Limit.parse("3/minute")
+        assert limit == Limit(3, 60)
+
+        results = [await backend.hit("ip:a", 1, limit) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert 19 < results[3].retry_after <= 20
+        assert results[3].retry_after_header == "20"
+
+        assert (await backend.hit("ip:b", 2, limit)).allowed
+        assert not (await backend.hit("ip:b", 2, limit)).allowed
+        assert (await backend.hit("ip:b", 1, limit)).allowed
+
+        assert RateLimiter.cost("GET", "/api/v1/search/") == 5
+        assert RateLimiter.cost("POST", "/api/v1/projects/abc/purge") == 10
+        assert RateLimiter.cost("GET", "/api/v1/projects/abc") == 1
+        assert RateLimiter.cost("POST", "/api/v1/batch") == 0
+
+    def test_shared_memory_table_is_shared_between_processes(self, tmp_path):
+        """测试多个进程共用同一个共享内存表，总放行次数不超过限额"""
+        path = str(tmp_path / "rate-limit")
+        SharedMemoryBackend(path, 1024).close()
+
+        with multiprocessing.get_context("fork").Pool(4) as pool:
+            allowed = pool.starmap(_hit_shared_table, [(path, 60)] * 4)
+
+        assert sum(allowed) == 100
+        backend = SharedMemoryBackend(path, 1024)
+        assert not backend._check("user:shared", 1, Limit.parse("100/minute")).allowed
+        assert backend._check("user:other", 1, Limit.parse("100/minute")).allowed
+        backend.reset()
+        assert backend._check("user:shared", 1, Limit.parse("100/minute")).allowed
+        backend.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_memory_lock_does_not_block_event_loop(self, tmp_path, monkeypatch):
+        """测试桶被其他进程锁住时检查让出事件循环并重试，超时后放行；锁释放后正常计数"""
+        monkeypatch.setattr(rate_limit, "SHM_LOCK_TIMEOUT_SECONDS", 0.1)
+        path = str(tmp_path / "rate-limit")
+        backend = SharedMemoryBackend(path, 1024)
+        limit = Limit.parse("1/minute")
+        context = multiprocessing.get_context("fork")
+        locked, release = context.Event(), context.Event()
+        holder = context.Process(target=_hold_shared_table, args=(path, locked, release))
+        holder.start()
+        try:
+            assert locked.wait(10)
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            ticker = asyncio.ensure_future(tick())
+            decision = await backend.hit("user:a", 1, limit)
+            ticker.cancel()
+            assert decision.allowed  # 锁一直被占用：放行（fail open）
+            assert backend.errors == 1
+            assert ticks > 10  # 等待期间事件循环仍在运行
+
+            # 锁在等待期间释放：重试后正常计数
+            waiting = asyncio.ensure_future(backend.hit("user:a", 1, limit))
+            await asyncio.sleep(0.01)
+            release.set()
+            assert (await waiting).allowed
+            assert not (await backend.hit("user:a", 1, limit)).allowed
+            assert backend.errors == 1
+        finally:
+            release.set()
+            holder.join()
+            backend.close()
+
+    def test_default_backend_is_redis_when_configured(self, tmp_path, monkeypatch):
+        """测试未指定后端时：配置了 Redis 用 Redis（跨主机），否则用本机共享内存"""
+        monkeypatch.setattr(settings, "RATE_LIMIT_REDIS_URL", "redis://limits:6380/1")
+        assert isinstance(rate_limit.create_backend(None), RedisBackend)
+        assert isinstance(rate_limit.create_backend("memory"), MemoryBackend)
+
+        monkeypatch.setattr(settings, "RATE_LIMIT_REDIS_URL", None)
+        monkeypatch.setattr(settings, "RATE_LIMIT_SHM_PATH", str(tmp_path / "rate-limit"))
+        backend = rate_limit.create_backend(None)
+        assert isinstance(backend, SharedMemoryBackend)
+        backend.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_against_stand_in(self):
+        """测试 Redis 后端：脚本未缓存时回退到 EVAL、流水线并发请求，服务不可用时放行"""
+        server = RedisStandIn()
+        backend = RedisBackend(await server.start())
+        limit = Limit.parse("5/minute")
+
+        results = await asyncio.gather(*(backend.hit("user:r", 1, limit) for _ in range(7)))
+        assert sum(r.allowed for r in results) == 5
+        assert all(r.retry_after > 0 for r in results if not r.allowed)
+        assert server.commands.count("EVAL") == 7  # 并发请求都收到 NOSCRIPT
+        assert not (await backend.hit("user:r", 1, limit)).allowed
+        assert server.commands[-1] == "EVALSHA"
+
+        await backend.close()
+        await server.stop()
+        assert (await backend.hit("user:r", 1, limit)).allowed
+        assert backend.errors == 1
+
+    @pytest.mark.asyncio
+    async def test_middleware_limits_per_user_and_skips_health(self):
+        """测试已登录请求按用户计数，匿名请求按 IP，健康检查不受限"""
+        limiter = RateLimiter()
+        limiter.default_limit = Limit.parse("2/minute")
+        limiter._backend = MemoryBackend()
+
+        async def ok(request):
+            return PlainTextResponse("ok")
+
+        app = RateLimitMiddleware(
+            Starlette(routes=[Route("/api/v1/items", ok), Route("/health", ok)]), limiter
+        )
+        token = create_access_token({"sub": "limited@example.com"})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            statuses = [
+                (await client.get("/api/v1/items", headers=headers)).status_code
+                for _ in range(2)
+            ]
+            limited = await client.get("/api/v1/items", headers=headers)
+            anonymous = await client.get("/api/v1/items")
+            health = [(await client.get("/health")).status_code for _ in range(3)]
+
+        assert statuses == [200, 200]
+        assert limited.status_code == 429
+        assert int(limited.headers["retry-after"]) >= 1
+        assert limited.json()["detail"]
+        assert anonymous.status_code == 200
+        assert health == [200, 200, 200]
+        assert set(limiter._backend.tats) == {"user:limited@example.com", "ip:127.0.0.1"}
@@ -0,0 +1,164 @@
+"""
+只读副本路由测试：读请求走副本、写请求走主库、写入后的 read-your-writes 令牌、副本不可用时回退
+"""
+import time
+
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+from src.core import database
+from src.core.config import settings
+from src.core.middleware import PrimaryStickinessMiddleware
+
+
+def _request(method: str = "GET", **headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request(
+        {"type": "http", "method": method, "path": "/api/v1/projects/", "headers": raw}
+    )
+
+
+async def _served_by(request: Request) -> str:
+    """通过 get_read_db 读取，返回处理该读取的数据库名"""
+    sessions = database.get_read_db(request)
+    session = await sessions.__anext__()
+    try:
+        return await session.scalar(text("SELECT name FROM node"))
+    finally:
+        await sessions.aclose()
+
+
+async def _write(request: Request) -> None:
+    """通过 get_db 提交一次写入"""
+    sessions = database.get_db(request)
+    session = await sessions.__anext__()
+    await session.execute(text("UPDATE node SET name = name"))
+    with pytest.raises(StopAsyncIteration):
+        await sessions.__anext__()
+
+
+async def _engine(path: str, name: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE node (name TEXT)"))
+        await conn.execute(text("INSERT INTO node VALUES (:name)"), {"name": name})
+    return engine
+
+
+def _bind(monkeypatch, primary, replica) -> None:
+    """让 get_db / get_read_db 使用给定的主库和副本引擎"""
+    options = {"class_": AsyncSession, "expire_on_commit": False}
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(primary, **options))
+    monkeypatch.setattr(database, "ReplicaSessionLocal", async_sessionmaker(replica, **options))
+    monkeypatch.setattr(
+        database, "_read_engine", primary.execution_options(isolation_level="AUTOCOMMIT")
+    )
+    monkeypatch.setattr(
+        database, "_replica_read_engine", replica.execution_options(isolation_level="AUTOCOMMIT")
+    )
+    monkeypatch.setattr(database, "_replica_down_until", 0.0)
+
+
+class TestReadReplica:
+    """只读副本路由测试类"""
+
+    @pytest_asyncio.fixture
+    async def engines(self, tmp_path, monkeypatch):
+        """主库和副本（两个 SQLite 文件，node 表记录各自的名字）"""
+        primary = await _engine(tmp_path / "primary.db", "primary")
+        replica = await _engine(tmp_path / "replica.db", "replica")
+        _bind(monkeypatch, primary, replica)
+        yield primary, replica
+        await primary.dispose()
+        await replica.dispose()
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_and_writes_primary(self, engines):
+        """测试 GET 读取走副本，写请求中的读取走主库"""
+        assert await _served_by(_request("GET", authorization="Bearer a")) == "replica"
+        assert await _served_by(_request("POST", authorization="Bearer a")) == "primary"
+        assert await _served_by(_request("DELETE", authorization="Bearer a")) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_write_token_routes_client_to_primary(self, engines, monkeypatch):
+        """测试写入后签发的令牌（响应头或 Cookie 带回）让该客户端的读取走主库，且不依赖进程内状态"""
+        write = _request("POST", authorization="Bearer a")
+        await _write(write)
+        token = write.scope["state"][database.PRIMARY_UNTIL_STATE]
+
+        # 另一个 worker 处理的新请求：只凭客户端带回的令牌
+        assert await _served_by(_request(authorization="Bearer a", x_primary_until=token)) == (
+            "primary"
+        )
+        cookie = f"{database.PRIMARY_UNTIL_COOKIE}={token}"
+        assert await _served_by(_request(authorization="Bearer a", cookie=cookie)) == "primary"
+        assert await _served_by(_request(authorization="Bearer a")) == "replica"
+
+        # 其他客户端、被篡改的令牌都无效
+        assert await _served_by(_request(authorization="Bearer b", x_primary_until=token)) == (
+            "replica"
+        )
+        forged = f"{time.time() + 60:.3f}.{token.rpartition('.')[2]}"
+        assert await _served_by(_request(authorization="Bearer a", x_primary_until=forged)) == (
+            "replica"
+        )
+
+        # 过期的令牌无效
+        monkeypatch.setattr(settings, "REPLICA_STICKY_SECONDS", -1.0)
+        expired = _request("PATCH", authorization="Bearer a")
+        await _write(expired)
+        token = expired.scope["state"][database.PRIMARY_UNTIL_STATE]
+        assert await _served_by(_request(authorization="Bearer a", x_primary_until=token)) == (
+            "replica"
+        )
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_primary_when_replica_is_down(self, engines, tmp_path, monkeypatch):
+        """测试副本连接失败时回退到主库，并在 REPLICA_RETRY_SECONDS 内不再尝试副本"""
+        primary, replica = engines
+        down = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db", poolclass=NullPool
+        )
+        _bind(monkeypatch, primary, down)
+
+        assert await _served_by(_request(authorization="Bearer a")) == "primary"
+        assert database._replica_down_until > time.monotonic()
+
+        # 副本恢复后，重试时间到之前仍走主库
+        monkeypatch.setattr(database, "ReplicaSessionLocal", async_sessionmaker(replica))
+        monkeypatch.setattr(database, "_replica_read_engine", replica)
+        assert await _served_by(_request(authorization="Bearer a")) == "primary"
+        monkeypatch.setattr(database, "_replica_down_until", 0.0)
+        assert await _served_by(_request(authorization="Bearer a")) == "replica"
+        await down.dispose()
+
+    @pytest.mark.asyncio
+    async def test_middleware_returns_token_as_cookie_and_header(self, engines):
+        """测试写请求的响应带有令牌（Cookie 和 X-Primary-Until），之后带 Cookie 的读取走主库"""
+        app = FastAPI()
+
+        @app.post("/write")
+        async def write(db: AsyncSession = Depends(database.get_db)):
+            await db.execute(text("UPDATE node SET name = name"))
+            return {}
+
+        @app.get("/read")
+        async def read(db: AsyncSession = Depends(database.get_read_db)):
+            return {"node": await db.scalar(text("SELECT name FROM node"))}
+
+        headers = {"Authorization": "Bearer a"}
+        async with AsyncClient(
+            app=PrimaryStickinessMiddleware(app), base_url="http://test"
+        ) as client:
+            assert (await client.get("/read", headers=headers)).json() == {"node": "replica"}
+            written = await client.post("/write", headers=headers)
+            assert written.headers[database.PRIMARY_UNTIL_HEADER]
+            assert "HttpOnly" in written.headers["set-cookie"]
+            # 客户端保存了 Cookie
+            assert (await client.get("/read", headers=headers)).json() == {"node": "primary"}
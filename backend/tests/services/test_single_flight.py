@@ -0,0 +1,103 @@
+"""
+相同并发读请求合并（single-flight）测试
+"""
+import asyncio
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """single-flight 测试类"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        """测试相同 key 的并发调用只计算一次，不同 key 各自计算"""
+        flight = SingleFlight()
+        calls = []
+        released = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"total": 42}
+
+        async def on_wait():
+            released.append(1)
+
+        results = await asyncio.gather(
+            *[flight.run("dashboard", "user-1", compute, on_wait) for _ in range(5)],
+            flight.run("dashboard", "user-2", compute),
+        )
+
+        assert len(calls) == 2
+        assert all(result == {"total": 42} for result in results)
+        assert flight.counts["dashboard"] == {"leader": 2, "coalesced": 4, "timeout": 0}
+        assert len(released) == 4  # 每个等待者释放一次连接
+        assert flight.in_flight == 0
+
+        # 计算结束后不缓存结果，下一次调用重新计算
+        await flight.run("dashboard", "user-1", compute)
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(self):
+        """测试领头调用抛出的异常传递给所有等待者"""
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("数据库不可用")
+
+        results = await asyncio.gather(
+            *[flight.run("tasks", "key", compute) for _ in range(3)], return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.counts["tasks"]["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_waiter_timeout_computes_on_its_own(self):
+        """测试等待超时后等待者自行计算"""
+        flight = SingleFlight(timeout=0.01)
+        slow_started = asyncio.Event()
+
+        async def slow():
+            slow_started.set()
+            await asyncio.sleep(0.2)
+            return "leader"
+
+        async def fast():
+            return "own"
+
+        leader = asyncio.create_task(flight.run("projects", "key", slow))
+        await slow_started.wait()
+
+        assert await flight.run("projects", "key", fast) == "own"
+        assert flight.counts["projects"]["timeout"] == 1
+        assert await leader == "leader"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_to_waiter(self):
+        """测试领头请求被取消（客户端断开）时等待者重新计算"""
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def never():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def compute():
+            return "waiter"
+
+        leader = asyncio.create_task(flight.run("dashboard", "key", never))
+        await started.wait()
+        waiter = asyncio.create_task(flight.run("dashboard", "key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "waiter"
+        assert flight.counts["dashboard"] == {"leader": 2, "coalesced": 1, "timeout": 0}
+        with pytest.raises(asyncio.CancelledError):
+            await leader
@@ -0,0 +1,52 @@
+"""
+慢查询日志测试
+"""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.slow_queries import SlowQueryLog, redact
+from src.models.project import Project
+from src.services.project_service import ProjectService
+
+
+class TestSlowQueryLog:
+    """慢查询日志测试类"""
+
+    def test_redact_keeps_only_types(self):
+        """测试参数脱敏只保留类型"""
+        assert redact(("secret@example.com", 3, None, [1, 2])) == [
+            "<str>",
+            "<int>",
+            None,
+            "<list[2]>",
+        ]
+        assert redact({"email": "secret@example.com"}) == {"email": "<str>"}
+
+    @pytest.mark.asyncio
+    async def test_captures_statement_and_service_caller(self, tmp_path):
+        """测试记录规范化 SQL、脱敏参数和调用的服务方法"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/slow.db", poolclass=NullPool)
+        log = SlowQueryLog(threshold_ms=0, size=2)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Project.__table__.create)
+        log.instrument(engine)
+
+        async with AsyncSession(engine) as db:
+            for _ in range(3):
+                assert await ProjectService.project_exists(db, uuid4()) is False
+        await engine.dispose()
+
+        records = log.snapshot()
+        assert len(records) == 2  # 环形缓冲区只保留最近的记录
+        record = records[0]
+        assert record["statement"].startswith("SELECT projects.id FROM projects WHERE")
+        assert record["parameters"] == ["<str>"]
+        assert record["caller"] == "ProjectService.project_exists"
+        assert record["plan"] is None
+
+        log.clear()
+        assert log.snapshot() == []